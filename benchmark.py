@@ -0,0 +1,362 @@
+"""
+Benchmark - Measures the suites' own performance across levels and execution modes
+Reports wall-clock time, per-row latency percentiles, WebDriver command counts and peak RSS
+Each case runs in a fresh process, so its peak RSS is not inherited from earlier cases
+
+Usage: python benchmark.py [--suites register withdraw] [--levels level1 level2]
+                           [--mode NAME=ARGS ...] [--rows N] [--live] [--baseline FILE]
+Example: python benchmark.py --mode serial= --mode workers4="--workers 4"
+"""
+import os
+import sys
+import json
+import time
+import shlex
+import resource
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from run_suites import SUITES, load_suite
+
+# Importable now that run_suites put common/ on sys.path
+from driver_pool import close_shared_pools
+from config_manager import BASE_URL_ENV
+from results_store import ResultsStore
+
+root_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(root_dir, 'standin'))
+
+
+class CommandCounter:
+    """Counts WebDriver commands by patching WebDriver.execute, the single entry point for all commands"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._original = None
+
+    def __enter__(self):
+        self._original = original = WebDriver.execute
+        counter = self
+
+        def execute(driver, driver_command, params=None):
+            with counter._lock:
+                counter.counts[driver_command] += 1
+            return original(driver, driver_command, params)
+
+        WebDriver.execute = execute
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        WebDriver.execute = self._original
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile; 0 for an empty list"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(1, -(-percent * len(values) // 100))
+    return values[int(rank) - 1]
+
+
+def peak_rss_mb(who):
+    """Peak resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    rss = resource.getrusage(who).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _descendants(pid):
+    """Process ids of all descendants of pid, read from /proc"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', encoding='utf-8') as f:
+                # The command name may contain spaces; the fields after it are fixed
+                ppid = int(f.read().rpartition(')')[2].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), ()):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+class ChildRssSampler:
+    """
+    Samples the summed RSS of every process this one started (drivers, browsers, shard workers)
+
+    Reads /proc, so it only samples on Linux; elsewhere peak_mb stays None
+    and the largest single child from RUSAGE_CHILDREN is reported instead.
+    """
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak_mb = None
+        self._page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        total = 0
+        for pid in _descendants(os.getpid()):
+            try:
+                with open(f'/proc/{pid}/statm', encoding='utf-8') as f:
+                    total += int(f.read().split()[1]) * self._page_size
+            except (OSError, ValueError, IndexError):
+                continue
+        mb = round(total / (1024 * 1024), 1)
+        self.peak_mb = mb if self.peak_mb is None else max(self.peak_mb, mb)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        if os.path.isdir('/proc'):
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def prepare_data(suite, rows, work_dir):
+    """Return the data CSV for a suite, cut to the first rows if requested"""
+    level2_script = os.path.join(root_dir, SUITES[f'{suite}/level2'])
+    data_path = os.path.join(os.path.dirname(level2_script), f'data_{suite}.csv')
+    if not rows:
+        return data_path
+    with open(data_path, encoding='utf-8') as f:
+        lines = f.readlines()
+    limited = os.path.join(work_dir, f'data_{suite}_{rows}.csv')
+    with open(limited, 'w', encoding='utf-8') as f:
+        f.writelines(lines[:rows + 1])
+    return limited
+
+
+def sharded(mode_args):
+    """True if the mode runs rows in shard worker processes"""
+    return any(arg in ('--processes', '--listen') or arg.startswith(('--processes=', '--listen='))
+               for arg in mode_args)
+
+
+def run_case(suite, level, mode_args, data_path, case_dir):
+    """
+    Run one suite level with one mode and measure it (in the current process)
+
+    The suite writes its results, cache, history and metrics into case_dir so the
+    committed result CSVs are not overwritten. Row latencies are read back from
+    the run's results store, which every tier and runner records, including the
+    rows of shard workers and the HTTP tier. WebDriver commands are only counted
+    in this process, so sharded modes report them as not measured (None).
+    """
+    module = load_suite(f'{suite}/{level}')
+    os.makedirs(case_dir, exist_ok=True)
+    module.csv_path = data_path
+    module.output_file = os.path.join(case_dir, f'test_result_{suite}.csv')
+    module.cache_file = os.path.join(case_dir, f'result_cache_{suite}.json')
+    module.history_file = os.path.join(case_dir, f'run_history_{suite}.json')
+    module.results_db = os.path.join(case_dir, 'results_history.db')
+    module.artifacts_dir = os.path.join(case_dir, 'artifacts')
+    if hasattr(module, 'metrics_file'):
+        module.metrics_file = os.path.join(case_dir, f'metrics_{suite}.json')
+    if hasattr(module, 'wait_profile_file'):
+        module.wait_profile_file = os.path.join(case_dir, f'wait_profile_{suite}.json')
+    if hasattr(module, 'identities'):
+        module.identities.ledger_path = os.path.join(case_dir, 'registered_identities.jsonl')
+
+    with ChildRssSampler() as children, CommandCounter() as commands:
+        start = time.perf_counter()
+        module.main(['--headless'] + mode_args)
+        wall = time.perf_counter() - start
+        close_shared_pools()
+
+    row_times = ResultsStore(module.results_db).load()['duration'].tolist()
+    measured = not sharded(mode_args)
+    command_total = sum(commands.counts.values())
+    return {
+        'suite': suite,
+        'level': level,
+        'rows': len(row_times),
+        'wall_s': round(wall, 3),
+        'row_p50_s': round(percentile(row_times, 50), 3),
+        'row_p95_s': round(percentile(row_times, 95), 3),
+        'row_max_s': round(max(row_times) if row_times else 0.0, 3),
+        'commands': command_total if measured else None,
+        'commands_per_row': round(command_total / max(1, len(row_times)), 1) if measured else None,
+        'top_commands': dict(commands.counts.most_common(5)) if measured else None,
+        'python_peak_rss_mb': peak_rss_mb(resource.RUSAGE_SELF),
+        'children_peak_rss_mb': (children.peak_mb if children.peak_mb is not None
+                                 else peak_rss_mb(resource.RUSAGE_CHILDREN)),
+    }
+
+
+def run_case_isolated(suite, level, mode_args, data_path, case_dir):
+    """
+    Run one case in a fresh Python process and return its measurements
+
+    ru_maxrss is a high-water mark over a process lifetime, so measuring
+    every case in one process would report the largest earlier peak.
+    """
+    os.makedirs(case_dir, exist_ok=True)
+    output = os.path.join(case_dir, 'case.json')
+    subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--case', suite, level, '--case-data', data_path,
+         '--case-dir', case_dir, '--case-args', json.dumps(mode_args), '--case-output', output],
+        check=True,
+    )
+    with open(output, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_report(results):
+    """Print the measurements and the level2/level1 ratio per suite and mode"""
+    print("\n=== Benchmark ===")
+    print(f"{'mode':<12} {'suite':<9} {'level':<7} {'rows':>5} {'wall s':>8} {'p50 s':>7} "
+          f"{'p95 s':>7} {'max s':>7} {'cmds/row':>9} {'py MB':>7} {'child MB':>9}")
+    for r in results:
+        # Commands of shard workers are not counted
+        commands = '-' if r['commands_per_row'] is None else f"{r['commands_per_row']:.1f}"
+        children = '-' if r['children_peak_rss_mb'] is None else f"{r['children_peak_rss_mb']:.1f}"
+        print(f"{r['mode']:<12} {r['suite']:<9} {r['level']:<7} {r['rows']:>5} {r['wall_s']:>8.2f} "
+              f"{r['row_p50_s']:>7.2f} {r['row_p95_s']:>7.2f} {r['row_max_s']:>7.2f} "
+              f"{commands:>9} {r['python_peak_rss_mb']:>7.1f} {children:>9}")
+    print("py MB: peak RSS of the suite process; child MB: peak summed RSS of the drivers, "
+          "browsers and shard workers it started; '-': not measured")
+
+    by_key = {(r['mode'], r['suite'], r['level']): r for r in results}
+    ratios = []
+    for (mode, suite, level), r in by_key.items():
+        level1 = by_key.get((mode, suite, 'level1'))
+        if level == 'level2' and level1 and level1['wall_s']:
+            ratios.append(f"{mode} {suite}: level2/level1 wall = {r['wall_s'] / level1['wall_s']:.2f}")
+    if ratios:
+        print("\n" + "\n".join(ratios))
+
+
+def compare_with_baseline(results, baseline_path, threshold):
+    """
+    Report cases whose wall time grew more than threshold percent
+
+    Returns:
+        Number of regressions found
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['mode'], r['suite'], r['level']): r for r in json.load(f)['results']}
+
+    regressions = 0
+    print(f"\n=== Compared with {baseline_path} ===")
+    for r in results:
+        old = baseline.get((r['mode'], r['suite'], r['level']))
+        if not old or not old['wall_s']:
+            continue
+        change = (r['wall_s'] - old['wall_s']) / old['wall_s'] * 100
+        flag = "REGRESSION" if change > threshold else "ok"
+        if change > threshold:
+            regressions += 1
+        print(f"{r['mode']} {r['suite']} {r['level']}: {old['wall_s']:.2f}s -> {r['wall_s']:.2f}s "
+              f"({change:+.1f}%) {flag}")
+    return regressions
+
+
+def parse_mode(text):
+    """Parse NAME=ARGS into (name, argv list)"""
+    name, _, args = text.partition('=')
+    return name, shlex.split(args)
+
+
+def parse_args(argv=None):
+    """Parse command line options for the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the register and withdraw suites")
+    parser.add_argument("--suites", nargs="+", choices=["register", "withdraw"],
+                        default=["register", "withdraw"], help="Suites to measure (default: both)")
+    parser.add_argument("--levels", nargs="+", choices=["level1", "level2"],
+                        default=["level1", "level2"], help="Levels to compare (default: both)")
+    parser.add_argument("--mode", action="append", type=parse_mode, dest="modes",
+                        help="Execution mode NAME=ARGS passed to the suite, repeatable (default: serial=)")
+    parser.add_argument("--rows", type=int, default=0,
+                        help="Only use the first N data rows (default: all)")
+    parser.add_argument("--live", action="store_true",
+                        help="Use the live sites instead of the local stand-in server")
+    parser.add_argument("--output", default=os.path.join(root_dir, "benchmark_results.json"),
+                        help="JSON file for the measurements (default: benchmark_results.json)")
+    parser.add_argument("--baseline", help="Earlier benchmark JSON to compare wall times with")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent wall-time growth reported as a regression (default: 10)")
+    # Internal: measure one case in this process (used by run_case_isolated)
+    parser.add_argument("--case", nargs=2, metavar=("SUITE", "LEVEL"), help=argparse.SUPPRESS)
+    parser.add_argument("--case-data", help=argparse.SUPPRESS)
+    parser.add_argument("--case-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--case-args", default="[]", help=argparse.SUPPRESS)
+    parser.add_argument("--case-output", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.case:
+        suite, level = args.case
+        result = run_case(suite, level, json.loads(args.case_args), args.case_data, args.case_dir)
+        with open(args.case_output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+    modes = args.modes or [("serial", [])]
+
+    server = None
+    if not args.live:
+        from server import start_server
+        server, base_url = start_server()
+        # Must be set before the suites are loaded: they read their URLs at import
+        os.environ[BASE_URL_ENV] = base_url
+        print(f"Using local stand-in server at {base_url}")
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="benchmark_") as work_dir:
+            for name, mode_args in modes:
+                for suite in args.suites:
+                    data_path = prepare_data(suite, args.rows, work_dir)
+                    for level in args.levels:
+                        print(f"\n===== {name}: {suite}/{level} =====")
+                        case_dir = os.path.join(work_dir, f'{name}_{suite}_{level}')
+                        result = run_case_isolated(suite, level, mode_args, data_path, case_dir)
+                        result['mode'] = name
+                        results.append(result)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print_report(results)
+
+    payload = {
+        'created': time.time(),
+        'target': 'live' if args.live else 'standin',
+        'rows': args.rows or 'all',
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\nBenchmark results saved to: {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
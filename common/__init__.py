@@ -1,21 +1,109 @@
 """
 Common utilities for Level 2 data-driven testing
 """
-from .config_manager import ConfigManager
+from .config_manager import ConfigManager, Locator, DriverProfile
+from .page_objects import PageObject, build_page, load_page, check_page_usage
 from .element_helper import (
+    ElementHandleCache,
+    wait_settings,
+    find_element_by_locator,
     find_element_by_config,
+    PageProbe,
+    probe_elements,
+    fill_form,
     click_element,
+    click_and_wait_for_outcome,
+    click_and_capture_messages,
     input_text,
     get_text,
-    get_element_attribute
+    get_element_attribute,
+    wait_for_page_settled,
+    navigate
 )
+from .async_element_helper import AsyncPage, CDPConnection
+from .http_tier import HttpSession, HtmlForm, probe_html
+from .storage_state import StorageState, capture_storage_state, restore_storage_state
+from .balance_model import BalanceModel
+from .driver_factory import create_driver, driver_pool_name
+from .driver_pool import DriverPool, get_shared_pool, reset_session
+from .parallel_runner import run_rows
+from .sharded_runner import WorkBoard, BoardServer, shard_job, run_rows_sharded, run_worker, bookkeeping
+from .result_writer import ResultWriter
+from .identity_allocator import IdentityAllocator
+from .failure_artifacts import ArtifactWriter, capture_page, new_run_dir
+from .metrics import MetricsRegistry, enable_metrics, disable_metrics
+from .adaptive_waits import WaitTuner, enable_adaptive_waits, disable_adaptive_waits
+from .result_cache import ResultCache, fingerprint_files, print_cache_report
+from .scheduler import RowHistory, order_by_risk
+from .results_store import ResultsStore, flake_stats, duration_trends, first_failing_runs
+from .data_generator import LengthField, generate_register_data, generate_withdraw_data
 
 __all__ = [
     'ConfigManager',
+    'Locator',
+    'DriverProfile',
+    'PageObject',
+    'build_page',
+    'load_page',
+    'check_page_usage',
+    'ElementHandleCache',
+    'wait_settings',
+    'find_element_by_locator',
     'find_element_by_config',
+    'PageProbe',
+    'probe_elements',
+    'fill_form',
     'click_element',
+    'click_and_wait_for_outcome',
+    'click_and_capture_messages',
     'input_text',
     'get_text',
-    'get_element_attribute'
+    'get_element_attribute',
+    'wait_for_page_settled',
+    'navigate',
+    'AsyncPage',
+    'CDPConnection',
+    'HttpSession',
+    'HtmlForm',
+    'probe_html',
+    'StorageState',
+    'capture_storage_state',
+    'restore_storage_state',
+    'BalanceModel',
+    'create_driver',
+    'driver_pool_name',
+    'DriverPool',
+    'get_shared_pool',
+    'reset_session',
+    'run_rows',
+    'WorkBoard',
+    'BoardServer',
+    'shard_job',
+    'run_rows_sharded',
+    'run_worker',
+    'bookkeeping',
+    'ResultWriter',
+    'IdentityAllocator',
+    'ResultCache',
+    'fingerprint_files',
+    'print_cache_report',
+    'RowHistory',
+    'order_by_risk',
+    'ResultsStore',
+    'flake_stats',
+    'duration_trends',
+    'first_failing_runs',
+    'LengthField',
+    'generate_register_data',
+    'generate_withdraw_data',
+    'ArtifactWriter',
+    'capture_page',
+    'new_run_dir',
+    'MetricsRegistry',
+    'enable_metrics',
+    'disable_metrics',
+    'WaitTuner',
+    'enable_adaptive_waits',
+    'disable_adaptive_waits'
 ]
 
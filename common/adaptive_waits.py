@@ -0,0 +1,250 @@
+"""
+Adaptive Waits - Per-element timeouts and poll intervals learned from recorded wait times
+Disabled by default; find_element_by_locator only checks one module attribute when it is off
+"""
+import json
+import os
+import threading
+
+
+class WaitTuner:
+    """
+    Learns how long each element usually takes to appear
+
+    Successful wait times are kept per element name. Once an element has
+    enough samples, its timeout becomes a margin times the 99th percentile
+    (never below min_timeout and never above the caller's timeout), so a
+    missing element fails after about a second instead of the full default.
+    Its poll interval becomes a quarter of the median wait, so an element
+    that appears in 30ms is not picked up only after a 500ms poll.
+
+    Misses do not feed the learned timeout, so a learned timeout that has
+    become too short (a slower environment) would otherwise never recover.
+    After max_misses consecutive misses an element backs off to the
+    caller's timeout until it is found again; the slower waits recorded
+    then widen its learned timeout.
+    """
+
+    def __init__(self, path=None, min_samples=20, max_samples=200, margin=3.0, min_timeout=1.0,
+                 min_poll=0.02, max_poll=0.5, max_misses=3):
+        """
+        Initialize WaitTuner and load the recorded wait times if path exists
+
+        Args:
+            path: Optional JSON file the samples are loaded from and saved to
+            min_samples: Successful waits needed before an element is tuned (default: 20)
+            max_samples: Most recent waits kept per element (default: 200)
+            margin: Factor applied to the 99th percentile wait (default: 3.0)
+            min_timeout: Lower bound of a learned timeout in seconds (default: 1.0)
+            min_poll: Lower bound of a learned poll interval in seconds (default: 0.02)
+            max_poll: Upper bound of a learned poll interval in seconds (default: 0.5)
+            max_misses: Consecutive misses after which an element uses the caller's
+                timeout until it is found again (default: 3)
+        """
+        self.path = path
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.margin = margin
+        self.min_timeout = min_timeout
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.max_misses = max_misses
+        self._lock = threading.Lock()
+        # Consecutive misses per element since its last successful wait
+        self._streaks = {}
+        self._samples = {}
+        self._misses = {}
+        self._settings = {}
+        # Waits recorded since the last take_recorded(), reported by shard workers
+        self._new_samples = {}
+        self._new_misses = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.load(json.load(f))
+            except (OSError, ValueError):
+                self._samples, self._misses = {}, {}
+
+    def load(self, saved):
+        """
+        Replace the samples with a saved profile
+
+        Args:
+            saved: Dict with 'samples' and 'misses', as written by save() or returned by snapshot()
+        """
+        with self._lock:
+            self._samples = {name: list(values) for name, values in saved.get('samples', {}).items()}
+            self._misses = dict(saved.get('misses', {}))
+            self._settings = {}
+
+    def snapshot(self):
+        """Samples and misses as a dict that load() accepts"""
+        with self._lock:
+            return {'samples': {name: list(values) for name, values in self._samples.items()},
+                    'misses': dict(self._misses)}
+
+    def take_recorded(self):
+        """
+        Waits recorded since the last call, then forget them
+
+        Returns:
+            Dict with 'samples' and 'misses' for merge()
+        """
+        with self._lock:
+            recorded = {'samples': self._new_samples, 'misses': self._new_misses}
+            self._new_samples, self._new_misses = {}, {}
+            return recorded
+
+    def merge(self, recorded):
+        """
+        Add waits recorded by another process
+
+        Args:
+            recorded: Dict with 'samples' and 'misses', as returned by take_recorded()
+        """
+        with self._lock:
+            for name, values in recorded.get('samples', {}).items():
+                kept = self._samples.setdefault(name, [])
+                kept.extend(values)
+                del kept[:-self.max_samples]
+                self._settings.pop(name, None)
+            for name, count in recorded.get('misses', {}).items():
+                self._misses[name] = self._misses.get(name, 0) + count
+
+    def record(self, name, seconds, found=True):
+        """
+        Record one wait for an element
+
+        Args:
+            name: Element name
+            seconds: Time the wait took
+            found: False if the wait timed out
+        """
+        with self._lock:
+            if not found:
+                self._misses[name] = self._misses.get(name, 0) + 1
+                self._new_misses[name] = self._new_misses.get(name, 0) + 1
+                self._streaks[name] = self._streaks.get(name, 0) + 1
+                return
+            self._streaks.pop(name, None)
+            for values in (self._samples.setdefault(name, []), self._new_samples.setdefault(name, [])):
+                values.append(round(seconds, 4))
+                del values[:-self.max_samples]
+            self._settings.pop(name, None)
+
+    def learned(self, name):
+        """
+        Learned (timeout, poll) of an element
+
+        Returns:
+            Tuple of seconds, or None while the element has too few samples
+        """
+        with self._lock:
+            if name in self._settings:
+                return self._settings[name]
+            values = sorted(self._samples.get(name, ()))
+            settings = None
+            if len(values) >= self.min_samples:
+                p50 = values[(len(values) - 1) // 2]
+                p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+                timeout = max(self.min_timeout, p99 * self.margin)
+                poll = min(self.max_poll, max(self.min_poll, p50 / 4))
+                settings = (timeout, poll)
+            self._settings[name] = settings
+            return settings
+
+    def backed_off(self, name):
+        """True while an element has missed max_misses times in a row"""
+        with self._lock:
+            return bool(self.max_misses) and self._streaks.get(name, 0) >= self.max_misses
+
+    def wait_for(self, name, timeout, poll):
+        """
+        Timeout and poll interval to use for an element
+
+        Args:
+            name: Element name
+            timeout: Timeout requested by the caller (upper bound)
+            poll: Poll interval used when nothing was learned
+
+        Returns:
+            (timeout, poll) in seconds; the caller's while the element is backed off
+        """
+        if self.backed_off(name):
+            return timeout, poll
+        settings = self.learned(name)
+        if settings is None:
+            return timeout, poll
+        return min(timeout, settings[0]), settings[1]
+
+    def summary(self):
+        """
+        Learned settings per element
+
+        Returns:
+            List of dicts with name, samples, misses, timeout and poll (None when untuned)
+            and backed_off (True while the element uses the caller's timeout)
+        """
+        names = sorted(set(self._samples) | set(self._misses))
+        rows = []
+        for name in names:
+            settings = self.learned(name)
+            rows.append({
+                'name': name,
+                'samples': len(self._samples.get(name, ())),
+                'misses': self._misses.get(name, 0),
+                'timeout': round(settings[0], 3) if settings else None,
+                'poll': round(settings[1], 3) if settings else None,
+                'backed_off': self.backed_off(name),
+            })
+        return rows
+
+    def print_summary(self, limit=15):
+        """Print the learned settings of the elements with the most waits"""
+        print("\n=== Adaptive Waits (s) ===")
+        print(f"{'name':<28} {'samples':>7} {'misses':>6} {'timeout':>8} {'poll':>6}")
+        rows = sorted(self.summary(), key=lambda row: row['samples'], reverse=True)
+        for row in rows[:limit]:
+            timeout = '-' if row['timeout'] is None else f"{row['timeout']:.2f}"
+            if row['backed_off']:
+                timeout = 'backoff'
+            poll = '-' if row['poll'] is None else f"{row['poll']:.2f}"
+            print(f"{str(row['name'])[:28]:<28} {row['samples']:>7} {row['misses']:>6} {timeout:>8} {poll:>6}")
+
+    def save(self):
+        """Write the samples to path atomically"""
+        if not self.path:
+            return
+        with self._lock:
+            payload = {'samples': dict(self._samples), 'misses': dict(self._misses)}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.path)
+
+
+# Tuner the element helpers consult; None while adaptive waits are disabled
+active = None
+
+
+def enable_adaptive_waits(path=None, **options):
+    """
+    Turn adaptive waits on for this process
+
+    Args:
+        path: Optional JSON file with wait times of earlier runs
+        **options: Further WaitTuner arguments
+
+    Returns:
+        The active WaitTuner
+    """
+    global active
+    if active is None or active.path != path:
+        active = WaitTuner(path, **options)
+    return active
+
+
+def disable_adaptive_waits():
+    """Turn adaptive waits off"""
+    global active
+    active = None
@@ -0,0 +1,365 @@
+"""
+Async Element Helper - asyncio counterpart of element_helper over the Chrome DevTools Protocol
+Reads of one page can be awaited together with asyncio.gather, clicks and input run one at a time,
+and one event loop can drive the pages of many browser sessions without a thread per browser
+
+Example:
+    async with await AsyncPage.attach(driver) as page:
+        balance, message = await asyncio.gather(
+            get_text(page, config_manager, "balance_strong"),
+            get_text(page, config_manager, "message_span"),
+        )
+
+Requires the optional 'websockets' package. The suites do not use this module yet.
+"""
+import asyncio
+import itertools
+import json
+import time
+import urllib.request
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+try:
+    from .element_helper import FIND_ALL_JS, _SETTLE_STATE_JS
+except ImportError:
+    # Loaded as a top-level module by the suites (common/ on sys.path)
+    from element_helper import FIND_ALL_JS, _SETTLE_STATE_JS
+
+try:
+    import websockets
+except ImportError:  # optional dependency, only needed for the async API
+    websockets = None
+
+
+# Finds the first match of a locator, checks it against the wait type like the
+# ExpectedConditions do and runs an action on it; returns {found, value}
+_ACT_JS = """
+function (by, value, waitType, arg) {
+    %s
+    var el = find(by, value)[0];
+    if (!el) { return {found: false}; }
+    if (waitType === 'visible' || waitType === 'clickable') {
+        if (!el.getClientRects().length || getComputedStyle(el).visibility === 'hidden') { return {found: false}; }
+    }
+    if (waitType === 'clickable' && el.disabled) { return {found: false}; }
+    return {found: true, value: (function (el, arg) { %s })(el, arg)};
+}
+"""
+
+_FIND_ACTION = "return true;"
+_CLICK_ACTION = """
+el.scrollIntoView({block: 'center', inline: 'center'});
+var r = el.getBoundingClientRect();
+return [r.left + r.width / 2, r.top + r.height / 2];
+"""
+_CLEAR_ACTION = """
+el.focus();
+if ('value' in el) {
+    el.value = '';
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return true;
+"""
+_TEXT_ACTION = "return el.getClientRects().length ? (el.innerText || '').trim() : '';"
+_ATTRIBUTE_ACTION = """
+var v = el[arg];
+return (v === undefined || v === null || typeof v === 'object' || typeof v === 'function') ? el.getAttribute(arg) : v;
+"""
+
+
+class CDPConnection:
+    """
+    One DevTools websocket with any number of commands in flight
+
+    Responses are matched to their command by id, so concurrent send()
+    calls do not wait for each other.
+    """
+
+    def __init__(self, websocket):
+        self._websocket = websocket
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._reader = asyncio.ensure_future(self._read())
+
+    @classmethod
+    async def connect(cls, ws_url):
+        """
+        Open a DevTools websocket
+
+        Args:
+            ws_url: webSocketDebuggerUrl of a page target
+
+        Returns:
+            CDPConnection instance
+        """
+        if websockets is None:
+            raise ImportError("The async element helpers need the 'websockets' package: pip install websockets")
+        websocket = await websockets.connect(ws_url, max_size=None)
+        return cls(websocket)
+
+    async def _read(self):
+        """Resolve pending commands as their responses arrive; events are ignored"""
+        try:
+            async for raw in self._websocket:
+                message = json.loads(raw)
+                future = self._pending.pop(message.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    future.set_exception(WebDriverException(message['error'].get('message', str(message['error']))))
+                else:
+                    future.set_result(message.get('result', {}))
+        except Exception as e:
+            error = e
+        else:
+            error = WebDriverException("DevTools connection closed")
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def send(self, method, params=None):
+        """
+        Send a DevTools command and wait for its result
+
+        Args:
+            method: CDP method, e.g. 'Runtime.evaluate'
+            params: Optional dict of parameters
+
+        Returns:
+            Result dict of the command
+        """
+        command_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        await self._websocket.send(json.dumps({'id': command_id, 'method': method, 'params': params or {}}))
+        return await future
+
+    async def close(self):
+        """Close the websocket"""
+        await self._websocket.close()
+        self._reader.cancel()
+
+
+def _debugger_address(driver):
+    """Get host:port of the DevTools endpoint of a chromedriver session"""
+    options = driver.capabilities.get('goog:chromeOptions') or driver.capabilities.get('ms:edgeOptions') or {}
+    address = options.get('debuggerAddress')
+    if not address:
+        raise WebDriverException("Session exposes no DevTools debuggerAddress (Chromium browsers only)")
+    return address
+
+
+def _page_websocket_url(address, target_id):
+    """Find the websocket URL of a page target; chromedriver window handles are target ids"""
+    with urllib.request.urlopen(f"http://{address}/json/list", timeout=10) as response:
+        targets = json.load(response)
+    for target in targets:
+        if target.get('type') == 'page' and target.get('id') == target_id:
+            return target['webSocketDebuggerUrl']
+    # Guessing another page could send commands to another session's browser
+    raise WebDriverException(f"No page target {target_id} found at {address}")
+
+
+class AsyncPage:
+    """
+    Awaitable element commands for one browser page
+
+    Reads (find, get_text, get_attribute) may run concurrently. Clicks and
+    input go to the focused element and the mouse position, which the page
+    has only one of, so they hold a per-page lock from locating the element
+    until the last input event is sent.
+    """
+
+    def __init__(self, connection, poll_interval=0.05):
+        """
+        Initialize AsyncPage
+
+        Args:
+            connection: CDPConnection to the page target
+            poll_interval: Seconds between checks while waiting for an element (default: 0.05)
+        """
+        self.connection = connection
+        self.poll_interval = poll_interval
+        self._input_lock = asyncio.Lock()
+
+    @classmethod
+    async def attach(cls, driver, poll_interval=0.05):
+        """
+        Attach to the current window of a Selenium Chrome session
+
+        The classic WebDriver session stays usable alongside the async page.
+
+        Args:
+            driver: Selenium Chrome WebDriver instance
+            poll_interval: Seconds between checks while waiting for an element
+
+        Returns:
+            AsyncPage instance
+        """
+        address = _debugger_address(driver)
+        ws_url = await asyncio.to_thread(_page_websocket_url, address, driver.current_window_handle)
+        return cls(await CDPConnection.connect(ws_url), poll_interval)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Detach from the page (the browser keeps running)"""
+        await self.connection.close()
+
+    async def evaluate(self, function_source, *args):
+        """
+        Call a JavaScript function in the page and return its JSON result
+
+        Args:
+            function_source: Source of a JS function expression
+            *args: JSON-serializable arguments
+
+        Returns:
+            Value returned by the function
+        """
+        expression = f"({function_source})({', '.join(json.dumps(arg) for arg in args)})"
+        result = await self.connection.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': True,
+        })
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise WebDriverException(details.get('exception', {}).get('description') or details.get('text'))
+        return result.get('result', {}).get('value')
+
+    async def _act(self, locator, action, timeout, arg=None):
+        """Wait until locator matches per its wait type and run action on the element"""
+        script = _ACT_JS % (FIND_ALL_JS, action)
+        end_time = time.monotonic() + timeout
+        while True:
+            try:
+                outcome = await self.evaluate(script, locator.by, locator.value, locator.wait_type, arg)
+            except WebDriverException:
+                # Context destroyed by a navigation in progress
+                outcome = None
+            if outcome and outcome.get('found'):
+                return outcome.get('value')
+            if time.monotonic() >= end_time:
+                raise TimeoutException(f"Element '{locator.name}' not {locator.wait_type} within {timeout}s")
+            await asyncio.sleep(self.poll_interval)
+
+    async def find(self, locator, timeout=10):
+        """
+        Wait until an element matches its locator
+
+        Args:
+            locator: Locator record from ConfigManager.get_locator
+            timeout: Maximum time to wait (default: 10 seconds)
+
+        Raises:
+            TimeoutException: If element not found within timeout
+        """
+        await self._act(locator, _FIND_ACTION, timeout)
+
+    async def click(self, locator, timeout=10):
+        """Click an element with real mouse events at its center"""
+        async with self._input_lock:
+            x, y = await self._act(locator, _CLICK_ACTION, timeout)
+            for event in ('mouseMoved', 'mousePressed', 'mouseReleased'):
+                await self.connection.send('Input.dispatchMouseEvent', {
+                    'type': event, 'x': x, 'y': y, 'button': 'left', 'clickCount': 1,
+                })
+
+    async def input_text(self, locator, text, timeout=10, typing=False):
+        """
+        Clear an input and enter text
+
+        Args:
+            locator: Locator record
+            text: Text to enter
+            timeout: Maximum time to wait for the element
+            typing: Send one key event per character instead of inserting the text at once
+        """
+        # Clearing focuses the element; the text goes to whatever has focus
+        async with self._input_lock:
+            await self._act(locator, _CLEAR_ACTION, timeout)
+            if not text:
+                return
+            text = str(text)
+            if not typing:
+                await self.connection.send('Input.insertText', {'text': text})
+                return
+            for char in text:
+                await self.connection.send('Input.dispatchKeyEvent', {'type': 'keyDown', 'text': char})
+                await self.connection.send('Input.dispatchKeyEvent', {'type': 'keyUp'})
+
+    async def get_text(self, locator, timeout=10):
+        """Get the visible text of an element (stripped)"""
+        return await self._act(locator, _TEXT_ACTION, timeout)
+
+    async def get_attribute(self, locator, attribute, timeout=10):
+        """Get an attribute or property value of an element"""
+        return await self._act(locator, _ATTRIBUTE_ACTION, timeout, attribute)
+
+    async def wait_for_page_settled(self, timeout=10, quiet_period=0.1):
+        """
+        Async version of element_helper.wait_for_page_settled
+
+        Returns:
+            True if the page settled, False if the timeout expired first
+        """
+        script = "function () {" + _SETTLE_STATE_JS + "}"
+        end_time = time.monotonic() + timeout
+        quiet_ms = quiet_period * 1000
+        while True:
+            try:
+                state = await self.evaluate(script)
+            except WebDriverException:
+                state = None
+            if (state and state['ready'] and state['pending'] == 0
+                    and state['angular'] and state['idle'] >= quiet_ms):
+                return True
+            if time.monotonic() >= end_time:
+                return False
+            await asyncio.sleep(self.poll_interval)
+
+    async def navigate(self, url, timeout=10):
+        """Open URL and wait until the page is settled"""
+        await self.connection.send('Page.navigate', {'url': url})
+        return await self.wait_for_page_settled(timeout)
+
+
+def _config_locator(config_manager, element_name):
+    """Get a compiled locator or raise like find_element_by_config"""
+    locator = config_manager.get_locator(element_name)
+    if not locator:
+        raise ValueError(f"Element '{element_name}' not found in config")
+    return locator
+
+
+async def find_element_by_config(page, config_manager, element_name, timeout=10):
+    """Wait until a config element is present/visible/clickable on an AsyncPage"""
+    await page.find(_config_locator(config_manager, element_name), timeout)
+
+
+async def click_element(page, config_manager, element_name, timeout=10):
+    """Click a config element on an AsyncPage"""
+    await page.click(_config_locator(config_manager, element_name), timeout)
+
+
+async def input_text(page, config_manager, element_name, text, timeout=10, typing=False):
+    """Clear a config element on an AsyncPage and enter text"""
+    await page.input_text(_config_locator(config_manager, element_name), text, timeout, typing)
+
+
+async def get_text(page, config_manager, element_name, timeout=10):
+    """Get the text of a config element on an AsyncPage (stripped)"""
+    return await page.get_text(_config_locator(config_manager, element_name), timeout)
+
+
+async def get_element_attribute(page, config_manager, element_name, attribute, timeout=10):
+    """Get an attribute value of a config element on an AsyncPage"""
+    return await page.get_attribute(_config_locator(config_manager, element_name), attribute, timeout)
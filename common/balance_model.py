@@ -0,0 +1,124 @@
+"""
+Balance Model - Expected account balance per browser session, kept from row outcomes
+Lets the withdraw suite reset the account only when the model or a periodic check says it drifted
+"""
+import threading
+
+
+class BalanceModel:
+    """
+    Tracks what each session's account balance should be
+
+    A session starts unknown and becomes known at the target after a
+    reset. Every row then applies its observed outcome: a successful
+    withdrawal lowers the balance, a rejected or invalid one leaves it
+    unchanged, and an outcome that cannot be classified makes it unknown
+    again. A reset is only needed while the balance is unknown or differs
+    from the target. Every check_every rows the page balance is compared
+    with the model, so a transaction the model missed is caught early.
+    """
+
+    def __init__(self, target, check_every=10):
+        """
+        Initialize BalanceModel
+
+        Args:
+            target: Balance every row expects to start from
+            check_every: Rows between balance checks against the page; 0 disables them (default: 10)
+        """
+        self.target = target
+        self.check_every = check_every
+        self.resets = 0
+        self.skipped = 0
+        self.mismatches = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+        self._balances = {}
+        self._unchecked = {}
+
+    def needs_reset(self, session):
+        """
+        Whether a session must be reset before its next row
+
+        Counts the row as skipped when no reset is needed.
+
+        Args:
+            session: Session key, e.g. driver.session_id
+
+        Returns:
+            True if the balance is unknown or differs from the target
+        """
+        with self._lock:
+            needed = self._balances.get(session) != self.target
+            if not needed:
+                self.skipped += 1
+            return needed
+
+    def reset(self, session, counted=True):
+        """
+        Record that a session's balance was set to the target
+
+        Args:
+            session: Session key
+            counted: Count this as a reset in the summary (default: True)
+        """
+        with self._lock:
+            self._balances[session] = self.target
+            self._unchecked[session] = 0
+            if counted:
+                self.resets += 1
+
+    def fallback(self):
+        """Count a reset that had to go through the UI because the snapshot restore failed"""
+        with self._lock:
+            self.fallbacks += 1
+
+    def withdraw(self, session, amount):
+        """Apply a successful withdrawal"""
+        with self._lock:
+            balance = self._balances.get(session)
+            if balance is not None:
+                self._balances[session] = balance - amount
+            self._unchecked[session] = self._unchecked.get(session, 0) + 1
+
+    def unchanged(self, session):
+        """Apply a rejected or invalid withdrawal"""
+        with self._lock:
+            self._unchecked[session] = self._unchecked.get(session, 0) + 1
+
+    def invalidate(self, session):
+        """Forget a session's balance after an outcome that cannot be classified"""
+        with self._lock:
+            self._balances[session] = None
+
+    def check_due(self, session):
+        """True when a known balance has gone check_every rows without a check"""
+        with self._lock:
+            return (bool(self.check_every) and self._balances.get(session) is not None
+                    and self._unchecked.get(session, 0) >= self.check_every)
+
+    def verify(self, session, observed):
+        """
+        Compare the balance shown on the page with the model
+
+        Args:
+            session: Session key
+            observed: Balance read from the page (None if it could not be read)
+
+        Returns:
+            True if they match; otherwise the balance becomes unknown
+        """
+        with self._lock:
+            self._unchecked[session] = 0
+            if observed is not None and observed == self._balances.get(session):
+                return True
+            self.mismatches += 1
+            self._balances[session] = None
+            return False
+
+    def summary(self):
+        """One-line report of resets, skipped resets, check mismatches and UI fallbacks"""
+        rows = self.resets + self.skipped
+        return (f"Balance resets: {self.resets} of {rows} rows "
+                f"({self.skipped} skipped by the model, {self.mismatches} check mismatches, "
+                f"{self.fallbacks} UI fallbacks after a snapshot restore)")
@@ -5,17 +5,180 @@ Manages configuration for test elements and URLs
 import pandas as pd
 import os
 import csv
+from collections import namedtuple
+from urllib.parse import urlsplit, urlunsplit
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+
+# Immutable, precompiled element locator built once when the config is loaded.
+# timeout and poll (seconds) come from the optional config columns of the same name
+Locator = namedtuple(
+    'Locator',
+    ['name', 'by', 'value', 'wait_type', 'condition', 'description', 'timeout', 'poll'],
+    defaults=(None, None)
+)
+
+# Map locator_type to By enum
+LOCATOR_TYPES = {
+    'xpath': By.XPATH,
+    'id': By.ID,
+    'css': By.CSS_SELECTOR,
+    'name': By.NAME,
+    'class_name': By.CLASS_NAME,
+    'tag_name': By.TAG_NAME,
+    'link_text': By.LINK_TEXT,
+    'partial_link_text': By.PARTIAL_LINK_TEXT
+}
+
+# Map wait_type to ExpectedCondition factory
+WAIT_CONDITIONS = {
+    'clickable': EC.element_to_be_clickable,
+    'presence': EC.presence_of_element_located,
+    'visible': EC.visibility_of_element_located
+}
+
+
+# Browser settings from the 'profile' section, applied by driver_factory.create_driver
+DriverProfile = namedtuple('DriverProfile', ['blocked_urls', 'page_load_strategy', 'headless', 'window_size'])
+
+# Chrome defaults: nothing blocked, wait for the load event, headless decided by the caller
+DEFAULT_PROFILE = DriverProfile(blocked_urls=(), page_load_strategy='normal', headless=None, window_size=None)
+
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+
+
+# Environment variable that points every configured URL at another host,
+# e.g. the local stand-in server (standin/server.py)
+BASE_URL_ENV = 'TEST_BASE_URL'
+
+
+def rebase_url(url, base_url=None):
+    """
+    Point a URL at another scheme and host, keeping path, query and fragment
+    
+    Args:
+        url: Original URL
+        base_url: Target like http://127.0.0.1:8000 (default: $TEST_BASE_URL)
+        
+    Returns:
+        Rebased URL, or url unchanged when no base URL is set
+    """
+    base_url = base_url or os.environ.get(BASE_URL_ENV)
+    if not base_url or not isinstance(url, str):
+        return url
+    base = urlsplit(base_url)
+    parts = urlsplit(url)
+    return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+
+def _seconds(element_name, column, value):
+    """Parse an optional positive number of seconds from a config cell"""
+    if value is None or pd.isna(value) or str(value).strip() == '':
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        seconds = -1
+    if seconds <= 0:
+        raise ValueError(f"Invalid {column} for '{element_name}': {value}")
+    return seconds
+
+
+def compile_locator(element_name, locator_type, locator_value, wait_type, description='', timeout=None, poll=None):
+    """
+    Compile one element config row into a Locator record
+    
+    Args:
+        element_name: Name of the element in config
+        locator_type: Locator type from config (xpath, id, css, ...)
+        locator_value: Locator expression
+        wait_type: Wait type from config (clickable, presence, visible); defaults to presence
+        description: Optional element description
+        timeout: Optional wait timeout in seconds, overriding the helpers' timeout
+        poll: Optional poll interval in seconds for waits on this element
+        
+    Returns:
+        Locator namedtuple
+        
+    Raises:
+        ValueError: If the locator type is not supported or timeout/poll is not a positive number
+    """
+    by = LOCATOR_TYPES.get(str(locator_type).strip().lower())
+    if not by:
+        raise ValueError(f"Unsupported locator type for '{element_name}': {locator_type}")
+    
+    wait_type = str(wait_type).strip().lower() if pd.notna(wait_type) else 'presence'
+    if wait_type not in WAIT_CONDITIONS:
+        wait_type = 'presence'
+    
+    return Locator(
+        name=element_name,
+        by=by,
+        value=locator_value,
+        wait_type=wait_type,
+        condition=WAIT_CONDITIONS[wait_type],
+        description=description if pd.notna(description) else '',
+        timeout=_seconds(element_name, 'timeout', timeout),
+        poll=_seconds(element_name, 'poll', poll)
+    )
+
+
+def compile_profile(settings):
+    """
+    Compile the 'profile' section of a config into a DriverProfile
+    
+    Each setting is one row: block_url (repeatable, a Chrome URL pattern
+    with * wildcards), page_load_strategy (normal, eager or none),
+    headless (true/false) and window_size (WIDTHxHEIGHT).
+    
+    Args:
+        settings: Iterable of (setting name, value) pairs
+        
+    Returns:
+        DriverProfile namedtuple
+        
+    Raises:
+        ValueError: If a setting or its value is not supported
+    """
+    blocked_urls = []
+    profile = DEFAULT_PROFILE._asdict()
+    for name, value in settings:
+        name = str(name).strip().lower()
+        value = str(value).strip() if pd.notna(value) else ''
+        if name == 'block_url':
+            if value:
+                blocked_urls.append(value)
+        elif name == 'page_load_strategy':
+            if value.lower() not in PAGE_LOAD_STRATEGIES:
+                raise ValueError(f"Unsupported page_load_strategy: {value}")
+            profile['page_load_strategy'] = value.lower()
+        elif name == 'headless':
+            if value.lower() not in ('true', 'false'):
+                raise ValueError(f"headless must be true or false, got: {value}")
+            profile['headless'] = value.lower() == 'true'
+        elif name == 'window_size':
+            width, _, height = value.lower().partition('x')
+            if not (width.strip().isdigit() and height.strip().isdigit()):
+                raise ValueError(f"window_size must look like 1366x768, got: {value}")
+            profile['window_size'] = (int(width), int(height))
+        else:
+            raise ValueError(f"Unsupported profile setting: {name}")
+    profile['blocked_urls'] = tuple(blocked_urls)
+    return DriverProfile(**profile)
 
 
 class ConfigManager:
     """Manages configuration for test elements and URLs"""
     
-    def __init__(self, config_file):
+    def __init__(self, config_file, base_url=None):
         """
         Initialize ConfigManager with config file
         
         Args:
             config_file: Path to config CSV file
+            base_url: Optional scheme and host for every URL (default: $TEST_BASE_URL)
         """
         if not os.path.exists(config_file):
             raise FileNotFoundError(f"Config file not found: {config_file}")
@@ -23,19 +186,23 @@ class ConfigManager:
         # Read CSV with proper quoting to handle commas in values
         # quoting=1 means QUOTE_ALL, which handles quoted fields correctly
         self.config = pd.read_csv(config_file, quoting=csv.QUOTE_ALL)
+        self.base_url = base_url
         self.urls = {}
         self.elements = {}
+        self.locators = {}
+        self.profile = DEFAULT_PROFILE
         self._load_config()
     
     def _load_config(self):
-        """Load URLs and elements from config file"""
-        # Separate URLs and elements
+        """Load URLs, elements and the browser profile from config file"""
+        # Separate URLs, elements and profile settings
         url_config = self.config[self.config['section'] == 'url']
         element_config = self.config[self.config['section'] == 'element']
+        profile_config = self.config[self.config['section'] == 'profile']
         
         # Load URLs
         for _, row in url_config.iterrows():
-            self.urls[row['element_name']] = row['locator_value']
+            self.urls[row['element_name']] = rebase_url(row['locator_value'], self.base_url)
         
         # Load Elements
         for _, row in element_config.iterrows():
@@ -43,8 +210,22 @@ class ConfigManager:
                 'locator_type': row['locator_type'],
                 'locator_value': row['locator_value'],
                 'wait_type': row['wait_type'],
-                'description': row.get('description', '')
+                'description': row.get('description', ''),
+                'timeout': row.get('timeout'),
+                'poll': row.get('poll')
             }
+            self.locators[row['element_name']] = compile_locator(
+                row['element_name'],
+                row['locator_type'],
+                row['locator_value'],
+                row['wait_type'],
+                row.get('description', ''),
+                row.get('timeout'),
+                row.get('poll')
+            )
+        
+        # Load browser profile
+        self.profile = compile_profile(zip(profile_config['element_name'], profile_config['locator_value']))
     
     def get_url(self, url_name):
         """
@@ -70,6 +251,27 @@ class ConfigManager:
         """
         return self.elements.get(element_name)
     
+    def get_locator(self, element_name):
+        """
+        Get precompiled locator by name
+        
+        Args:
+            element_name: Name of the element in config
+            
+        Returns:
+            Locator namedtuple or None if not found
+        """
+        return self.locators.get(element_name)
+    
+    def get_profile(self):
+        """
+        Get the browser profile declared in the config
+        
+        Returns:
+            DriverProfile namedtuple (DEFAULT_PROFILE when the config has no profile rows)
+        """
+        return self.profile
+    
     def list_urls(self):
         """List all available URLs"""
         return list(self.urls.keys())
@@ -0,0 +1,232 @@
+"""
+Data Generator - Builds boundary-value and equivalence-partition data CSVs
+Rows are assembled column-wise with NumPy, so even 100k rows take well under a second
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+# A text field validated by its length; max_length None means no upper limit.
+# Values are prefixes of pattern, so length is the only thing that varies
+LengthField = namedtuple('LengthField', ['column', 'min_length', 'max_length', 'nominal_length', 'pattern'])
+
+# Register form limits, as enforced by the live site (see standin/server.py)
+REGISTER_FIELDS = [
+    LengthField('firstname', 1, 32, 4, 'Khoa' + 'a' * 100),
+    LengthField('lastname', 1, 32, 6, 'Nguyen' + 'n' * 100),
+    LengthField('telephone', 3, 32, 11, '+84' + '1234567890' * 10),
+    LengthField('password', 4, None, 4, '1' * 100),
+]
+
+REGISTER_COLUMNS = [
+    'test_id', 'firstname', 'lastname', 'email', 'telephone', 'password', 'confirm',
+    'newsletter', 'privacy', 'expected', 'verify_message'
+]
+WITHDRAW_COLUMNS = ['amount', 'expected', 'verify_message']
+
+# Address that already exists on the site, used for the "already registered" partition
+REGISTERED_EMAIL = 'group7F3@gmail.com'
+
+SUCCESS_MESSAGE = 'Your Account Has Been Created!'
+REGISTERED_MESSAGE = 'Warning: E-Mail Address is already registered!'
+WITHDRAW_SUCCESS = 'Transaction successful'
+WITHDRAW_FAILED = 'Transaction Failed. You can not withdraw amount more than the balance.'
+
+# Non-numeric amounts the amount input ends up empty for
+INVALID_AMOUNTS = ['abc', '++', '']
+
+
+def boundary_lengths(field):
+    """
+    Lengths worth testing for a field: around both limits plus one far above
+
+    Args:
+        field: LengthField
+
+    Returns:
+        Sorted int array of distinct lengths
+    """
+    lengths = {0, field.min_length - 1, field.min_length, field.min_length + 1, field.nominal_length}
+    if field.max_length is None:
+        lengths.update({field.nominal_length * 5, field.nominal_length * 5 + 1})
+    else:
+        lengths.update({field.max_length - 1, field.max_length, field.max_length + 1, field.max_length * 2})
+    return np.array(sorted(n for n in lengths if 0 <= n <= len(field.pattern)))
+
+
+def _length_values(field, lengths):
+    """Object array with one field value per length, built from the distinct lengths only"""
+    distinct, codes = np.unique(lengths, return_inverse=True)
+    values = np.array([field.pattern[:n] for n in distinct], dtype=object)
+    return values[codes]
+
+
+def _length_valid(field, lengths):
+    """Boolean array: which lengths the site accepts"""
+    valid = lengths >= field.min_length
+    if field.max_length is not None:
+        valid &= lengths <= field.max_length
+    return valid
+
+
+def _numbered(prefix, start, count, width):
+    """Object array like BVA_0001, BVA_0002, ..."""
+    numbers = pd.Series(np.arange(start, start + count)).astype(str).str.zfill(width)
+    return (prefix + numbers).to_numpy(dtype=object)
+
+
+def _register_frame(test_ids, lengths, email_kind, confirm_matches, privacy, newsletter, fields):
+    """
+    Assemble register rows and their expected outcome from per-row choices
+
+    Args:
+        test_ids: Object array of test IDs
+        lengths: Dict of column -> int array of value lengths
+        email_kind: Int array, 0 = unique valid, 1 = malformed, 2 = already registered
+        confirm_matches: Bool array, whether confirm repeats the password
+        privacy: Bool array, whether the privacy policy is accepted
+        newsletter: Bool array, whether the newsletter is subscribed
+        fields: LengthField list
+
+    Returns:
+        DataFrame with REGISTER_COLUMNS
+    """
+    count = len(test_ids)
+    frame = {'test_id': test_ids}
+    fields_valid = np.ones(count, dtype=bool)
+    for field in fields:
+        frame[field.column] = _length_values(field, lengths[field.column])
+        fields_valid &= _length_valid(field, lengths[field.column])
+
+    # Each row gets its own address; the suites add a random suffix on top
+    serial = pd.Series(np.arange(count)).astype(str)
+    emails = np.where(email_kind == 1, ('group7G' + serial + 'gmail.com').to_numpy(dtype=object),
+                      ('group7G' + serial + '@gmail.com').to_numpy(dtype=object))
+    frame['email'] = np.where(email_kind == 2, REGISTERED_EMAIL, emails)
+
+    password = frame['password']
+    mismatch = pd.Series(password).str.slice(0, -1).to_numpy(dtype=object) + '9'
+    frame['confirm'] = np.where(confirm_matches, password, mismatch)
+    frame['newsletter'] = np.where(newsletter, 'Yes', 'No')
+    frame['privacy'] = privacy
+
+    # Field errors and the privacy warning both keep the user on the form;
+    # the "already registered" warning is reported even for valid fields
+    valid = fields_valid & (email_kind == 0) & confirm_matches & privacy
+    registered_only = fields_valid & (email_kind == 2) & confirm_matches
+    frame['expected'] = np.where(valid, 'success', 'failure')
+    frame['verify_message'] = np.select([valid, registered_only], [SUCCESS_MESSAGE, REGISTERED_MESSAGE], '')
+    return pd.DataFrame(frame, columns=REGISTER_COLUMNS)
+
+
+def generate_register_data(rows, seed=None, fields=REGISTER_FIELDS):
+    """
+    Generate register data rows for boundary values and partition mixes
+
+    The first rows are a one-factor table: every boundary length of every
+    field with all other inputs nominal (BVA_ IDs), followed by the invalid
+    e-mail, registered e-mail, confirm mismatch, privacy, newsletter and
+    letters-only telephone partitions. The remaining rows (ECP_ IDs) combine
+    random boundary lengths and partitions, biased towards nominal values so
+    that failures stay attributable.
+
+    Args:
+        rows: Total number of rows (at least the one-factor table is produced)
+        seed: Optional random seed for reproducible data
+        fields: LengthField list (default: REGISTER_FIELDS)
+
+    Returns:
+        DataFrame with the columns of data_register.csv
+    """
+    rng = np.random.default_rng(seed)
+
+    # ==== One-factor boundary table ====
+    plan = [(field.column, n) for field in fields for n in boundary_lengths(field)]
+    plan += [(None, None)] * 6
+    count = len(plan)
+    lengths = {field.column: np.full(count, field.nominal_length) for field in fields}
+    for position, (column, n) in enumerate(plan):
+        if column is not None:
+            lengths[column][position] = n
+    email_kind = np.zeros(count, dtype=int)
+    confirm_matches = np.ones(count, dtype=bool)
+    privacy = np.ones(count, dtype=bool)
+    newsletter = np.zeros(count, dtype=bool)
+    partitions = count - 6
+    email_kind[partitions] = 1
+    email_kind[partitions + 1] = 2
+    confirm_matches[partitions + 2] = False
+    privacy[partitions + 3] = False
+    newsletter[partitions + 4] = True
+    table = _register_frame(_numbered('BVA_', 1, count, 4), lengths, email_kind, confirm_matches,
+                            privacy, newsletter, fields)
+    # Telephone format is not validated; this row also keeps the column text
+    # (instead of numbers) when pandas reads the CSV back
+    table.loc[partitions + 5, 'telephone'] = 'aaa123'
+
+    extra = max(0, int(rows) - count)
+    if not extra:
+        return table
+
+    # ==== Random partition mixes ====
+    lengths = {}
+    for field in fields:
+        candidates = boundary_lengths(field)
+        nominal = rng.random(extra) < 0.6
+        lengths[field.column] = np.where(nominal, field.nominal_length, rng.choice(candidates, extra))
+    email_kind = rng.choice(3, extra, p=[0.9, 0.05, 0.05])
+    confirm_matches = rng.random(extra) >= 0.05
+    privacy = rng.random(extra) >= 0.05
+    newsletter = rng.random(extra) < 0.5
+    mixes = _register_frame(_numbered('ECP_', 1, extra, len(str(extra))), lengths, email_kind,
+                            confirm_matches, privacy, newsletter, fields)
+    return pd.concat([table, mixes], ignore_index=True)
+
+
+def _withdraw_frame(amounts, balance):
+    """Expected outcome of withdraw amounts (object array of strings) against a balance"""
+    numeric = pd.to_numeric(pd.Series(amounts), errors='coerce').to_numpy()
+    invalid = np.isnan(numeric)
+    within = ~invalid & (numeric >= 1) & (numeric <= balance)
+    above = ~invalid & (numeric > balance)
+    expected = np.select([invalid, within], ['invalid', 'success'], 'failure')
+    message = np.select([within, above], [WITHDRAW_SUCCESS, WITHDRAW_FAILED], '')
+    return pd.DataFrame({'amount': amounts, 'expected': expected, 'verify_message': message},
+                        columns=WITHDRAW_COLUMNS)
+
+
+def generate_withdraw_data(rows, balance=5096, seed=None):
+    """
+    Generate withdraw data rows for the amount field against a fixed balance
+
+    The first rows are the boundaries 0, 1, 2, balance - 1, balance and
+    balance + 1, a negative amount and the non-numeric inputs. The rest are
+    drawn from the partitions: within the balance, above it, zero or
+    negative, and non-numeric.
+
+    Args:
+        rows: Total number of rows (at least the boundary rows are produced)
+        balance: Balance restored before every row (default: 5096)
+        seed: Optional random seed for reproducible data
+
+    Returns:
+        DataFrame with the columns of data_withdraw.csv
+    """
+    rng = np.random.default_rng(seed)
+    boundaries = [0, 1, 2, balance - 1, balance, balance + 1, -1, balance * 2]
+    amounts = np.array([str(n) for n in boundaries] + INVALID_AMOUNTS, dtype=object)
+
+    extra = max(0, int(rows) - len(amounts))
+    if extra:
+        partition = rng.choice(4, extra, p=[0.5, 0.3, 0.1, 0.1])
+        numbers = np.select(
+            [partition == 0, partition == 1],
+            [rng.integers(1, balance + 1, extra), rng.integers(balance + 1, balance * 3, extra)],
+            -rng.integers(0, balance, extra),
+        )
+        drawn = pd.Series(numbers).astype(str).to_numpy(dtype=object)
+        invalid = np.array(INVALID_AMOUNTS, dtype=object)[rng.integers(0, len(INVALID_AMOUNTS), extra)]
+        amounts = np.concatenate([amounts, np.where(partition == 3, invalid, drawn)])
+    return _withdraw_frame(amounts, balance)
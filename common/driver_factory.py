@@ -0,0 +1,75 @@
+"""
+Driver Factory - Creates configured Chrome WebDriver sessions for the test suites
+"""
+import hashlib
+
+from selenium import webdriver
+
+try:
+    from .config_manager import DEFAULT_PROFILE
+except ImportError:
+    # Loaded as a top-level module by the suites (common/ on sys.path)
+    from config_manager import DEFAULT_PROFILE
+
+
+def create_driver(headless=False, window_size=(1920, 1080), profile=None):
+    """
+    Create a Chrome WebDriver session
+
+    Args:
+        headless: Run Chrome without a visible window (default: False)
+        window_size: (width, height) used for headless sessions
+        profile: Optional DriverProfile from ConfigManager.get_profile; its
+            headless and window_size take precedence over the arguments,
+            its page-load strategy is applied and its URL patterns are
+            blocked in the first window of the session
+
+    Returns:
+        Chrome WebDriver instance
+    """
+    if profile and profile.headless is not None:
+        headless = profile.headless
+    if profile and profile.window_size:
+        window_size = profile.window_size
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+    if profile:
+        options.page_load_strategy = profile.page_load_strategy
+    # Keep the console log readable for failure artifacts
+    options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+
+    driver = webdriver.Chrome(options=options)
+    if not headless:
+        if profile and profile.window_size:
+            driver.set_window_size(*window_size)
+        else:
+            driver.maximize_window()
+    if profile and profile.blocked_urls:
+        # Requests matching a pattern fail before they leave the browser
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(profile.blocked_urls)})
+    return driver
+
+
+def driver_pool_name(headless, profile=None):
+    """
+    Name of the shared driver pool for a browser configuration
+
+    Suites with the same headless mode and profile share warm sessions;
+    a different profile gets its own pool.
+
+    Args:
+        headless: Whether the sessions are headless
+        profile: Optional DriverProfile
+
+    Returns:
+        Pool name for get_shared_pool
+    """
+    name = f"chrome-headless={headless}"
+    if profile and profile != DEFAULT_PROFILE:
+        digest = hashlib.sha1(repr(tuple(profile)).encode('utf-8')).hexdigest()[:10]
+        name += f"-profile={digest}"
+    return name
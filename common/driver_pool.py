@@ -0,0 +1,243 @@
+"""
+Driver Pool - Keeps warm, pre-launched WebDriver sessions that are leased to the suites
+Sessions are reset between leases and recycled after a configurable number of uses
+"""
+import atexit
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+
+_CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def reset_session(driver, window_rect=None):
+    """
+    Bring a used session back to a clean state
+
+    Closes every window except the first, clears cookies and web storage of
+    the current origin and leaves the session on about:blank.
+
+    Args:
+        driver: Selenium WebDriver instance
+        window_rect: Optional dict with x, y, width and height to restore
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    driver.execute_script(_CLEAR_STORAGE_JS)
+    try:
+        # Clears cookies of every domain, not only the current one
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except (AttributeError, WebDriverException):
+        driver.delete_all_cookies()
+
+    driver.get('about:blank')
+    if window_rect:
+        driver.set_window_rect(**window_rect)
+
+
+class DriverPool:
+    """
+    Pool of warm browser sessions
+
+    Up to size idle sessions are kept open. acquire() hands out an idle
+    session or launches a new one when none is idle, so callers never block.
+    release() resets the session and keeps it for the next lease, or quits
+    it when it reached max_uses, failed to reset or the pool is full.
+    """
+
+    def __init__(self, driver_factory, size=1, max_uses=50, prewarm=True):
+        """
+        Initialize DriverPool
+
+        Args:
+            driver_factory: Callable() returning a new WebDriver instance
+            size: Number of idle sessions kept warm (default: 1)
+            max_uses: Leases after which a session is quit and replaced (default: 50)
+            prewarm: Launch size sessions right away (default: True)
+        """
+        self.driver_factory = driver_factory
+        self.size = max(1, int(size))
+        self.max_uses = max(1, int(max_uses))
+        self._idle = []
+        self._uses = {}
+        self._window_rects = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        if prewarm:
+            self.prewarm()
+
+    def _launch(self):
+        """Start a new session and remember its initial window geometry"""
+        driver = self.driver_factory()
+        try:
+            window_rect = driver.get_window_rect()
+        except WebDriverException:
+            window_rect = None
+        with self._lock:
+            self._uses[driver.session_id] = 0
+            self._window_rects[driver.session_id] = window_rect
+        return driver
+
+    def _quit(self, driver):
+        """Quit a session and forget its bookkeeping"""
+        with self._lock:
+            self._uses.pop(driver.session_id, None)
+            self._window_rects.pop(driver.session_id, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def prewarm(self, count=None):
+        """
+        Launch sessions in parallel until count sessions are idle
+
+        Args:
+            count: Target number of idle sessions (default: pool size)
+        """
+        with self._lock:
+            missing = (count or self.size) - len(self._idle)
+        if missing <= 0:
+            return
+
+        launched = []
+
+        def launch():
+            launched.append(self._launch())
+
+        threads = [threading.Thread(target=launch, daemon=True) for _ in range(missing)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with self._lock:
+            self._idle.extend(launched)
+
+    def acquire(self):
+        """
+        Lease a session from the pool
+
+        Returns:
+            WebDriver instance, warm if one was idle
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            if self._idle:
+                return self._idle.pop()
+        return self._launch()
+
+    def release(self, driver, discard=False):
+        """
+        Return a leased session to the pool
+
+        Args:
+            driver: WebDriver instance obtained from acquire()
+            discard: Quit the session instead of keeping it (e.g. after a crash)
+        """
+        with self._lock:
+            uses = self._uses.get(driver.session_id, 0) + 1
+            self._uses[driver.session_id] = uses
+            window_rect = self._window_rects.get(driver.session_id)
+            keep = (not discard and not self._closed
+                    and uses < self.max_uses and len(self._idle) < self.size)
+
+        if keep:
+            try:
+                reset_session(driver, window_rect)
+            except WebDriverException:
+                keep = False
+
+        if not keep:
+            self._quit(driver)
+            return
+        with self._lock:
+            if self._closed:
+                keep = False
+            else:
+                self._idle.append(driver)
+        if not keep:
+            self._quit(driver)
+
+    @contextmanager
+    def lease(self):
+        """
+        Context manager leasing one session
+
+        The session is discarded instead of reused when the block raises.
+        """
+        driver = self.acquire()
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, discard=True)
+            raise
+        self.release(driver)
+
+    def close(self):
+        """Quit every idle session; sessions still leased are quit on release"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# Process-wide pools shared by every suite run in the same interpreter
+_shared_pools = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_pool(name, driver_factory, size=1, max_uses=50):
+    """
+    Get the shared pool registered under name, creating it on first use
+
+    Suites started from the same process (see run_suites.py) reuse the warm
+    sessions of the pool instead of launching their own browser. Shared
+    pools are closed when the interpreter exits.
+
+    Args:
+        name: Pool key, e.g. describing the browser options
+        driver_factory: Callable() returning a new WebDriver instance
+        size: Number of idle sessions kept warm when the pool is created
+        max_uses: Leases after which a session is replaced
+
+    Returns:
+        DriverPool instance
+    """
+    with _shared_lock:
+        pool = _shared_pools.get(name)
+        if pool is None or pool._closed:
+            pool = DriverPool(driver_factory, size=size, max_uses=max_uses, prewarm=False)
+            _shared_pools[name] = pool
+        pool.size = max(pool.size, int(size))
+    pool.prewarm(size)
+    return pool
+
+
+def close_shared_pools():
+    """Close every shared pool"""
+    with _shared_lock:
+        pools = list(_shared_pools.values())
+        _shared_pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_shared_pools)
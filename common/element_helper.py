@@ -1,12 +1,313 @@
 """
 Element Helper for Level 2 - Helper functions to interact with elements using config
 """
-from selenium.webdriver.common.by import By
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+try:
+    from . import metrics as _metrics
+    from . import adaptive_waits as _waits
+except ImportError:
+    # Loaded as a top-level module by the suites (common/ on sys.path)
+    import metrics as _metrics
+    import adaptive_waits as _waits
+
+# WebDriverWait's own poll interval, used unless config or learned waits say otherwise
+DEFAULT_POLL = 0.5
+
+
+# Installs (once per document) counters for pending XHR/fetch calls and a
+# MutationObserver that stamps the time of the last DOM content change.
+_SETTLE_HOOKS_JS = """
+(function () {
+    var w = window;
+    if (w.__swSettle) { return; }
+    var state = w.__swSettle = {pending: 0, lastChange: Date.now()};
+    function done() { state.pending = Math.max(0, state.pending - 1); state.lastChange = Date.now(); }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        this.addEventListener('loadend', done);
+        try { return send.apply(this, arguments); } catch (e) { done(); throw e; }
+    };
+    if (w.fetch) {
+        var fetch = w.fetch;
+        w.fetch = function () {
+            state.pending++;
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+    function observe() {
+        new MutationObserver(function () { state.lastChange = Date.now(); })
+            .observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    }
+    if (document.documentElement) { observe(); } else { document.addEventListener('DOMContentLoaded', observe); }
+})();
+"""
+
+_SETTLE_STATE_JS = _SETTLE_HOOKS_JS + """
+var w = window, state = w.__swSettle, angularStable = true;
+try {
+    if (w.angular) {
+        var root = document.querySelector('[ng-app],[data-ng-app]') || document.body;
+        var injector = w.angular.element(root).injector();
+        if (injector) { angularStable = injector.get('$http').pendingRequests.length === 0; }
+    }
+    if (w.getAllAngularTestabilities) {
+        angularStable = angularStable && w.getAllAngularTestabilities().every(function (t) { return t.isStable(); });
+    }
+} catch (e) {}
+return {
+    ready: document.readyState === 'complete',
+    pending: state.pending,
+    idle: Date.now() - state.lastChange,
+    angular: angularStable
+};
+"""
+
+# Sessions that already have the settle hooks registered for new documents
+_hooked_sessions = set()
+
+
+def _install_settle_hooks(driver):
+    """Register the settle hooks to run before page scripts on every new document (Chromium only)"""
+    session_id = getattr(driver, 'session_id', None)
+    if session_id in _hooked_sessions:
+        return
+    _hooked_sessions.add(session_id)
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': _SETTLE_HOOKS_JS})
+    except (AttributeError, WebDriverException):
+        # No CDP: hooks are installed lazily by the first state check on each page
+        pass
+
+
+def wait_for_page_settled(driver, timeout=10, quiet_period=0.1, poll_interval=0.05):
+    """
+    Wait until the current page is settled instead of sleeping for a fixed time
+    
+    The page counts as settled when the document is fully loaded, no XHR/fetch
+    request is pending, AngularJS/Angular report no outstanding work and the
+    DOM content has not changed for quiet_period seconds.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        timeout: Maximum time to wait (default: 10 seconds)
+        quiet_period: Seconds without DOM changes required (default: 0.1)
+        poll_interval: Seconds between state checks (default: 0.05)
+        
+    Returns:
+        True if the page settled, False if the timeout expired first
+    """
+    _install_settle_hooks(driver)
+    start = time.monotonic()
+    end_time = start + timeout
+    quiet_ms = quiet_period * 1000
+    while True:
+        try:
+            state = driver.execute_script(_SETTLE_STATE_JS)
+        except WebDriverException:
+            # Script context destroyed by a navigation in progress
+            state = None
+        settled = bool(state and state['ready'] and state['pending'] == 0
+                       and state['angular'] and state['idle'] >= quiet_ms)
+        if settled or time.monotonic() >= end_time:
+            registry = _metrics.active
+            if registry is not None:
+                registry.record('settle' if settled else 'settle_timeout', '', time.monotonic() - start)
+            return settled
+        time.sleep(poll_interval)
+
+
+def navigate(driver, url, timeout=10):
+    """
+    Open URL and wait until the page is settled
+    
+    Args:
+        driver: Selenium WebDriver instance
+        url: URL to open
+        timeout: Maximum time to wait for the page to settle
+        
+    Returns:
+        True if the page settled within timeout
+    """
+    registry = _metrics.active
+    if registry is None:
+        driver.get(url)
+        return wait_for_page_settled(driver, timeout)
+    with registry.timer('navigate', url):
+        driver.get(url)
+    return wait_for_page_settled(driver, timeout)
+
+
+class ElementHandleCache:
+    """
+    Per-page cache of found WebElements
+    
+    Entries are keyed by driver session and locator, so one cache can be
+    shared by several workers. A cached element is reused only while it is
+    still attached to the document and the page URL is unchanged; both are
+    checked in a single script call instead of a fresh WebDriverWait search.
+    """
+    
+    _VALIDATE_JS = """
+var el = arguments[0], waitType = arguments[1];
+var usable = el.isConnected;
+if (usable && (waitType === 'visible' || waitType === 'clickable')) {
+    usable = el.getClientRects().length > 0;
+}
+if (usable && waitType === 'clickable') {
+    usable = !el.disabled;
+}
+return [document.URL, usable];
+"""
+    
+    def __init__(self):
+        self._entries = {}
+    
+    def get(self, driver, locator):
+        """
+        Get a cached element that is still valid for the current page
+        
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Locator record the element was found with
+            
+        Returns:
+            WebElement or None if not cached, stale or from another page
+        """
+        key = (driver.session_id, locator)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        url, element = entry
+        try:
+            current_url, usable = driver.execute_script(self._VALIDATE_JS, element, locator.wait_type)
+        except WebDriverException:
+            usable = False
+        if usable and current_url == url:
+            return element
+        self._entries.pop(key, None)
+        return None
+    
+    def put(self, driver, locator, element):
+        """
+        Cache an element found on the current page
+        
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Locator record the element was found with
+            element: WebElement to cache
+        """
+        self._entries[(driver.session_id, locator)] = (driver.current_url, element)
+    
+    def invalidate(self, driver=None):
+        """
+        Drop cached elements
+        
+        Args:
+            driver: Only drop elements of this driver session (default: all)
+        """
+        if driver is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == driver.session_id]:
+            del self._entries[key]
+
+
+def wait_settings(locator, timeout):
+    """
+    Timeout and poll interval for waiting on a locator
+    
+    The timeout/poll config columns win; otherwise, with adaptive waits
+    enabled, the values learned for the element are used (never longer
+    than timeout); otherwise timeout and DEFAULT_POLL.
+    
+    Args:
+        locator: Locator record
+        timeout: Timeout requested by the caller
+        
+    Returns:
+        (timeout, poll) in seconds
+    """
+    poll = DEFAULT_POLL
+    tuner = _waits.active
+    if tuner is not None:
+        timeout, poll = tuner.wait_for(locator.name, timeout, poll)
+    if locator.timeout is not None:
+        timeout = locator.timeout
+    if locator.poll is not None:
+        poll = locator.poll
+    return timeout, poll
+
+
+def find_element_by_locator(driver, locator, timeout=10, cache=None):
+    """
+    Find element using a precompiled locator
+    
+    Args:
+        driver: Selenium WebDriver instance
+        locator: Locator record from ConfigManager.get_locator
+        timeout: Maximum time to wait for element (default: 10 seconds);
+            see wait_settings for config and learned overrides
+        cache: Optional ElementHandleCache to reuse previously found elements
+        
+    Returns:
+        WebElement if found
+        
+    Raises:
+        TimeoutException: If element not found within timeout
+    """
+    registry = _metrics.active
+    start = time.perf_counter() if registry is not None else 0
+    
+    if cache is not None:
+        element = cache.get(driver, locator)
+        if element is not None:
+            if registry is not None:
+                registry.record('find_cached', locator.name, time.perf_counter() - start)
+            return element
+    
+    timeout, poll = wait_settings(locator, timeout)
+    tuner = _waits.active
+    condition = locator.condition((locator.by, locator.value))
+    if registry is not None:
+        # Times every check, so the round trip of the successful lookup ('find')
+        # is recorded apart from the polling that came before it ('find_wait')
+        last_check = [0.0]
+
+        def timed_condition(drv, check=condition):
+            check_start = time.perf_counter()
+            try:
+                return check(drv)
+            finally:
+                last_check[0] = time.perf_counter() - check_start
+        condition = timed_condition
+    wait_start = time.perf_counter()
+    try:
+        element = WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+    except Exception:
+        if registry is not None:
+            registry.record('find_miss', locator.name, time.perf_counter() - start)
+        if tuner is not None:
+            tuner.record(locator.name, time.perf_counter() - wait_start, found=False)
+        raise
+    if registry is not None:
+        waited = time.perf_counter() - wait_start
+        registry.record('find', locator.name, last_check[0])
+        registry.record('find_wait', locator.name, max(0.0, waited - last_check[0]))
+    if tuner is not None:
+        tuner.record(locator.name, time.perf_counter() - wait_start)
+    
+    if cache is not None:
+        cache.put(driver, locator, element)
+    return element
 
 
-def find_element_by_config(driver, config_manager, element_name, timeout=10):
+def find_element_by_config(driver, config_manager, element_name, timeout=10, cache=None):
     """
     Find element using config
     
@@ -15,54 +316,150 @@ def find_element_by_config(driver, config_manager, element_name, timeout=10):
         config_manager: ConfigManager instance
         element_name: Name of element in config
         timeout: Maximum time to wait for element (default: 10 seconds)
+        cache: Optional ElementHandleCache to reuse previously found elements
         
     Returns:
         WebElement if found
         
     Raises:
-        ValueError: If element not found in config or unsupported locator type
+        ValueError: If element not found in config
         TimeoutException: If element not found within timeout
     """
-    element_config = config_manager.get_element_config(element_name)
-    if not element_config:
+    locator = config_manager.get_locator(element_name)
+    if not locator:
         raise ValueError(f"Element '{element_name}' not found in config")
     
-    locator_type = element_config['locator_type']
-    locator_value = element_config['locator_value']
-    wait_type = element_config['wait_type']
-    
-    # Map locator_type to By enum
-    by_map = {
-        'xpath': By.XPATH,
-        'id': By.ID,
-        'css': By.CSS_SELECTOR,
-        'name': By.NAME,
-        'class_name': By.CLASS_NAME,
-        'tag_name': By.TAG_NAME,
-        'link_text': By.LINK_TEXT,
-        'partial_link_text': By.PARTIAL_LINK_TEXT
+    return find_element_by_locator(driver, locator, timeout, cache)
+
+
+# URL and visible texts of every element matched by a set of locators, read in one call
+PageProbe = namedtuple('PageProbe', ['url', 'texts'])
+
+# In-page equivalent of driver.find_elements: resolves a By strategy and value
+# to an array of elements
+FIND_ALL_JS = """
+function all(list) { return Array.prototype.slice.call(list); }
+function find(by, value) {
+    switch (by) {
+        case 'xpath':
+            var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) { nodes.push(result.snapshotItem(i)); }
+            return nodes;
+        case 'css selector': return all(document.querySelectorAll(value));
+        case 'id': return all(document.querySelectorAll('[id="' + CSS.escape(value) + '"]'));
+        case 'name': return all(document.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'class name': return all(document.getElementsByClassName(value));
+        case 'tag name': return all(document.getElementsByTagName(value));
+        case 'link text':
+            return all(document.links).filter(function (a) { return a.innerText.trim() === value; });
+        case 'partial link text':
+            return all(document.links).filter(function (a) { return a.innerText.indexOf(value) !== -1; });
     }
+    return [];
+}
+"""
+
+# Resolves each [name, by, value] spec with the same semantics as the By strategies
+# and returns the visible text of every match ('' for hidden elements)
+_PROBE_JS = FIND_ALL_JS + """
+var specs = arguments[0], texts = {};
+specs.forEach(function (spec) {
+    texts[spec[0]] = find(spec[1], spec[2]).map(function (el) {
+        return el.getClientRects().length ? (el.innerText || '').trim() : '';
+    });
+});
+return [document.URL, texts];
+"""
+
+
+def probe_elements(driver, locators):
+    """
+    Read the page URL and the texts of all elements matching locators in one call
     
-    by = by_map.get(locator_type.lower())
-    if not by:
-        raise ValueError(f"Unsupported locator type: {locator_type}")
+    Unlike find_element_by_locator this does not wait: it reports what is
+    on the page right now, so call it once the page is settled.
     
-    # Map wait_type to ExpectedCondition
-    wait_map = {
-        'clickable': EC.element_to_be_clickable,
-        'presence': EC.presence_of_element_located,
-        'visible': EC.visibility_of_element_located
-    }
+    Args:
+        driver: Selenium WebDriver instance
+        locators: Iterable of Locator records
+        
+    Returns:
+        PageProbe with the current URL and a dict mapping each locator name
+        to the list of visible texts of its matches (empty list if none)
+    """
+    specs = [[locator.name, locator.by, locator.value] for locator in locators]
+    registry = _metrics.active
+    if registry is None:
+        url, texts = driver.execute_script(_PROBE_JS, specs)
+    else:
+        with registry.timer('probe', ','.join(spec[0] for spec in specs)):
+            url, texts = driver.execute_script(_PROBE_JS, specs)
+    return PageProbe(url=url, texts=texts)
+
+
+# Sets the value of the first match of each [name, by, value, text] spec through the
+# native value setter and fires input/change like typing would; returns missing names
+_FILL_FORM_JS = FIND_ALL_JS + """
+var fields = arguments[0], missing = [];
+fields.forEach(function (field) {
+    var el = find(field[1], field[2])[0];
+    if (!el) { missing.push(field[0]); return; }
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    var setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+    el.focus();
+    setter.call(el, field[3]);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+});
+return missing;
+"""
+
+
+def fill_form(driver, config_manager, values, timeout=10):
+    """
+    Fill several form fields in one script call
     
-    wait_condition = wait_map.get(wait_type.lower(), EC.presence_of_element_located)
+    Waits for the first field like find_element_by_config, then sets every
+    value at once and dispatches input/change events. Empty values are
+    skipped. Use input_text for fields whose keystroke behaviour is under test.
     
-    element = WebDriverWait(driver, timeout).until(
-        wait_condition((by, locator_value))
-    )
-    return element
+    Args:
+        driver: Selenium WebDriver instance
+        config_manager: ConfigManager instance
+        values: Dict mapping element names in config to the text to enter
+        timeout: Maximum time to wait for the form
+        
+    Raises:
+        ValueError: If an element is not found in config
+        NoSuchElementException: If a field is not on the page
+    """
+    fields = []
+    for element_name, text in values.items():
+        if not text:
+            continue
+        locator = config_manager.get_locator(element_name)
+        if not locator:
+            raise ValueError(f"Element '{element_name}' not found in config")
+        fields.append((locator, str(text)))
+    if not fields:
+        return
+    
+    find_element_by_locator(driver, fields[0][0], timeout)
+    specs = [[locator.name, locator.by, locator.value, text] for locator, text in fields]
+    registry = _metrics.active
+    if registry is None:
+        missing = driver.execute_script(_FILL_FORM_JS, specs)
+    else:
+        with registry.timer('fill_form', ','.join(spec[0] for spec in specs)):
+            missing = driver.execute_script(_FILL_FORM_JS, specs)
+    if missing:
+        raise NoSuchElementException(f"Form fields not found: {', '.join(missing)}")
 
 
-def click_element(driver, config_manager, element_name, timeout=10):
+def click_element(driver, config_manager, element_name, timeout=10, cache=None):
     """
     Click element using config
     
@@ -71,16 +468,177 @@ def click_element(driver, config_manager, element_name, timeout=10):
         config_manager: ConfigManager instance
         element_name: Name of element in config
         timeout: Maximum time to wait for element
+        cache: Optional ElementHandleCache to reuse previously found elements
         
     Returns:
         WebElement that was clicked
     """
+    element = find_element_by_config(driver, config_manager, element_name, timeout, cache)
+    registry = _metrics.active
+    if registry is None:
+        element.click()
+    else:
+        with registry.timer('click', element_name):
+            element.click()
+    return element
+
+
+# Marks the outcome elements visible before a submit, so only new ones count as a
+# reaction, and returns the URL the submit starts from
+_MARK_OUTCOME_JS = FIND_ALL_JS + """
+arguments[0].forEach(function (spec) {
+    find(spec[0], spec[1]).forEach(function (el) {
+        if (el.getClientRects().length) { el.__swOutcomeSeen = true; }
+    });
+});
+return document.URL;
+"""
+
+# True once the page reacted to a submit: the clicked element left the document,
+# the URL changed or an outcome element that was not visible before is visible
+_OUTCOME_JS = FIND_ALL_JS + """
+var clicked = arguments[0], specs = arguments[1], url = arguments[2];
+if (!clicked.isConnected || document.URL !== url) { return true; }
+return specs.some(function (spec) {
+    return find(spec[0], spec[1]).some(function (el) {
+        return !el.__swOutcomeSeen && el.getClientRects().length > 0;
+    });
+});
+"""
+
+
+def click_and_wait_for_outcome(driver, config_manager, element_name, outcome_locators, timeout=10,
+                               poll_interval=0.05):
+    """
+    Click a submit element and wait until the page shows a reaction to it
+
+    A settled page alone does not prove the submit was handled: right after
+    the click the old document may still be loaded and already idle. This
+    waits for an actual signal instead: the clicked element went stale (a new
+    document), the URL changed, or one of outcome_locators became visible
+    that was not visible before the click.
+
+    Args:
+        driver: Selenium WebDriver instance
+        config_manager: ConfigManager instance
+        element_name: Name of the element to click
+        outcome_locators: Locator records of the elements a result page shows
+        timeout: Maximum time to wait for the element and for the reaction
+        poll_interval: Seconds between checks (default: 0.05)
+
+    Returns:
+        True if the page reacted, False if the timeout expired first
+    """
     element = find_element_by_config(driver, config_manager, element_name, timeout)
+    specs = [[locator.by, locator.value] for locator in outcome_locators]
+    url = driver.execute_script(_MARK_OUTCOME_JS, specs)
     element.click()
-    return element
+    start = time.monotonic()
+    end_time = start + timeout
+    while True:
+        try:
+            reacted = bool(driver.execute_script(_OUTCOME_JS, element, specs, url))
+        except StaleElementReferenceException:
+            reacted = True
+        except WebDriverException:
+            # Script context destroyed by the navigation in progress
+            reacted = False
+        if reacted or time.monotonic() >= end_time:
+            registry = _metrics.active
+            if registry is not None:
+                registry.record('outcome' if reacted else 'outcome_timeout', element_name,
+                                time.monotonic() - start)
+            return reacted
+        time.sleep(poll_interval)
+
+
+# Starts recording the texts a message element shows from now on. The element is
+# looked up again after every DOM change, so re-rendered elements are followed and
+# a re-rendered element counts as a new message even with unchanged text. AngularJS
+# scope fields rendering the current (stale) text are cleared first, so the same
+# message set again by the next action shows up as a change.
+_ARM_MESSAGES_JS = FIND_ALL_JS + """
+var by = arguments[0], value = arguments[1], w = window;
+function first() { return find(by, value)[0] || null; }
+function text(el) { return el ? (el.textContent || '').trim() : ''; }
+if (w.__swMessages) { w.__swMessages.observer.disconnect(); }
+var el = first();
+if (el && text(el) && w.angular) {
+    try {
+        var scope = w.angular.element(el).scope(), stale = text(el);
+        for (var key in scope) {
+            if (key.charAt(0) !== '$' && scope[key] === stale) {
+                var owner = scope;
+                while (owner && !Object.prototype.hasOwnProperty.call(owner, key)) { owner = owner.$parent; }
+                (owner || scope)[key] = '';
+            }
+        }
+        scope.$apply();
+    } catch (e) {}
+    el = first();
+}
+var log = w.__swMessages = {texts: [], element: el, text: text(el)};
+log.observer = new MutationObserver(function () {
+    var current = first(), value = text(current);
+    if (current !== log.element || value !== log.text) {
+        log.element = current;
+        log.text = value;
+        if (value) { log.texts.push(value); }
+    }
+});
+log.observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+"""
 
+# Stops recording and returns the texts seen since _ARM_MESSAGES_JS (null if the page was replaced)
+_TAKE_MESSAGES_JS = """
+var log = window.__swMessages;
+if (!log) { return null; }
+log.observer.disconnect();
+window.__swMessages = null;
+return log.texts;
+"""
+
+
+def click_and_capture_messages(driver, config_manager, element_name, message_name, timeout=10, cache=None):
+    """
+    Click element using config and return the messages the click produced
+    
+    A MutationObserver is armed on the message element right before the
+    click, so text left over from an earlier action is never returned and
+    no reload or tab switch is needed to clear it. Meant for actions that
+    stay on the same document.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        config_manager: ConfigManager instance
+        element_name: Name of the element to click in config
+        message_name: Name of the message element in config
+        timeout: Maximum time to wait for the element and for the page to settle
+        cache: Optional ElementHandleCache to reuse previously found elements
+        
+    Returns:
+        List of non-empty message texts in the order they appeared
+        (empty if the click produced no message)
+        
+    Raises:
+        ValueError: If an element is not found in config
+    """
+    locator = config_manager.get_locator(message_name)
+    if not locator:
+        raise ValueError(f"Element '{message_name}' not found in config")
+    element = find_element_by_config(driver, config_manager, element_name, timeout, cache)
+    driver.execute_script(_ARM_MESSAGES_JS, locator.by, locator.value)
+    registry = _metrics.active
+    if registry is None:
+        element.click()
+    else:
+        with registry.timer('click', element_name):
+            element.click()
+    wait_for_page_settled(driver, timeout)
+    return driver.execute_script(_TAKE_MESSAGES_JS) or []
 
-def input_text(driver, config_manager, element_name, text, timeout=10):
+
+def input_text(driver, config_manager, element_name, text, timeout=10, cache=None):
     """
     Input text to element using config
     
@@ -90,18 +648,23 @@ def input_text(driver, config_manager, element_name, text, timeout=10):
         element_name: Name of element in config
         text: Text to input
         timeout: Maximum time to wait for element
+        cache: Optional ElementHandleCache to reuse previously found elements
         
     Returns:
         WebElement that received text
     """
-    element = find_element_by_config(driver, config_manager, element_name, timeout)
+    element = find_element_by_config(driver, config_manager, element_name, timeout, cache)
+    registry = _metrics.active
+    start = time.perf_counter() if registry is not None else 0
     element.clear()
     if text:
         element.send_keys(str(text))
+    if registry is not None:
+        registry.record('input', element_name, time.perf_counter() - start)
     return element
 
 
-def get_text(driver, config_manager, element_name, timeout=10):
+def get_text(driver, config_manager, element_name, timeout=10, cache=None):
     """
     Get text from element using config
     
@@ -110,15 +673,20 @@ def get_text(driver, config_manager, element_name, timeout=10):
         config_manager: ConfigManager instance
         element_name: Name of element in config
         timeout: Maximum time to wait for element
+        cache: Optional ElementHandleCache to reuse previously found elements
         
     Returns:
         Text content of element (stripped)
     """
-    element = find_element_by_config(driver, config_manager, element_name, timeout)
-    return element.text.strip()
+    element = find_element_by_config(driver, config_manager, element_name, timeout, cache)
+    registry = _metrics.active
+    if registry is None:
+        return element.text.strip()
+    with registry.timer('get_text', element_name):
+        return element.text.strip()
 
 
-def get_element_attribute(driver, config_manager, element_name, attribute, timeout=10):
+def get_element_attribute(driver, config_manager, element_name, attribute, timeout=10, cache=None):
     """
     Get attribute value from element using config
     
@@ -128,10 +696,11 @@ def get_element_attribute(driver, config_manager, element_name, attribute, timeo
         element_name: Name of element in config
         attribute: Attribute name to get
         timeout: Maximum time to wait for element
+        cache: Optional ElementHandleCache to reuse previously found elements
         
     Returns:
         Attribute value
     """
-    element = find_element_by_config(driver, config_manager, element_name, timeout)
+    element = find_element_by_config(driver, config_manager, element_name, timeout, cache)
     return element.get_attribute(attribute)
 
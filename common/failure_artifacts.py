@@ -0,0 +1,233 @@
+"""
+Failure Artifacts - Screenshot, page source, console log and URL of failing rows
+Captured on the worker that owns the browser, compressed and written by a background thread
+"""
+import atexit
+import json
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import deque
+
+
+def new_run_dir(root):
+    """
+    Directory for the artifacts of one run under root
+
+    Args:
+        root: Artifacts root, e.g. <suite>/level2/artifacts
+
+    Returns:
+        Path named after the start time and process id (not created yet)
+    """
+    return os.path.join(root, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+
+
+def _file_name(test_id):
+    """File system safe name of a Test_ID"""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(test_id)).strip('._') or 'row'
+
+
+def capture_page(driver):
+    """
+    Read the failure state of a browser session
+
+    Every piece is optional: whatever the driver cannot provide (a closed
+    window, a driver without console logs, an HTTP-tier session) is left out.
+
+    Args:
+        driver: Selenium WebDriver instance
+
+    Returns:
+        Dict of archive member name to bytes
+    """
+    files = {}
+    try:
+        files['screenshot.png'] = driver.get_screenshot_as_png()
+    except Exception:
+        pass
+    try:
+        files['page.html'] = driver.page_source.encode('utf-8')
+    except Exception:
+        pass
+    try:
+        files['console.json'] = json.dumps(driver.get_log('browser'), indent=1).encode('utf-8')
+    except Exception:
+        pass
+    try:
+        files['url.txt'] = driver.current_url.encode('utf-8')
+    except Exception:
+        pass
+    return files
+
+
+class ArtifactWriter:
+    """
+    Stores failure artifacts without making the row loop wait for the disk
+
+    Workers only read the browser and queue the bytes; one background
+    thread writes one zip archive per failing row into the run directory.
+    Text members are deflated, the PNG screenshot is stored as is. Queued
+    bytes are capped at max_pending_bytes; a capture that does not fit is
+    dropped and counted instead of blocking the worker.
+    """
+
+    def __init__(self, run_dir, base_dir=None, max_pending_bytes=64 * 1024 * 1024, compresslevel=6):
+        """
+        Initialize ArtifactWriter; the directory and thread are created on the first failure
+
+        Args:
+            run_dir: Directory for this run's archives
+            base_dir: Directory the references in the result file are relative to
+                (default: absolute paths)
+            max_pending_bytes: Most bytes waiting to be written (default: 64 MB)
+            compresslevel: Deflate level for text members (default: 6)
+        """
+        self.run_dir = run_dir
+        self.base_dir = base_dir
+        self.max_pending_bytes = max_pending_bytes
+        self.compresslevel = compresslevel
+        self.saved = 0
+        self.dropped = 0
+        self.errors = 0
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._pending = 0
+        self._names = set()
+        self._closed = False
+        self._thread = None
+
+    def _reference(self, path):
+        """Path written to the result file for an archive"""
+        return os.path.relpath(path, self.base_dir) if self.base_dir else os.path.abspath(path)
+
+    def submit(self, test_id, files):
+        """
+        Queue the artifacts of one row for writing
+
+        Args:
+            test_id: Test_ID of the failing row
+            files: Dict of archive member name to bytes
+
+        Returns:
+            Reference to the archive, or '' when nothing was queued
+        """
+        if not files:
+            return ''
+        size = sum(len(data) for data in files.values())
+        with self._cond:
+            if self._closed or self._pending + size > self.max_pending_bytes:
+                self.dropped += 1
+                return ''
+            name = _file_name(test_id)
+            unique, n = name, 1
+            while unique in self._names:
+                n += 1
+                unique = f"{name}-{n}"
+            self._names.add(unique)
+            path = os.path.join(self.run_dir, f"{unique}.zip")
+            self._queue.append((path, files, size))
+            self._pending += size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name='artifact-writer', daemon=True)
+                self._thread.start()
+                # A run that stops with an exception still gets its queued archives
+                atexit.register(self.close)
+            self._cond.notify()
+        return self._reference(path)
+
+    def capture(self, driver, test_id):
+        """
+        Capture the current browser state and queue it
+
+        Args:
+            driver: WebDriver the row ran in
+            test_id: Test_ID of the failing row
+
+        Returns:
+            Reference to the archive, or '' when nothing was captured or queued
+        """
+        return self.submit(test_id, capture_page(driver))
+
+    def wrap(self, run_row, id_of):
+        """
+        Wrap a row runner so that failing rows get an 'Artifacts' reference
+
+        A row that raises is captured too before the exception propagates,
+        so the state that stopped the run is on disk even without a record.
+
+        Args:
+            run_row: Callable(driver, idx, row) returning a result dict
+            id_of: Callable(idx, row) returning the row's Test_ID
+
+        Returns:
+            Callable with the same signature
+        """
+        def run_and_capture(driver, idx, row):
+            try:
+                record = run_row(driver, idx, row)
+            except Exception:
+                self.capture(driver, id_of(idx, row))
+                raise
+            if record.get('Status') != 'PASS':
+                record['Artifacts'] = self.capture(driver, id_of(idx, row))
+            return record
+        return run_and_capture
+
+    def _write_loop(self):
+        """Background thread: write queued archives until closed and drained"""
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                path, files, size = self._queue.popleft()
+            try:
+                self._write(path, files)
+                saved, errors = 1, 0
+            except Exception:
+                # Any failure only loses this archive; the thread must keep draining the queue
+                saved, errors = 0, 1
+                try:
+                    os.remove(path + '.tmp')
+                except OSError:
+                    pass
+            with self._cond:
+                self._pending -= size
+                self.saved += saved
+                self.errors += errors
+                self._cond.notify_all()
+
+    def _write(self, path, files):
+        """Write one archive through a temporary file"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with zipfile.ZipFile(tmp_path, 'w') as archive:
+            for name, data in files.items():
+                if name.endswith('.png'):
+                    archive.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+                else:
+                    archive.writestr(name, data, compress_type=zipfile.ZIP_DEFLATED,
+                                     compresslevel=self.compresslevel)
+        os.replace(tmp_path, path)
+
+    def close(self):
+        """Write everything still queued and stop the background thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def print_summary(self):
+        """Print where the archives went and what was dropped"""
+        if self.saved or self.dropped or self.errors:
+            print(f"\nFailure artifacts: {self.saved} saved to {self.run_dir}")
+            if self.dropped:
+                print(f"Artifacts dropped (queue over {self.max_pending_bytes // (1024 * 1024)} MB): {self.dropped}")
+            if self.errors:
+                print(f"Artifacts not written (write errors): {self.errors}")
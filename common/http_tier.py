@@ -0,0 +1,264 @@
+"""
+HTTP Tier - Browserless execution of server-validated form rows
+Submits forms with a pooled HTTP client and reads the response HTML with the same
+config locators the Selenium suites use
+
+Requires the optional 'lxml' package ('cssselect' as well for complex CSS locators).
+"""
+import re
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urljoin
+
+import urllib3
+
+try:
+    import lxml.html
+except ImportError:  # optional dependency, only needed for the HTTP tier
+    lxml = None
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+try:
+    from .element_helper import PageProbe
+except ImportError:
+    # Loaded as a top-level module by the suites (common/ on sys.path)
+    from element_helper import PageProbe
+
+
+# tag.class#id compound selectors, enough for simple css locators without cssselect
+_SIMPLE_CSS = re.compile(r'^([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+)*)$')
+
+
+def _xpath_literal(value):
+    """Quote a string for use in an XPath expression"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat('" + value.replace("'", "', \"'\", '") + "')"
+
+
+def _css_to_xpath(selector):
+    """Translate a CSS selector to XPath, through cssselect when it is installed"""
+    if CSSSelector is not None:
+        return CSSSelector(selector).path
+    match = _SIMPLE_CSS.match(selector.strip())
+    if not match:
+        raise ImportError(f"CSS locator '{selector}' needs the 'cssselect' package")
+    tag, rest = match.group(1) or '*', match.group(2)
+    conditions = []
+    for kind, name in re.findall(r'([.#])([\w-]+)', rest):
+        if kind == '#':
+            conditions.append(f"@id={_xpath_literal(name)}")
+        else:
+            conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), {_xpath_literal(' ' + name + ' ')})")
+    return f"descendant-or-self::{tag}" + ''.join(f"[{c}]" for c in conditions)
+
+
+def locator_xpath(locator):
+    """
+    Express a compiled locator as XPath for evaluation on parsed HTML
+
+    Args:
+        locator: Locator record from ConfigManager.get_locator
+
+    Returns:
+        XPath string
+    """
+    by, value = locator.by, locator.value
+    if by == 'xpath':
+        return value
+    if by == 'css selector':
+        return _css_to_xpath(value)
+    if by == 'id':
+        return f"//*[@id={_xpath_literal(value)}]"
+    if by == 'name':
+        return f"//*[@name={_xpath_literal(value)}]"
+    if by == 'class name':
+        return f"//*[contains(concat(' ', normalize-space(@class), ' '), {_xpath_literal(' ' + value + ' ')})]"
+    if by == 'tag name':
+        return f"//{value}"
+    if by == 'link text':
+        return f"//a[normalize-space(.)={_xpath_literal(value)}]"
+    if by == 'partial link text':
+        return f"//a[contains(., {_xpath_literal(value)})]"
+    raise ValueError(f"Unsupported locator for HTML evaluation: {by}")
+
+
+def parse_html(html):
+    """Parse an HTML document with lxml"""
+    if lxml is None:
+        raise ImportError("The HTTP tier needs the 'lxml' package: pip install lxml")
+    return lxml.html.fromstring(html)
+
+
+def find_all_html(tree, locator):
+    """Find all elements of a parsed document that match a locator"""
+    return tree.xpath(locator_xpath(locator))
+
+
+def element_text(element):
+    """Text of an element with whitespace collapsed, close to WebElement.text"""
+    return ' '.join(element.text_content().split())
+
+
+def probe_html(html, url, locators):
+    """
+    HTML counterpart of element_helper.probe_elements
+
+    Args:
+        html: Response body
+        url: Final URL of the response
+        locators: Iterable of Locator records
+
+    Returns:
+        PageProbe with the URL and the texts of every match per locator name
+    """
+    tree = parse_html(html)
+    texts = {locator.name: [element_text(el) for el in find_all_html(tree, locator)] for locator in locators}
+    return PageProbe(url=url, texts=texts)
+
+
+class HtmlForm:
+    """Values of an HTML form as a browser would submit them"""
+
+    def __init__(self, tree, form, url):
+        self.tree = tree
+        self.action = urljoin(url, form.get('action') or url)
+        self.method = (form.get('method') or 'get').upper()
+        self.values = {}
+        for element in form.xpath('.//input | .//select | .//textarea'):
+            name = element.get('name')
+            if not name or element.get('disabled') is not None:
+                continue
+            tag = element.tag.lower()
+            input_type = (element.get('type') or 'text').lower()
+            if tag == 'input' and input_type in ('checkbox', 'radio'):
+                if element.get('checked') is not None:
+                    self.values[name] = element.get('value', 'on')
+            elif tag == 'input' and input_type in ('submit', 'button', 'image', 'reset', 'file'):
+                continue
+            elif tag == 'select':
+                selected = element.xpath('.//option[@selected]') or element.xpath('.//option')
+                if selected:
+                    self.values[name] = selected[0].get('value', selected[0].text_content())
+            elif tag == 'textarea':
+                self.values[name] = element.text_content()
+            else:
+                self.values[name] = element.get('value', '')
+
+    def _control(self, locator):
+        """Resolve a locator to a named form control, following labels to their input"""
+        matches = find_all_html(self.tree, locator)
+        if not matches:
+            raise LookupError(f"Element '{locator.name}' not found in the page")
+        element = matches[0]
+        if element.tag.lower() == 'label':
+            target = element.get('for')
+            controls = self.tree.xpath(f"//*[@id={_xpath_literal(target)}]") if target else element.xpath('.//input')
+            if not controls:
+                raise LookupError(f"Label '{locator.name}' has no associated control")
+            element = controls[0]
+        if not element.get('name'):
+            raise LookupError(f"Element '{locator.name}' is not a named form control")
+        return element
+
+    def set(self, locator, value):
+        """Set the value of the text control matched by locator"""
+        self.values[self._control(locator).get('name')] = str(value)
+
+    def check(self, locator):
+        """Check the checkbox or radio button matched by locator (or by the label it matches)"""
+        control = self._control(locator)
+        self.values[control.get('name')] = control.get('value', 'on')
+
+
+class HttpSession:
+    """
+    Browserless client with its own cookies over a pooled connection
+
+    Used in place of a WebDriver by run_rows, so it also offers quit().
+    """
+
+    def __init__(self, max_redirects=5, timeout=30):
+        self.pool = urllib3.PoolManager(maxsize=4, timeout=timeout)
+        self.cookies = {}
+        self.max_redirects = max_redirects
+
+    def _store_cookies(self, response):
+        for header in response.headers.getlist('Set-Cookie'):
+            cookie = SimpleCookie()
+            cookie.load(header)
+            for name, morsel in cookie.items():
+                if morsel['max-age'] == '0' or not morsel.value:
+                    self.cookies.pop(name, None)
+                else:
+                    self.cookies[name] = morsel.value
+
+    def request(self, method, url, fields=None):
+        """
+        Send a request, following redirects like a browser
+
+        Args:
+            method: 'GET' or 'POST'
+            url: Request URL
+            fields: Optional dict of form fields (urlencoded body for POST)
+
+        Returns:
+            (final URL, response HTML)
+        """
+        body = urlencode(fields or {}) if method == 'POST' else None
+        if method != 'POST' and fields:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(fields)}"
+        for _ in range(self.max_redirects + 1):
+            headers = {}
+            if self.cookies:
+                headers['Cookie'] = '; '.join(f"{k}={v}" for k, v in self.cookies.items())
+            if body is not None:
+                headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            response = self.pool.request(method, url, body=body, headers=headers, redirect=False)
+            self._store_cookies(response)
+            if response.status in (301, 302, 303, 307, 308) and response.headers.get('Location'):
+                url = urljoin(url, response.headers['Location'])
+                if response.status in (301, 302, 303):
+                    method, body = 'GET', None
+                continue
+            charset = response.headers.get('Content-Type', '').partition('charset=')[2] or 'utf-8'
+            return url, response.data.decode(charset, errors='replace')
+        raise urllib3.exceptions.MaxRetryError(self.pool, url, "Too many redirects")
+
+    def get(self, url):
+        """GET a page; returns (final URL, HTML)"""
+        return self.request('GET', url)
+
+    def read_form(self, url, html, locator):
+        """
+        Parse the form that contains the element matched by locator
+
+        Args:
+            url: URL the HTML came from
+            html: Page HTML
+            locator: Locator of any element inside the form (e.g. its submit button)
+
+        Returns:
+            HtmlForm instance
+        """
+        tree = parse_html(html)
+        matches = find_all_html(tree, locator)
+        if not matches:
+            raise LookupError(f"Element '{locator.name}' not found in the page")
+        forms = list(matches[0].iterancestors('form'))
+        if not forms:
+            raise LookupError(f"Element '{locator.name}' is not inside a form")
+        return HtmlForm(tree, forms[0], url)
+
+    def submit(self, form):
+        """Submit a form; returns (final URL, HTML)"""
+        return self.request(form.method, form.action, form.values)
+
+    def quit(self):
+        """Close pooled connections"""
+        self.pool.clear()
@@ -0,0 +1,203 @@
+"""
+Identity Allocator - Unique e-mail identities for register runs and a ledger of registered ones
+Suffixes are built from a run id and a counter, so they do not repeat across rows, workers or runs
+"""
+import json
+import os
+import secrets
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def to_base36(number):
+    """Encode a non-negative integer in lowercase base 36"""
+    text = ''
+    while True:
+        number, digit = divmod(number, 36)
+        text = _DIGITS[digit] + text
+        if not number:
+            return text
+
+
+# Random per-process part of the run ids, 6 base36 digits (about 31 bits)
+_PROCESS_NONCE = to_base36(secrets.randbelow(36 ** 6)).rjust(6, '0')
+
+
+def new_run_id():
+    """
+    Run id that other runs share only with negligible probability
+
+    Combines a random per-process nonce, the process id and the start time
+    in milliseconds, each with a fixed width so that the id plus a counter
+    cannot be read two ways. Two runs collide only if they start in the same
+    millisecond with the same process id and draw the same nonce (1 in about
+    2 billion), which also covers containers with identical host names. A
+    process waits one millisecond before returning, so two calls in the same
+    process cannot get the same id.
+    """
+    millis = time.time_ns() // 1_000_000
+    time.sleep(0.001)
+    return f"{_PROCESS_NONCE}{to_base36(os.getpid()).rjust(5, '0')}{to_base36(millis).rjust(9, '0')}"
+
+
+def site_of(url):
+    """scheme://host[:port] of a URL, the key registered identities are stored under"""
+    parts = urlsplit(url or '')
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class IdentityAllocator:
+    """
+    Hands out unique e-mail addresses and remembers which ones were registered
+
+    Suffixes are the fixed-width run id followed by a counter, so they are
+    unique within a run and, through the run id's random nonce, across
+    runs. Registered identities are appended to a JSON-lines ledger with
+    the site and run they belong to, so a later row that needs an already
+    registered address can reuse a real one.
+    """
+
+    def __init__(self, ledger_path, site, run_id=None, keep_per_site=100):
+        """
+        Initialize IdentityAllocator
+
+        Args:
+            ledger_path: Ledger file (JSON lines), read on first use
+            site: URL of the application, e.g. the register page
+            run_id: Optional fixed run id (default: new_run_id())
+            keep_per_site: Newest entries kept per site when the ledger is compacted (default: 100)
+        """
+        self.ledger_path = ledger_path
+        self.site = site_of(site)
+        self.run_id = run_id or new_run_id()
+        self.keep_per_site = keep_per_site
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._registered = None
+
+    def allocate(self, count=1):
+        """
+        Reserve a block of suffixes
+
+        Args:
+            count: Number of suffixes
+
+        Returns:
+            List of unique suffix strings
+        """
+        with self._lock:
+            start = self._counter
+            self._counter += count
+        return [f"{self.run_id}{to_base36(n)}" for n in range(start, start + count)]
+
+    def unique_email(self, email):
+        """
+        Make an address unique by inserting a suffix before the @
+
+        Args:
+            email: Address from the data row (returned unchanged when empty)
+
+        Returns:
+            Address with a suffix no other row, worker or run received
+        """
+        if not isinstance(email, str) or not email.strip():
+            return email
+        email = email.strip()
+        suffix = self.allocate()[0]
+        if '@' in email:
+            local_part, domain = email.rsplit('@', 1)
+            return f"{local_part}{suffix}@{domain}"
+        return f"{email}{suffix}"
+
+    def _load(self):
+        """Read the identities registered on this site from the ledger (once) and compact it"""
+        if self._registered is not None:
+            return
+        entries = []
+        if os.path.exists(self.ledger_path):
+            with open(self.ledger_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line of an interrupted run
+                    if isinstance(entry, dict) and entry.get('site') and entry.get('email'):
+                        entries.append(entry)
+        self._registered = [(entry['email'], entry.get('run_id'))
+                            for entry in entries if entry['site'] == self.site]
+        self._compact(entries)
+
+    def _compact(self, entries):
+        """
+        Rewrite the ledger with the newest keep_per_site entries of each site
+
+        Only done once some site has twice that many, so concurrent runs
+        rarely rewrite the file while another one appends to it.
+
+        Args:
+            entries: All valid ledger entries, oldest first
+        """
+        if not self.keep_per_site:
+            return
+        per_site = {}
+        for entry in entries:
+            per_site[entry['site']] = per_site.get(entry['site'], 0) + 1
+        if max(per_site.values(), default=0) < 2 * self.keep_per_site:
+            return
+        kept = []
+        for entry in reversed(entries):
+            if per_site[entry['site']] <= self.keep_per_site:
+                kept.append(entry)
+            per_site[entry['site']] -= 1
+        kept.reverse()
+        tmp_path = f"{self.ledger_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in kept:
+                f.write(json.dumps(entry) + '\n')
+        os.replace(tmp_path, self.ledger_path)
+        self._registered = self._registered[-self.keep_per_site:]
+
+    def record(self, email, test_id=''):
+        """
+        Remember that an address was registered successfully
+
+        Args:
+            email: Registered address
+            test_id: Row that registered it
+        """
+        entry = {'site': self.site, 'email': email, 'test_id': str(test_id),
+                 'run_id': self.run_id, 'time': round(time.time(), 3)}
+        with self._lock:
+            self._load()
+            self._registered.append((email, self.run_id))
+            with open(self.ledger_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def registered_email(self, default=None):
+        """
+        Get an address known to be registered on this site
+
+        Prefers the newest one registered by this run. Without one, the
+        default (the row's own fixture address) wins over older ledger
+        entries, because the application may have been reset since an
+        earlier run, e.g. a stand-in that keeps its accounts in memory.
+
+        Args:
+            default: Returned when this run registered nothing on the site yet
+
+        Returns:
+            Registered address, default, or the newest older ledger entry
+            when there is no default
+        """
+        with self._lock:
+            self._load()
+            for email, run_id in reversed(self._registered):
+                if run_id == self.run_id:
+                    return email
+            if default or not self._registered:
+                return default
+            return self._registered[-1][0]
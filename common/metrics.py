@@ -0,0 +1,143 @@
+"""
+Metrics - Lightweight timing registry for element lookups, commands and navigation
+Disabled by default; helpers only check one module attribute when it is off
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class MetricsRegistry:
+    """
+    Collects durations per (step, name) pair
+
+    A step is the kind of work (find, click, input, get_text, navigate,
+    settle, ...) and the name is the element name or URL it was done for.
+    Lookups are split in two: 'find' is the WebDriver round trip that found
+    the element, 'find_wait' the time spent polling before it appeared.
+    """
+
+    def __init__(self):
+        self._samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, step, name, seconds):
+        """
+        Record one duration
+
+        Args:
+            step: Kind of work, e.g. 'find' or 'click'
+            name: Element name, URL or other label
+            seconds: Duration in seconds
+        """
+        with self._lock:
+            self._samples[(step, name)].append(seconds)
+
+    @contextmanager
+    def timer(self, step, name=''):
+        """Context manager recording the duration of its block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(step, name, time.perf_counter() - start)
+
+    def samples(self):
+        """
+        Raw durations, e.g. to send from a worker process to the coordinator
+
+        Returns:
+            List of [step, name, durations] entries
+        """
+        with self._lock:
+            return [[step, name, list(values)] for (step, name), values in self._samples.items()]
+
+    def merge(self, samples):
+        """
+        Add durations recorded elsewhere
+
+        Args:
+            samples: Entries as returned by samples()
+        """
+        with self._lock:
+            for step, name, values in samples:
+                self._samples[(step, name)].extend(values)
+
+    def summary(self):
+        """
+        Summarize the recorded durations
+
+        Returns:
+            List of dicts with step, name, count, total, p50, p95 and max
+            (times in milliseconds), sorted by total time descending
+        """
+        with self._lock:
+            samples = {key: sorted(values) for key, values in self._samples.items()}
+
+        rows = []
+        for (step, name), values in samples.items():
+            rows.append({
+                'step': step,
+                'name': name,
+                'count': len(values),
+                'total_ms': round(sum(values) * 1000, 3),
+                'p50_ms': round(_percentile(values, 50) * 1000, 3),
+                'p95_ms': round(_percentile(values, 95) * 1000, 3),
+                'max_ms': round(values[-1] * 1000, 3),
+            })
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows
+
+    def export(self, path, suite=None):
+        """
+        Write the summary as JSON
+
+        Args:
+            path: Output file path
+            suite: Optional suite name stored in the file
+        """
+        payload = {'suite': suite, 'created': time.time(), 'metrics': self.summary()}
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def print_summary(self, limit=15):
+        """Print the slowest entries of the summary"""
+        print("\n=== Timing Metrics (ms) ===")
+        print(f"{'step':<10} {'name':<28} {'count':>6} {'p50':>9} {'p95':>9} {'max':>9}")
+        for row in self.summary()[:limit]:
+            print(f"{row['step']:<10} {str(row['name'])[:28]:<28} {row['count']:>6} "
+                  f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['max_ms']:>9.1f}")
+
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted, non-empty list"""
+    rank = max(1, -(-percent * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+# Registry the helpers report to; None while metrics are disabled
+active = None
+
+
+def enable_metrics():
+    """
+    Turn metrics on for this process
+
+    Returns:
+        The active MetricsRegistry
+    """
+    global active
+    if active is None:
+        active = MetricsRegistry()
+    return active
+
+
+def disable_metrics():
+    """Turn metrics off and drop the collected samples"""
+    global active
+    active = None
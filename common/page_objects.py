@@ -0,0 +1,407 @@
+"""
+Page Objects - Python modules compiled from the config CSVs, one class per config
+Rebuilt only when the CSV changes; suites import them instead of parsing the CSV on every run
+"""
+import ast
+import hashlib
+import importlib.util
+import keyword
+import os
+import types
+
+try:
+    from .config_manager import (
+        ConfigManager, DriverProfile, Locator, DEFAULT_PROFILE, LOCATOR_TYPES, WAIT_CONDITIONS, rebase_url
+    )
+except ImportError:
+    # Loaded as a top-level module by the suites (common/ on sys.path)
+    from config_manager import (
+        ConfigManager, DriverProfile, Locator, DEFAULT_PROFILE, LOCATOR_TYPES, WAIT_CONDITIONS, rebase_url
+    )
+
+
+# Bumped whenever the generated source changes shape, so existing modules are rebuilt
+GENERATOR_VERSION = 2
+
+# config locator_type of each By value, for get_element_config
+_LOCATOR_TYPE_NAMES = {by: name for name, by in LOCATOR_TYPES.items()}
+
+# Helpers whose element name arguments follow the config argument; default is one name
+NAME_ARGUMENTS = {
+    'click_and_capture_messages': 2,
+}
+
+
+class PageObject:
+    """
+    Base of the generated page objects
+
+    Offers the lookups of ConfigManager (get_url, get_locator,
+    get_element_config, get_profile, urls, locators), so the element
+    helpers take either. Subclasses add one typed property per URL and
+    element and hold no state but the rebased URLs.
+    """
+    __slots__ = ('base_url', 'urls')
+
+    # Filled in by the generated subclasses
+    locators = {}
+    raw_urls = {}
+    profile = DEFAULT_PROFILE
+
+    def __init__(self, base_url=None):
+        """
+        Initialize the page object
+
+        Args:
+            base_url: Optional scheme and host for every URL (default: $TEST_BASE_URL)
+        """
+        self.base_url = base_url
+        self.urls = {name: rebase_url(url, base_url) for name, url in self.raw_urls.items()}
+
+    def get_url(self, url_name):
+        """URL by name, or None if not found"""
+        return self.urls.get(url_name)
+
+    def get_locator(self, element_name):
+        """Precompiled Locator by name, or None if not found"""
+        return self.locators.get(element_name)
+
+    def get_element_config(self, element_name):
+        """
+        Element configuration by name, shaped like ConfigManager.get_element_config
+
+        Values are those of the compiled locator, so wait_type is already
+        normalized and timeout/poll are seconds or None.
+
+        Args:
+            element_name: Name of the element in config
+
+        Returns:
+            Dictionary with element config or None if not found
+        """
+        locator = self.locators.get(element_name)
+        if locator is None:
+            return None
+        return {
+            'locator_type': _LOCATOR_TYPE_NAMES[locator.by],
+            'locator_value': locator.value,
+            'wait_type': locator.wait_type,
+            'description': locator.description,
+            'timeout': locator.timeout,
+            'poll': locator.poll
+        }
+
+    def get_profile(self):
+        """Browser profile declared in the config"""
+        return self.profile
+
+    def list_urls(self):
+        """List all available URLs"""
+        return list(self.urls)
+
+    def list_elements(self):
+        """List all available elements"""
+        return list(self.locators)
+
+
+# ==== Generation ====
+
+def _stem(config_path):
+    """'register' for config_register.csv"""
+    stem = os.path.splitext(os.path.basename(config_path))[0]
+    return stem[len('config_'):] if stem.startswith('config_') else stem
+
+
+def page_module_path(config_path):
+    """
+    Path of the module generated from a config, next to the CSV
+
+    Args:
+        config_path: Path to config CSV file, e.g. register/level2/config_register.csv
+
+    Returns:
+        Path like register/level2/page_register.py
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(config_path)), f"page_{_stem(config_path)}.py")
+
+
+def page_class_name(config_path):
+    """Class name of the page object generated from a config, e.g. RegisterPage"""
+    return ''.join(part.capitalize() for part in _stem(config_path).split('_') if part) + 'Page'
+
+
+def source_digest(config_path):
+    """
+    Digest of a config CSV and the generator version
+
+    Args:
+        config_path: Path to config CSV file
+
+    Returns:
+        Hex SHA-1 digest
+    """
+    digest = hashlib.sha1(f"page_objects {GENERATOR_VERSION}\n".encode('utf-8'))
+    with open(config_path, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _description(value):
+    """Config description cell as text"""
+    return '' if value is None or value != value else str(value)
+
+
+def _docstring(text):
+    """Docstring literal for generated code"""
+    if '"' in text or '\\' in text:
+        return repr(text)
+    return f'"""{text}"""'
+
+
+def generate_page_source(config_path, digest=None):
+    """
+    Compile a config CSV into the source of a page-object module
+
+    The CSV is parsed and validated by ConfigManager, so a config that the
+    suites would reject fails here too. URLs are kept as written and rebased
+    when the page object is created.
+
+    Args:
+        config_path: Path to config CSV file
+        digest: Source digest to embed (default: computed from the file)
+
+    Returns:
+        Python source code
+
+    Raises:
+        ValueError: If a URL or element name is not a valid, unique attribute name
+    """
+    config = ConfigManager(config_path)
+    digest = digest or source_digest(config_path)
+    class_name = page_class_name(config_path)
+    file_name = os.path.basename(config_path)
+
+    url_rows = config.config[config.config['section'] == 'url']
+    raw_urls = dict(zip(url_rows['element_name'], url_rows['locator_value']))
+    url_descriptions = dict(zip(url_rows['element_name'], url_rows.get('description', [''] * len(url_rows))))
+
+    seen = set()
+    for name in list(raw_urls) + list(config.locators):
+        if (not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name)
+                or name.startswith('_') or hasattr(PageObject, name)):
+            raise ValueError(f"{file_name}: '{name}' cannot be a page object attribute")
+        if name in seen:
+            raise ValueError(f"{file_name}: '{name}' is declared more than once")
+        seen.add(name)
+
+    lines = [
+        '"""',
+        f"Page object compiled from {file_name} by common/page_objects.py",
+        "Do not edit: rebuilt whenever the CSV changes (python generate_pages.py)",
+        '"""',
+        "# Locator, DriverProfile, WAIT_CONDITIONS and PageObject are provided by",
+        "# page_objects.load_page, so the classes are the ones of the importing package",
+        "",
+        "# Digest of the CSV and generator version this module was compiled from",
+        f"SOURCE_DIGEST = {digest!r}",
+        "",
+        "",
+        f"class {class_name}(PageObject):",
+        f"    {_docstring(f'Elements, URLs and browser profile of {file_name}')}",
+        "    __slots__ = ()",
+        "",
+        "    locators = {",
+    ]
+    for name, locator in config.locators.items():
+        lines.append(
+            f"        {name!r}: Locator({name!r}, {locator.by!r}, {locator.value!r}, {locator.wait_type!r}, "
+            f"WAIT_CONDITIONS[{locator.wait_type!r}], {locator.description!r}, "
+            f"{locator.timeout!r}, {locator.poll!r}),"
+        )
+    lines.append("    }")
+    lines.append("")
+    lines.append("    raw_urls = {")
+    for name, url in raw_urls.items():
+        lines.append(f"        {name!r}: {url!r},")
+    lines.append("    }")
+    lines.append("")
+    lines.append(f"    profile = {config.profile!r}")
+
+    for name in raw_urls:
+        lines += [
+            "",
+            "    @property",
+            f"    def {name}(self) -> str:",
+            f"        {_docstring(_description(url_descriptions.get(name)) or name)}",
+            f"        return self.urls[{name!r}]",
+        ]
+    for name, locator in config.locators.items():
+        lines += [
+            "",
+            "    @property",
+            f"    def {name}(self) -> Locator:",
+            f"        {_docstring(locator.description or name)}",
+            f"        return self.locators[{name!r}]",
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def _module_digest(module_path):
+    """SOURCE_DIGEST of a generated module, read without importing it (None if missing)"""
+    try:
+        with open(module_path, encoding='utf-8') as f:
+            for _ in range(20):
+                line = f.readline()
+                if line.startswith('SOURCE_DIGEST = '):
+                    return ast.literal_eval(line.split('=', 1)[1].strip())
+    except (OSError, ValueError, SyntaxError):
+        pass
+    return None
+
+
+def build_page(config_path, force=False):
+    """
+    Generate the page-object module of a config unless it is up to date
+
+    Args:
+        config_path: Path to config CSV file
+        force: Rebuild even if the embedded digest matches (default: False)
+
+    Returns:
+        (module path, True if the module was written)
+
+    Raises:
+        OSError: If the module cannot be written
+        ValueError: If the config cannot be compiled
+    """
+    module_path = page_module_path(config_path)
+    digest = source_digest(config_path)
+    if not force and _module_digest(module_path) == digest:
+        return module_path, False
+    source = generate_page_source(config_path, digest)
+    # Per-process temporary file: sharded workers may rebuild at the same time
+    tmp_path = f"{module_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    os.replace(tmp_path, module_path)
+    return module_path, True
+
+
+def _generated_namespace():
+    """Names the generated modules use"""
+    return {
+        'Locator': Locator,
+        'DriverProfile': DriverProfile,
+        'WAIT_CONDITIONS': WAIT_CONDITIONS,
+        'PageObject': PageObject,
+    }
+
+
+def load_page(config_path, base_url=None):
+    """
+    Page object of a config, rebuilding its module first if the CSV changed
+
+    The generated module does not import anything itself: Locator,
+    DriverProfile, WAIT_CONDITIONS and PageObject are placed in its
+    namespace from this module, so it works whether common is imported as
+    a package or from sys.path, and isinstance checks against PageObject
+    hold. When the module cannot be written (read-only checkout), the
+    generated source is executed in memory instead.
+
+    Args:
+        config_path: Path to config CSV file
+        base_url: Optional scheme and host for every URL (default: $TEST_BASE_URL)
+
+    Returns:
+        Instance of the generated PageObject subclass
+    """
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    module_name = f"page_{_stem(config_path)}"
+    try:
+        module_path, _ = build_page(config_path)
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        module = importlib.util.module_from_spec(spec)
+        module.__dict__.update(_generated_namespace())
+        spec.loader.exec_module(module)
+    except OSError:
+        module = types.ModuleType(module_name)
+        module.__dict__.update(_generated_namespace())
+        exec(compile(generate_page_source(config_path), page_module_path(config_path), 'exec'), module.__dict__)
+    return getattr(module, page_class_name(config_path))(base_url)
+
+
+# ==== Name checks ====
+
+def _call_name(func):
+    """Name of a called function or method"""
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def _literal(node):
+    """Value of a string literal node, else None"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def check_page_usage(source_path, page, variable='config_manager'):
+    """
+    Check the config names a script uses against a page object, without running it
+
+    Looks at attribute accesses on the page variable, literal names passed
+    to get_url/get_locator, and literal element names passed to helpers
+    right after the page variable, e.g. click_element(driver, config_manager,
+    "continue_button"). Names held in other variables are not checked.
+
+    Args:
+        source_path: Python script to check
+        page: Page object (or ConfigManager) the script uses
+        variable: Name the script gives the page object (default: config_manager)
+
+    Raises:
+        ValueError: Listing every unknown name with its line number
+    """
+    with open(source_path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), source_path)
+    page_type = type(page)
+    problems = []
+
+    def is_page(node):
+        return isinstance(node, ast.Name) and node.id == variable
+
+    def require(name, names, kind, node):
+        if name is not None and name not in names:
+            problems.append((node.lineno, f"unknown {kind} '{name}'"))
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and is_page(node.value):
+            if not hasattr(page_type, node.attr) and not hasattr(page, node.attr):
+                problems.append((node.lineno, f"unknown attribute '{node.attr}'"))
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        if isinstance(func, ast.Attribute) and is_page(func.value):
+            if node.args and func.attr == 'get_url':
+                require(_literal(node.args[0]), page.urls, 'URL', node)
+            elif node.args and func.attr == 'get_locator':
+                require(_literal(node.args[0]), page.locators, 'element', node)
+            continue
+        for i, arg in enumerate(node.args):
+            if is_page(arg):
+                count = NAME_ARGUMENTS.get(_call_name(func), 1)
+                for name_arg in node.args[i + 1:i + 1 + count]:
+                    require(_literal(name_arg), page.locators, 'element', node)
+                break
+        if any(is_page(arg) for arg in node.args):
+            for kw in node.keywords:
+                if kw.arg in ('element_name', 'message_name'):
+                    require(_literal(kw.value), page.locators, 'element', node)
+
+    if problems:
+        details = '\n'.join(f"  line {line}: {message}" for line, message in sorted(problems))
+        raise ValueError(f"{source_path} uses names missing from its config:\n{details}")
@@ -0,0 +1,148 @@
+"""
+Parallel Runner - Executes data-driven test rows on one or more WebDriver workers
+Each worker owns its own browser session; results are returned in data order
+"""
+import queue
+import threading
+
+
+def run_rows(data, run_row, driver_factory=None, workers=1, setup_session=None, driver_pool=None,
+             on_result=None, max_failures=None):
+    """
+    Run every data row through run_row and collect the results
+
+    With workers=1 the rows run serially in the calling thread. With more
+    workers the rows are shared through a queue, so a worker that finishes
+    a fast row immediately picks up the next pending one.
+
+    Args:
+        data: pandas DataFrame with the test data rows
+        run_row: Callable(driver, idx, row) returning a result dict
+        driver_factory: Callable() returning a new WebDriver instance
+        workers: Number of browser sessions to run in parallel (default: 1)
+        setup_session: Optional callable(driver) run once per session before its first row
+        driver_pool: Optional DriverPool to lease sessions from instead of driver_factory
+        on_result: Optional callable(result) invoked as soon as each row finishes
+        max_failures: Stop starting new rows once this many results are not PASS (default: run all)
+
+    Returns:
+        List of result dicts in the same order as the data rows; rows left
+        unrun after max_failures was reached are omitted
+    """
+    if driver_factory is None and driver_pool is None:
+        raise ValueError("run_rows needs a driver_factory or a driver_pool")
+
+    rows = list(data.iterrows())
+    if not rows:
+        return []
+    workers = max(1, min(int(workers), len(rows) or 1))
+
+    if driver_pool is not None:
+        open_driver = driver_pool.acquire
+        close_driver = driver_pool.release
+    else:
+        open_driver = driver_factory
+        close_driver = _quit_driver
+
+    if on_result is not None:
+        run_row = _reporting(run_row, on_result)
+
+    stop = threading.Event()
+    if max_failures:
+        run_row = _failing_fast(run_row, max_failures, stop)
+
+    if workers == 1:
+        return _run_serial(rows, run_row, open_driver, close_driver, setup_session, stop)
+    return _run_parallel(rows, run_row, open_driver, close_driver, workers, setup_session, stop)
+
+
+def _reporting(run_row, on_result):
+    """Wrap run_row so every result is passed to on_result when it is ready"""
+    def run_and_report(driver, idx, row):
+        result = run_row(driver, idx, row)
+        on_result(result)
+        return result
+    return run_and_report
+
+
+def _failing_fast(run_row, max_failures, stop):
+    """Wrap run_row so stop is set once max_failures results did not pass"""
+    lock = threading.Lock()
+    failures = [0]
+
+    def run_and_count(driver, idx, row):
+        result = run_row(driver, idx, row)
+        if result.get('Status') != 'PASS':
+            with lock:
+                failures[0] += 1
+                if failures[0] >= max_failures:
+                    stop.set()
+        return result
+    return run_and_count
+
+
+def _quit_driver(driver, discard=False):
+    """Close a driver that is not pooled"""
+    driver.quit()
+
+
+def _run_serial(rows, run_row, open_driver, close_driver, setup_session, stop):
+    """Run all rows on a single driver in the calling thread"""
+    driver = open_driver()
+    failed = True
+    try:
+        if setup_session:
+            setup_session(driver)
+        results = []
+        for idx, row in rows:
+            if stop.is_set():
+                break
+            results.append(run_row(driver, idx, row))
+        failed = False
+        return results
+    finally:
+        close_driver(driver, discard=failed)
+
+
+def _run_parallel(rows, run_row, open_driver, close_driver, workers, setup_session, stop):
+    """Run rows on several drivers, one worker thread per driver"""
+    pending = queue.Queue()
+    for position, (idx, row) in enumerate(rows):
+        pending.put((position, idx, row))
+
+    results = [None] * len(rows)
+    errors = []
+
+    def worker():
+        driver = None
+        failed = True
+        try:
+            driver = open_driver()
+            if setup_session:
+                setup_session(driver)
+            while not stop.is_set():
+                try:
+                    position, idx, row = pending.get_nowait()
+                except queue.Empty:
+                    break
+                results[position] = run_row(driver, idx, row)
+            failed = False
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            if driver is not None:
+                close_driver(driver, discard=failed)
+
+    threads = [
+        threading.Thread(target=worker, name=f"row-worker-{n + 1}", daemon=True)
+        for n in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return [result for result in results if result is not None]
@@ -0,0 +1,169 @@
+"""
+Result Cache - Reuses results of data rows whose inputs have not changed
+Rows are keyed by a content hash of the row values plus a fingerprint of the suite's config
+"""
+import hashlib
+import json
+import os
+import threading
+
+
+def fingerprint_files(*paths, context=None):
+    """
+    Hash the contents of the files a suite's results depend on
+
+    Args:
+        *paths: Files such as the config CSV and the suite script
+        context: Optional dict of run settings the results also depend on,
+            e.g. the application URL after rebasing and the execution tier
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    if context:
+        digest.update(json.dumps(context, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Local cache of result records keyed by row content
+
+    A row's key covers every value of the data row and the fingerprint, so
+    editing the row, the locators/URLs in the config, the suite itself or
+    the run context (application URL, tier) produces a new key. Only
+    passing results are reused; failed rows always run again.
+    """
+
+    def __init__(self, path, fingerprint):
+        """
+        Initialize ResultCache and load the cache file if it exists
+
+        Args:
+            path: Cache file path (JSON)
+            fingerprint: Digest of the config the results depend on
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def key(self, row):
+        """
+        Compute the cache key of a data row
+
+        Args:
+            row: pandas Series with one data row
+
+        Returns:
+            Hex digest string
+        """
+        values = json.dumps(row.to_dict(), sort_keys=True, default=str)
+        return hashlib.sha256((self.fingerprint + values).encode('utf-8')).hexdigest()
+
+    def lookup(self, row):
+        """
+        Get the cached result of an unchanged row that passed last time
+
+        Args:
+            row: pandas Series with one data row
+
+        Returns:
+            Result dict or None if the row has to run
+        """
+        with self._lock:
+            record = self._entries.get(self.key(row))
+        if record is not None and record.get('Status') == 'PASS':
+            return dict(record)
+        return None
+
+    def store(self, row, record):
+        """
+        Remember the result of a row that was just run
+
+        Args:
+            row: pandas Series with one data row
+            record: Result dict returned for the row
+        """
+        key = self.key(row)
+        with self._lock:
+            self._entries[key] = json.loads(json.dumps(record, default=str))
+
+    def split(self, data, id_of, id_column='Test_ID'):
+        """
+        Separate rows that can reuse a cached result from rows that must run
+
+        Args:
+            data: pandas DataFrame with the test data rows
+            id_of: Callable(idx, row) returning the row's Test_ID
+            id_column: Result column holding the Test_ID (default: Test_ID)
+
+        Returns:
+            (DataFrame of rows to run, list of cached result dicts)
+        """
+        cached = []
+        keep = []
+        for idx, row in data.iterrows():
+            record = self.lookup(row)
+            if record is None:
+                keep.append(True)
+                continue
+            # The ID may depend on the row position, which can change between runs
+            record[id_column] = id_of(idx, row)
+            cached.append(record)
+            keep.append(False)
+        return data[keep], cached
+
+    def wrap(self, run_row):
+        """
+        Wrap a row runner so that every fresh result is stored in the cache
+
+        Args:
+            run_row: Callable(driver, idx, row) returning a result dict
+
+        Returns:
+            Callable with the same signature
+        """
+        def run_and_store(driver, idx, row):
+            record = run_row(driver, idx, row)
+            self.store(row, record)
+            return record
+        return run_and_store
+
+    def save(self):
+        """Write the cache file atomically"""
+        with self._lock:
+            entries = dict(self._entries)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+
+def print_cache_report(cached, fresh, id_column='Test_ID'):
+    """
+    Print which results were reused from the cache and which were run
+
+    Args:
+        cached: Result dicts taken from the cache
+        fresh: Result dicts produced by this run
+        id_column: Result column holding the Test_ID
+    """
+    print("\n=== Result Cache ===")
+    print(f"Cached: {len(cached)}")
+    print(f"Fresh: {len(fresh)}")
+    if cached:
+        print("Cached rows: " + ", ".join(str(r[id_column]) for r in cached))
+    if fresh:
+        print("Fresh rows: " + ", ".join(str(r[id_column]) for r in fresh))
@@ -0,0 +1,152 @@
+"""
+Result Writer - Streams finished test rows to the result file as they complete
+Supports CSV and JSONL output and resuming a run from a partially written file
+"""
+import csv
+import io
+import json
+import math
+import os
+import threading
+
+
+class ResultWriter:
+    """
+    Crash-safe writer for test result records
+
+    Every record is appended and flushed as soon as its row finishes, so a
+    browser crash only loses the row in progress. finalize() rewrites the
+    file once in data order, replacing it atomically. With resume=True the
+    records already in the file are kept and their Test_IDs can be skipped.
+    The format follows the file extension: .jsonl for JSON lines, CSV otherwise.
+    """
+
+    def __init__(self, path, columns, resume=False, id_column='Test_ID'):
+        """
+        Initialize ResultWriter and open the result file
+
+        Args:
+            path: Result file path (.csv or .jsonl)
+            columns: Ordered result columns; missing values are written empty
+            resume: Keep records already in the file instead of starting over
+            id_column: Column identifying a test row (default: Test_ID)
+        """
+        self.path = path
+        self.columns = list(columns)
+        self.id_column = id_column
+        self.jsonl = path.lower().endswith('.jsonl')
+        self._lock = threading.Lock()
+        self._records = {}
+
+        if resume and os.path.exists(path):
+            for record in self._read_existing():
+                self._records[str(record[id_column])] = record
+            # Rewrite what was recovered so a torn last line is not appended to
+            self._rewrite(list(self._records.values()))
+        else:
+            self._rewrite([])
+
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        if not self.jsonl:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns,
+                                          restval='', extrasaction='ignore')
+
+    def _read_existing(self):
+        """Read complete records from an earlier, possibly interrupted, run"""
+        records = []
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            text = f.read()
+        # Drop a last line that was cut off by a crash before its newline
+        text = text[:text.rfind('\n') + 1]
+        with io.StringIO(text, newline='') as f:
+            if self.jsonl:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and record.get(self.id_column) is not None:
+                        records.append(record)
+            else:
+                for record in csv.DictReader(f):
+                    if None in record.values() or None in record:
+                        continue
+                    if record.get(self.id_column):
+                        records.append(record)
+        return records
+
+    def _clean(self, record):
+        """Map NaN to empty values the way DataFrame.to_csv does"""
+        return {
+            key: '' if isinstance(value, float) and math.isnan(value) else value
+            for key, value in record.items()
+        }
+
+    def _rewrite(self, records):
+        """Replace the result file with records through a temporary file"""
+        tmp_path = self.path + '.tmp'
+        encoding = 'utf-8' if self.jsonl else 'utf-8-sig'
+        with open(tmp_path, 'w', newline='', encoding=encoding) as f:
+            if self.jsonl:
+                for record in records:
+                    f.write(json.dumps(self._clean(record), default=str) + '\n')
+            else:
+                writer = csv.DictWriter(f, fieldnames=self.columns, restval='', extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(self._clean(record) for record in records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def completed_ids(self):
+        """
+        Get the Test_IDs that already have a result
+
+        Returns:
+            Set of Test_IDs as strings
+        """
+        with self._lock:
+            return set(self._records)
+
+    def write(self, record):
+        """
+        Append one result record and flush it to disk
+
+        Safe to call from several worker threads.
+
+        Args:
+            record: Result dict of one test row
+        """
+        record = self._clean(record)
+        with self._lock:
+            self._records[str(record[self.id_column])] = record
+            if self.jsonl:
+                self._file.write(json.dumps(record, default=str) + '\n')
+            else:
+                self._writer.writerow(record)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def finalize(self, order=None):
+        """
+        Close the stream and rewrite the file sorted in data order
+
+        Args:
+            order: Test_IDs in data order; records not listed go last
+
+        Returns:
+            List of all result records (resumed and new) in that order
+        """
+        with self._lock:
+            self._file.close()
+            records = dict(self._records)
+
+        ordered = []
+        for test_id in order or []:
+            record = records.pop(str(test_id), None)
+            if record is not None:
+                ordered.append(record)
+        ordered.extend(records.values())
+
+        self._rewrite(ordered)
+        return ordered
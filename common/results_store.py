@@ -0,0 +1,380 @@
+"""
+Results Store - Append-only SQLite history of every suite run and row result
+Queries load the history into pandas once and compute flake rates, duration trends
+and first failing runs with grouped, vectorized operations
+"""
+import json
+import socket
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .scheduler import row_digest
+except ImportError:
+    # Loaded as a top-level module by the suites (common/ on sys.path)
+    from scheduler import row_digest
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    suite TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL,
+    host TEXT,
+    argv TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    suite TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    status TEXT NOT NULL,
+    expected TEXT,
+    actual TEXT,
+    message TEXT,
+    row_digest TEXT
+);
+CREATE INDEX IF NOT EXISTS results_suite_test_started ON results (suite, test_id, started);
+CREATE INDEX IF NOT EXISTS results_suite_started ON results (suite, started);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+"""
+
+
+def connect(path):
+    """
+    Open the store, creating its tables on first use
+
+    WAL mode lets several suites or processes append while a report reads.
+
+    Args:
+        path: SQLite database file
+
+    Returns:
+        sqlite3.Connection
+    """
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+class RunRecorder:
+    """
+    Streams the row results of one suite run into the store in small batches
+
+    Created by ResultsStore.start_run. Rows are buffered and committed every
+    batch_rows rows or batch_seconds seconds, whichever comes first, so a run
+    that crashes or is killed keeps its history up to the last batch. Only
+    the worker that fills a batch waits for the database; finish() writes
+    the rest and marks the run finished.
+    """
+
+    def __init__(self, store, run_id, suite, batch_rows=100, batch_seconds=5.0):
+        """
+        Initialize RunRecorder
+
+        Args:
+            store: ResultsStore the run was started in
+            run_id: Run the rows belong to
+            suite: Suite name
+            batch_rows: Rows per committed batch (default: 100)
+            batch_seconds: Longest time a row waits in the buffer (default: 5.0)
+        """
+        self.store = store
+        self.run_id = run_id
+        self.suite = suite
+        self.batch_rows = batch_rows
+        self.batch_seconds = batch_seconds
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._rows = []
+        self._last_flush = time.monotonic()
+
+    def add(self, test_id, started, duration, record, digest=None):
+        """
+        Buffer the result of one row
+
+        Args:
+            test_id: Test_ID of the row
+            started: Start time (epoch seconds)
+            duration: Run time in seconds
+            record: Result dict with Status, Expected, Actual and Message
+            digest: Optional row_digest of the data row
+        """
+        row = (self.run_id, self.suite, str(test_id), started, duration, str(record.get('Status', '')),
+               str(record.get('Expected', '')), str(record.get('Actual', '')),
+               str(record.get('Message', '')), digest)
+        with self._lock:
+            self._rows.append(row)
+            due = (len(self._rows) >= self.batch_rows
+                   or time.monotonic() - self._last_flush >= self.batch_seconds)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Commit the buffered results"""
+        # Batches are written in order, one at a time
+        with self._write_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                self._last_flush = time.monotonic()
+            if rows:
+                self.store.insert(rows)
+
+    def wrap(self, run_row, id_of):
+        """
+        Wrap a row runner so that every result is timed and buffered
+
+        Args:
+            run_row: Callable(driver, idx, row) returning a result dict
+            id_of: Callable(idx, row) returning the row's Test_ID
+
+        Returns:
+            Callable with the same signature
+        """
+        def run_and_record(driver, idx, row):
+            started = time.time()
+            start = time.perf_counter()
+            record = run_row(driver, idx, row)
+            self.add(id_of(idx, row), started, time.perf_counter() - start, record, row_digest(row))
+            return record
+        return run_and_record
+
+    def finish(self):
+        """Commit the remaining results and mark the run finished"""
+        self.flush()
+        self.store.finish_run(self.run_id)
+
+
+class ResultsStore:
+    """Append-only store of suite runs and their row results"""
+
+    def __init__(self, path):
+        """
+        Initialize ResultsStore
+
+        Args:
+            path: SQLite database file (created on first use)
+        """
+        self.path = path
+
+    def start_run(self, suite, argv=None):
+        """
+        Register a new run
+
+        Args:
+            suite: Suite name, e.g. 'register/level2'
+            argv: Optional command line of the run
+
+        Returns:
+            RunRecorder for the run
+        """
+        conn = connect(self.path)
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO runs (suite, started, host, argv) VALUES (?, ?, ?, ?)",
+                    (suite, time.time(), socket.gethostname(), json.dumps(list(argv or []))),
+                )
+            return RunRecorder(self, cursor.lastrowid, suite)
+        finally:
+            conn.close()
+
+    def insert(self, rows):
+        """
+        Append result rows in one transaction
+
+        Args:
+            rows: Tuples in results column order
+        """
+        conn = connect(self.path)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO results (run_id, suite, test_id, started, duration, status, expected, "
+                    "actual, message, row_digest) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        finally:
+            conn.close()
+
+    def finish_run(self, run_id):
+        """Mark a run finished; runs without a finish time stopped early"""
+        conn = connect(self.path)
+        try:
+            with conn:
+                conn.execute("UPDATE runs SET finished = ? WHERE run_id = ?", (time.time(), run_id))
+        finally:
+            conn.close()
+
+    def append(self, run_id, rows):
+        """
+        Append result rows of a run and mark the run finished
+
+        Args:
+            run_id: Run the rows belong to
+            rows: Tuples in results column order
+        """
+        self.insert(rows)
+        self.finish_run(run_id)
+
+    def load(self, suite=None, since=None):
+        """
+        Load row results into a DataFrame sorted by suite, test and time
+
+        Args:
+            suite: Optional suite name to restrict to
+            since: Optional epoch seconds; older results are skipped
+
+        Returns:
+            DataFrame with the results columns
+        """
+        query = ("SELECT run_id, suite, test_id, started, duration, status, row_digest "
+                 "FROM results WHERE 1 = 1")
+        params = []
+        if suite:
+            query += " AND suite = ?"
+            params.append(suite)
+        if since is not None:
+            query += " AND started >= ?"
+            params.append(since)
+        query += " ORDER BY suite, test_id, started"
+        conn = connect(self.path)
+        try:
+            return pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+
+    def runs(self, suite=None, limit=10):
+        """
+        Summaries of the latest runs: rows, failures and wall time
+
+        Args:
+            suite: Optional suite name to restrict to
+            limit: Number of runs (default: 10)
+
+        Returns:
+            DataFrame, newest run first
+        """
+        query = ("SELECT r.run_id, r.suite, r.started, r.finished - r.started AS wall_s, "
+                 "COUNT(x.test_id) AS rows, SUM(x.status != 'PASS') AS failed "
+                 "FROM runs r LEFT JOIN results x ON x.run_id = r.run_id")
+        params = []
+        if suite:
+            query += " WHERE r.suite = ?"
+            params.append(suite)
+        query += " GROUP BY r.run_id ORDER BY r.run_id DESC LIMIT ?"
+        params.append(int(limit))
+        conn = connect(self.path)
+        try:
+            return pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+
+
+def _previous(results, column):
+    """Value of column in the previous result of the same suite and test (NaN for the first)"""
+    return results.groupby(['suite', 'test_id'], sort=False)[column].shift()
+
+
+def flake_stats(results):
+    """
+    Flake rate of every test
+
+    A flip is a status change between two consecutive results of a test
+    whose data row did not change in between. The flake rate is the share
+    of such comparable pairs that flipped.
+
+    Args:
+        results: DataFrame from ResultsStore.load (sorted by suite, test, time)
+
+    Returns:
+        DataFrame per suite and test_id: runs, fail_rate, flips, flake_rate
+    """
+    passed = results['status'] == 'PASS'
+    same_row = results['row_digest'].eq(_previous(results, 'row_digest')) | results['row_digest'].isna()
+    comparable = _previous(results, 'status').notna() & same_row
+    flipped = comparable & results['status'].ne(_previous(results, 'status'))
+
+    stats = pd.DataFrame({
+        'suite': results['suite'],
+        'test_id': results['test_id'],
+        'failed': ~passed,
+        'comparable': comparable,
+        'flipped': flipped,
+    }).groupby(['suite', 'test_id'], sort=False).agg(
+        runs=('failed', 'size'),
+        failures=('failed', 'sum'),
+        pairs=('comparable', 'sum'),
+        flips=('flipped', 'sum'),
+    )
+    stats['fail_rate'] = stats['failures'] / stats['runs']
+    stats['flake_rate'] = np.where(stats['pairs'] > 0, stats['flips'] / stats['pairs'].clip(lower=1), 0.0)
+    return stats.reset_index()[['suite', 'test_id', 'runs', 'fail_rate', 'flips', 'flake_rate']]
+
+
+def duration_trends(results):
+    """
+    Least-squares duration trend of every test over its runs
+
+    Args:
+        results: DataFrame from ResultsStore.load (sorted by suite, test, time)
+
+    Returns:
+        DataFrame per suite and test_id: runs, mean_s, recent_s (mean of
+        the last 5 results), slope_s (seconds added per run) and trend
+        (slope relative to the mean)
+    """
+    groups = results.groupby(['suite', 'test_id'], sort=False)
+    x = groups.cumcount().astype(float)
+    y = results['duration'].astype(float)
+    sums = pd.DataFrame({
+        'suite': results['suite'], 'test_id': results['test_id'],
+        'n': 1.0, 'x': x, 'y': y, 'xx': x * x, 'xy': x * y,
+    }).groupby(['suite', 'test_id'], sort=False).sum()
+
+    denominator = sums['n'] * sums['xx'] - sums['x'] ** 2
+    slope = np.where(denominator > 0,
+                     (sums['n'] * sums['xy'] - sums['x'] * sums['y']) / denominator.where(denominator > 0, 1), 0.0)
+    recent = results[groups.cumcount(ascending=False) < 5].groupby(['suite', 'test_id'], sort=False)['duration']
+    trends = pd.DataFrame({
+        'runs': sums['n'].astype(int),
+        'mean_s': sums['y'] / sums['n'],
+        'recent_s': recent.mean(),
+        'slope_s': slope,
+    })
+    trends['trend'] = trends['slope_s'] / trends['mean_s'].where(trends['mean_s'] > 0)
+    return trends.reset_index()
+
+
+def first_failing_runs(results):
+    """
+    Tests whose latest result failed, with the run where the current failure streak started
+
+    Args:
+        results: DataFrame from ResultsStore.load (sorted by suite, test, time)
+
+    Returns:
+        DataFrame per failing test: suite, test_id, first_failing_run,
+        failing_since (epoch seconds) and streak (consecutive failures)
+    """
+    failed = results['status'] != 'PASS'
+    # A new streak starts wherever the outcome differs from the previous result
+    changed = failed.ne(failed.groupby([results['suite'], results['test_id']], sort=False).shift())
+    streak = changed.groupby([results['suite'], results['test_id']], sort=False).cumsum()
+
+    frame = results.assign(failed=failed, streak=streak)
+    last = frame.groupby(['suite', 'test_id'], sort=False).tail(1)
+    last = last[last['failed']][['suite', 'test_id', 'streak']]
+    current = frame.merge(last, on=['suite', 'test_id', 'streak'])
+    return current.groupby(['suite', 'test_id'], sort=False).agg(
+        first_failing_run=('run_id', 'first'),
+        failing_since=('started', 'first'),
+        streak=('run_id', 'size'),
+    ).reset_index()
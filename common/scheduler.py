@@ -0,0 +1,182 @@
+"""
+Scheduler - Orders data rows so that likely failures run first
+Keeps a per-row history of outcomes and durations and ranks rows by failure risk per second
+"""
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def row_digest(row):
+    """
+    Hash the values of a data row
+
+    Args:
+        row: pandas Series with one data row
+
+    Returns:
+        Hex digest string
+    """
+    values = json.dumps(row.to_dict(), sort_keys=True, default=str)
+    return hashlib.sha256(values.encode('utf-8')).hexdigest()
+
+
+class RowHistory:
+    """
+    Outcome and duration history of each row, keyed by Test_ID
+
+    Every entry keeps the most recent statuses (oldest first), an average
+    duration and the digest of the row values it was last run with, so a
+    row edited since its last run can be told apart from an unchanged one.
+    """
+
+    def __init__(self, path, max_runs=20, decay=0.8):
+        """
+        Initialize RowHistory and load the history file if it exists
+
+        Args:
+            path: History file path (JSON)
+            max_runs: Statuses kept per row (default: 20)
+            decay: Weight of each older run relative to the next newer one (default: 0.8)
+        """
+        self.path = path
+        self.max_runs = max_runs
+        self.decay = decay
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def import_results(self, path, id_column='Test_ID'):
+        """
+        Seed the history from a result CSV of an earlier run
+
+        Rows that already have history are left alone.
+
+        Args:
+            path: Result file such as test_result_register.csv
+            id_column: Column holding the Test_ID (default: Test_ID)
+
+        Returns:
+            Number of rows imported
+        """
+        if not os.path.exists(path):
+            return 0
+        imported = 0
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for record in csv.DictReader(f):
+                test_id = str(record.get(id_column, ''))
+                status = record.get('Status')
+                if not test_id or status not in ('PASS', 'FAIL') or test_id in self.entries:
+                    continue
+                self.entries[test_id] = {'statuses': [status], 'duration': None, 'digest': None}
+                imported += 1
+        return imported
+
+    def record(self, test_id, digest, status, duration):
+        """
+        Add the outcome of one run of a row
+
+        Args:
+            test_id: Test_ID of the row
+            digest: row_digest of the values it ran with
+            status: 'PASS' or 'FAIL'
+            duration: Run time in seconds
+        """
+        with self._lock:
+            entry = self.entries.setdefault(str(test_id), {'statuses': [], 'duration': None, 'digest': None})
+            entry['statuses'] = (entry['statuses'] + [status])[-self.max_runs:]
+            previous = entry['duration']
+            entry['duration'] = duration if previous is None else 0.7 * previous + 0.3 * duration
+            entry['digest'] = digest
+
+    def failure_rate(self, test_id):
+        """
+        Recency-weighted failure probability of a row
+
+        Newer runs weigh more than older ones. One imaginary pass and one
+        imaginary failure are added so rows without history rate 0.5.
+
+        Returns:
+            Probability between 0 and 1
+        """
+        statuses = self.entries.get(str(test_id), {}).get('statuses', [])
+        failed = total = 0.0
+        weight = 1.0
+        for status in reversed(statuses):
+            total += weight
+            if status != 'PASS':
+                failed += weight
+            weight *= self.decay
+        return (failed + 1) / (total + 2)
+
+    def changed(self, test_id, digest):
+        """True if the row is new or its values differ from its last run"""
+        entry = self.entries.get(str(test_id))
+        return entry is None or (entry['digest'] is not None and entry['digest'] != digest)
+
+    def wrap(self, run_row, id_of):
+        """
+        Wrap a row runner so that every run is timed and recorded
+
+        Args:
+            run_row: Callable(driver, idx, row) returning a result dict
+            id_of: Callable(idx, row) returning the row's Test_ID
+
+        Returns:
+            Callable with the same signature
+        """
+        def run_and_record(driver, idx, row):
+            start = time.perf_counter()
+            record = run_row(driver, idx, row)
+            self.record(id_of(idx, row), row_digest(row), record.get('Status'), time.perf_counter() - start)
+            return record
+        return run_and_record
+
+    def save(self):
+        """Write the history file atomically"""
+        with self._lock:
+            entries = dict(self.entries)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+
+def order_by_risk(data, history, id_of):
+    """
+    Reorder data rows so that the expected failures per second are highest first
+
+    A row's risk is its recency-weighted failure rate, raised to at least
+    0.5 when the row is new or was edited since its last run. Risk is
+    divided by the row's average duration (the median of known durations
+    when it has none), so a quick suspicious row runs before a slow one.
+    Ties keep CSV order.
+
+    Args:
+        data: pandas DataFrame with the test data rows
+        history: RowHistory instance
+        id_of: Callable(idx, row) returning the row's Test_ID
+
+    Returns:
+        DataFrame with the same rows in scheduled order
+    """
+    durations = sorted(e['duration'] for e in history.entries.values() if e.get('duration'))
+    typical = durations[len(durations) // 2] if durations else 1.0
+
+    scores = []
+    for position, (idx, row) in enumerate(data.iterrows()):
+        test_id = id_of(idx, row)
+        risk = history.failure_rate(test_id)
+        if history.changed(test_id, row_digest(row)):
+            risk = max(risk, 0.5)
+        duration = history.entries.get(str(test_id), {}).get('duration') or typical
+        scores.append((-risk / max(duration, 0.001), position))
+    return data.iloc[[position for _, position in sorted(scores)]]
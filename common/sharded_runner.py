@@ -0,0 +1,513 @@
+"""
+Sharded Runner - Runs data rows in worker processes that each own one browser
+A coordinator serves work units over an authenticated socket; idle workers steal from busy ones
+"""
+import os
+import queue
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import Client
+from multiprocessing.managers import BaseManager
+
+import pandas as pd
+
+try:
+    from .scheduler import row_digest
+    from .driver_factory import create_driver
+    from .http_tier import HttpSession
+    from .failure_artifacts import ArtifactWriter
+    from . import metrics as _metrics
+    from . import adaptive_waits as _waits
+except ImportError:
+    # Loaded as a top-level module by the suites (common/ on sys.path)
+    from scheduler import row_digest
+    from driver_factory import create_driver
+    from http_tier import HttpSession
+    from failure_artifacts import ArtifactWriter
+    import metrics as _metrics
+    import adaptive_waits as _waits
+
+
+# Repository root; suites live in <root>/<suite>
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Worker command line, started once per local process and by hand on other machines
+WORKER_SCRIPT = os.path.join(ROOT_DIR, 'shard_worker.py')
+# Environment variable carrying the socket's authentication key
+AUTHKEY_ENV = 'SHARD_AUTHKEY'
+
+
+def _suite_relative(path, suite):
+    """Path relative to the suite directory if it lies inside it, else absolute"""
+    suite_dir = os.path.join(ROOT_DIR, suite)
+    relative = os.path.relpath(os.path.abspath(path), suite_dir)
+    return os.path.abspath(path) if relative.startswith(os.pardir) else relative
+
+
+def shard_job(suite, entry='run_test_case', setup=None, driver='chrome', headless=True, artifacts=None,
+              metrics=False, waits=None):
+    """
+    Describe what a worker process runs
+
+    Artifact paths inside the suite directory are sent relative to it and
+    resolved against each worker's own checkout. A remote worker therefore
+    keeps its archives on its own host, under the path the result file
+    names; collect them from there or share the checkout between hosts.
+
+    Args:
+        suite: Suite name as in run_suites.SUITES, e.g. 'register/level2'
+        entry: Name of the suite's row function (driver, idx, row) -> record
+        setup: Optional name of the suite's per-session setup function
+        driver: 'chrome' for a browser, 'http' for an HttpSession
+        headless: Run the worker's browser headless (default: True)
+        artifacts: Optional ArtifactWriter whose run directory workers write to
+        metrics: Record timings in the workers; run_rows_sharded merges them
+            into this process's active registry (default: False)
+        waits: Optional active WaitTuner; workers start from its samples and
+            their new waits are merged back into it
+
+    Returns:
+        Job dict sent to every worker that joins
+    """
+    if artifacts is not None:
+        base_dir = _suite_relative(artifacts.base_dir, suite) if artifacts.base_dir else None
+        artifacts = (_suite_relative(artifacts.run_dir, suite), base_dir)
+    return {
+        'suite': suite,
+        'entry': entry,
+        'setup': setup,
+        'driver': driver,
+        'headless': headless,
+        'artifacts': artifacts,
+        'metrics': bool(metrics),
+        'waits': waits.snapshot() if waits is not None else None,
+    }
+
+
+class WorkBoard:
+    """
+    Work-stealing coordinator state, shared with the workers through a manager
+
+    Rows are cut into units of unit_size. Each worker has its own deque of
+    units. A worker whose deque is empty takes a share from the front of the
+    unassigned pool (so rows still start roughly in data order, risky rows
+    first with --order history); once the pool is empty it steals the far
+    half of the longest worker deque, so an early finisher relieves the
+    slowest worker instead of waiting. Rows in flight on a worker that leaves
+    with an error go back to the pool, up to max_attempts tries per row.
+    """
+
+    # Methods reachable from worker processes
+    EXPOSED = ('join', 'take', 'put', 'leave')
+
+    def __init__(self, items, job, unit_size=4, max_attempts=2):
+        """
+        Initialize WorkBoard
+
+        Args:
+            items: List of (idx, row dict, test_id) in run order
+            job: Job dict from shard_job
+            unit_size: Rows per work unit (default: 4)
+            max_attempts: Tries per row when workers crash (default: 2)
+        """
+        self.job = job
+        self.max_attempts = max_attempts
+        self.errors = []
+        self.abandoned = []
+        self.reports = []
+        self._lock = threading.Lock()
+        self._deques = {None: deque(items[i:i + unit_size] for i in range(0, len(items), unit_size))}
+        self._in_flight = {}
+        self._attempts = {}
+        self._workers = {}
+        self._results = queue.Queue()
+        self._stopped = False
+
+    def join(self, name):
+        """Register a worker and hand it the job"""
+        with self._lock:
+            self._workers[name] = 'active'
+            self._deques.setdefault(name, deque())
+        return self.job
+
+    def _refill(self, name):
+        """Give an idle worker units from the pool, or else from the busiest worker"""
+        own = self._deques[name]
+        pool = self._deques[None]
+        if pool:
+            active = sum(1 for state in self._workers.values() if state == 'active')
+            share = max(1, len(pool) // (2 * active))
+            own.extend(pool.popleft() for _ in range(share))
+            return
+        victims = [units for owner, units in self._deques.items() if owner != name and units]
+        if not victims:
+            return
+        victim = max(victims, key=len)
+        stolen = [victim.pop() for _ in range((len(victim) + 1) // 2)]
+        own.extend(reversed(stolen))
+
+    def take(self, name):
+        """
+        Next work unit of a worker
+
+        Returns:
+            List of (idx, row dict, test_id); empty when the run is over
+        """
+        with self._lock:
+            if self._stopped or self._workers.get(name) != 'active':
+                return []
+            own = self._deques[name]
+            if not own:
+                self._refill(name)
+            if not own:
+                return []
+            unit = own.popleft()
+            flying = self._in_flight.setdefault(name, {})
+            for item in unit:
+                flying[item[0]] = item
+                self._attempts[item[0]] = self._attempts.get(item[0], 0) + 1
+            return unit
+
+    def put(self, name, idx, record, started, duration):
+        """Stream the result of one row back to the coordinator"""
+        self._results.put((idx, record, started, duration))
+        with self._lock:
+            self._in_flight.get(name, {}).pop(idx, None)
+
+    def leave(self, name, error=None, report=None):
+        """
+        Unregister a worker; its queued units and unfinished rows go back to the pool
+
+        Args:
+            name: Worker name
+            error: Optional description of why the worker stopped
+            report: Optional dict of the worker's 'metrics' samples and recorded 'waits'
+        """
+        with self._lock:
+            if self._workers.get(name) != 'active':
+                return
+            self._workers[name] = 'left'
+            if report:
+                self.reports.append(report)
+            if error:
+                self.errors.append(f"{name}: {error}")
+            pool = self._deques[None]
+            pool.extend(self._deques.pop(name, ()))
+            lost = list(self._in_flight.pop(name, {}).values())
+            retry = [item for item in lost if self._attempts[item[0]] < self.max_attempts]
+            self.abandoned += [item[2] for item in lost if self._attempts[item[0]] >= self.max_attempts]
+            if retry:
+                pool.appendleft(retry)
+
+    def stop(self):
+        """Hand out no further units (rows in flight still report back)"""
+        with self._lock:
+            self._stopped = True
+
+    def next_result(self, timeout):
+        """Next streamed (idx, record, started, duration), or None after timeout"""
+        try:
+            return self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def finished(self):
+        """True once no row is in flight and nothing more will be handed out"""
+        with self._lock:
+            if any(self._in_flight.values()):
+                return False
+            return self._stopped or not any(self._deques.values())
+
+    def active_workers(self):
+        """Names of the workers that joined and have not left"""
+        with self._lock:
+            return [name for name, state in self._workers.items() if state == 'active']
+
+
+class _BoardClient(BaseManager):
+    """Worker-side manager; only knows the name of the shared board"""
+
+
+_BoardClient.register('board')
+
+
+def _parse_address(address):
+    """('host', port) from 'host:port' or ':port'"""
+    host, _, port = address.rpartition(':')
+    return host or '0.0.0.0', int(port)
+
+
+class BoardServer:
+    """
+    Serves a WorkBoard on a TCP socket from background threads
+
+    Uses the manager's request handling with an own accept loop, since
+    Server.serve_forever resets sys.stdout when it ends.
+    """
+
+    def __init__(self, board, address=('127.0.0.1', 0), authkey=None):
+        """
+        Start listening
+
+        Args:
+            board: WorkBoard to share
+            address: (host, port) to listen on; port 0 picks a free port
+            authkey: Bytes workers must present to connect
+        """
+        manager_class = type('BoardManager', (BaseManager,), {})
+        manager_class.register('board', callable=lambda: board, exposed=WorkBoard.EXPOSED)
+        self._server = manager_class(address=address, authkey=authkey).get_server()
+        self.address = self._server.address
+        self._stop = threading.Event()
+        # serve_client threads end on the same event
+        self._server.stop_event = self._stop
+        self._thread = threading.Thread(target=self._accept, name='shard-coordinator', daemon=True)
+        self._thread.start()
+
+    def _accept(self):
+        """Hand every authenticated connection to a request thread"""
+        while True:
+            try:
+                connection = self._server.listener.accept()
+            except (OSError, EOFError):
+                if self._stop.is_set():
+                    return
+                continue
+            if self._stop.is_set():
+                connection.close()
+                return
+            threading.Thread(target=self._server.handle_request, args=(connection,), daemon=True).start()
+
+    def close(self):
+        """Stop accepting workers and close the socket"""
+        self._stop.set()
+        host, port = self.address
+        try:
+            # Wake the accept loop with one last connection
+            Client(('127.0.0.1' if host in ('0.0.0.0', '') else host, port)).close()
+        except OSError:
+            pass
+        self._thread.join(timeout=5)
+        self._server.listener.close()
+
+
+def bookkeeping(id_of, result_cache=None, history=None, recorder=None):
+    """
+    Coordinator-side replacement for the suites' run_row wrappers
+
+    Worker processes time each row; this records their results into the
+    suite's result cache, run history and results store, which live in the
+    coordinator process.
+
+    Args:
+        id_of: Callable(idx, row) returning the row's Test_ID
+        result_cache: Optional ResultCache
+        history: Optional RowHistory
+        recorder: Optional RunRecorder
+
+    Returns:
+        Callable(idx, row, record, started, duration)
+    """
+    def record_row(idx, row, record, started, duration):
+        digest = row_digest(row)
+        if result_cache is not None:
+            result_cache.store(row, record)
+        if history is not None:
+            history.record(id_of(idx, row), digest, record.get('Status'), duration)
+        if recorder is not None:
+            recorder.add(id_of(idx, row), started, duration, record, digest)
+    return record_row
+
+
+def run_rows_sharded(data, job, id_of, processes=2, listen=None, unit_size=4, on_row=None,
+                     on_result=None, max_failures=None):
+    """
+    Run data rows in worker processes, one browser per process
+
+    Local workers are started with shard_worker.py. With listen set, workers
+    on other machines can join the same run:
+        SHARD_AUTHKEY=<key> python shard_worker.py --connect <host>:<port>
+
+    Args:
+        data: DataFrame of test rows (already filtered and ordered)
+        job: Job dict from shard_job
+        id_of: Callable(idx, row) returning the row's Test_ID
+        processes: Local worker processes to start (default: 2)
+        listen: Optional 'host:port' to accept remote workers on
+        unit_size: Rows per work unit (default: 4)
+        on_row: Optional callback(idx, row, record, started, duration), see bookkeeping
+        on_result: Optional callback(record) for every finished row
+        max_failures: Stop handing out rows after this many non-PASS results
+
+    Returns:
+        List of result records in completion order; rows never run are left out
+
+    Raises:
+        RuntimeError: If workers failed and rows were left unrun
+    """
+    items = [(idx, row.to_dict(), id_of(idx, row)) for idx, row in data.iterrows()]
+    if not items:
+        return []
+
+    board = WorkBoard(items, job, unit_size=unit_size)
+    key_text = os.environ.get(AUTHKEY_ENV)
+    if not key_text:
+        key_text = secrets.token_hex(16)
+    server = BoardServer(board, _parse_address(listen) if listen else ('127.0.0.1', 0), key_text.encode('utf-8'))
+    host, port = server.address
+    if listen:
+        print(f"Coordinator listening on {socket.gethostname()}:{port}")
+        if not os.environ.get(AUTHKEY_ENV):
+            print(f"Join from another machine: {AUTHKEY_ENV}={key_text} "
+                  f"python shard_worker.py --connect {socket.gethostname()}:{port}")
+
+    connect_host = '127.0.0.1' if host in ('0.0.0.0', '') else host
+    env = dict(os.environ, **{AUTHKEY_ENV: key_text})
+    local = {}
+    for n in range(processes):
+        name = f"local-{n + 1}"
+        local[name] = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT, '--connect', f'{connect_host}:{port}', '--name', name],
+            env=env,
+        )
+
+    results = []
+
+    def collect(item):
+        idx, record, started, duration = item
+        if on_row:
+            on_row(idx, data.loc[idx], record, started, duration)
+        if on_result:
+            on_result(record)
+        results.append(record)
+        return record
+
+    failures = 0
+    stopped_early = False
+    exits = {}
+    try:
+        while True:
+            item = board.next_result(timeout=0.2)
+            if item is not None:
+                if collect(item).get('Status') != 'PASS':
+                    failures += 1
+                    if max_failures and failures >= max_failures and not stopped_early:
+                        stopped_early = True
+                        board.stop()
+                continue
+
+            # A local worker that exited without leaving (killed, crashed) gives its rows back
+            for name, process in local.items():
+                code = process.poll()
+                if code:
+                    exits[name] = f"{name}: exited with code {code}"
+                if code is not None:
+                    board.leave(name, error=f"exited with code {code}" if code else None)
+            if board.finished():
+                break
+            if not listen and all(process.poll() is not None for process in local.values()) \
+                    and not board.active_workers():
+                break
+    finally:
+        board.stop()
+        for process in local.values():
+            try:
+                process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        server.close()
+
+    # Results put just before the last worker left
+    while (item := board.next_result(timeout=0)) is not None:
+        collect(item)
+
+    # Timings and wait samples of the workers go to this process's registry and tuner
+    for report in board.reports:
+        if _metrics.active is not None and report.get('metrics'):
+            _metrics.active.merge(report['metrics'])
+        if _waits.active is not None and report.get('waits'):
+            _waits.active.merge(report['waits'])
+
+    if board.abandoned:
+        print(f"Rows abandoned after crashing {board.max_attempts} workers: {board.abandoned}")
+    unrun = len(items) - len(results) - len(board.abandoned)
+    if unrun and not stopped_early:
+        reason = (board.errors or list(exits.values()) or ["no worker joined"])[0]
+        raise RuntimeError(f"Shard workers stopped with {unrun} rows left: {reason}")
+    return results
+
+
+def run_worker(address, authkey, name, load_suite):
+    """
+    Join a coordinator and run its rows until no work is left
+
+    Args:
+        address: (host, port) of the coordinator
+        authkey: Authentication key bytes
+        name: Unique worker name
+        load_suite: Callable(suite name) returning the imported suite module
+
+    Returns:
+        Number of rows run
+    """
+    client = _BoardClient(address=address, authkey=authkey)
+    client.connect()
+    board = client.board()
+    job = board.join(name)
+
+    module = load_suite(job['suite'])
+    run_row = getattr(module, job['entry'])
+    registry = _metrics.enable_metrics() if job.get('metrics') else None
+    tuner = None
+    if job.get('waits') is not None:
+        tuner = _waits.enable_adaptive_waits()
+        tuner.load(job['waits'])
+    artifacts = None
+    test_ids = {}
+    if job.get('artifacts'):
+        # Relative paths are resolved against this worker's copy of the suite
+        suite_dir = os.path.dirname(os.path.abspath(module.__file__))
+        run_dir, base_dir = job['artifacts']
+        artifacts = ArtifactWriter(os.path.normpath(os.path.join(suite_dir, run_dir)),
+                                   os.path.normpath(os.path.join(suite_dir, base_dir)) if base_dir else None)
+        run_row = artifacts.wrap(run_row, lambda idx, row: test_ids.get(idx, idx))
+
+    if job['driver'] == 'http':
+        driver = HttpSession()
+    else:
+        driver = create_driver(headless=job['headless'], profile=getattr(module, 'driver_profile', None))
+
+    count = 0
+    error = None
+    try:
+        if job.get('setup'):
+            getattr(module, job['setup'])(driver)
+        while True:
+            unit = board.take(name)
+            if not unit:
+                break
+            for idx, values, test_id in unit:
+                test_ids[idx] = test_id
+                started = time.time()
+                start = time.perf_counter()
+                record = run_row(driver, idx, pd.Series(values, name=idx))
+                board.put(name, idx, record, started, time.perf_counter() - start)
+                count += 1
+    except Exception as e:
+        error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+        raise
+    finally:
+        report = {
+            'metrics': registry.samples() if registry is not None else None,
+            'waits': tuner.take_recorded() if tuner is not None else None,
+        }
+        board.leave(name, error, report)
+        driver.quit()
+        if artifacts is not None:
+            artifacts.close()
+    return count
@@ -0,0 +1,69 @@
+"""
+Storage State - Snapshot and restore of an application's client-side state
+Captures localStorage/sessionStorage of the current origin and puts it back in one script call
+"""
+from collections import namedtuple
+
+from selenium.common.exceptions import WebDriverException
+
+
+# Web storage of one origin at the moment it was captured
+StorageState = namedtuple('StorageState', ['origin', 'local', 'session'])
+
+_CAPTURE_JS = """
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+return [window.location.origin, dump(window.localStorage), dump(window.sessionStorage)];
+"""
+
+_RESTORE_JS = """
+var origin = arguments[0], local = arguments[1], session = arguments[2];
+if (window.location.origin !== origin) { return false; }
+function load(storage, items) {
+    storage.clear();
+    for (var key in items) { storage.setItem(key, items[key]); }
+}
+load(window.localStorage, local);
+load(window.sessionStorage, session);
+return true;
+"""
+
+
+def capture_storage_state(driver):
+    """
+    Capture the web storage of the page currently open in driver
+
+    Args:
+        driver: Selenium WebDriver instance
+
+    Returns:
+        StorageState namedtuple
+    """
+    origin, local, session = driver.execute_script(_CAPTURE_JS)
+    return StorageState(origin=origin, local=local, session=session)
+
+
+def restore_storage_state(driver, state):
+    """
+    Replace the web storage of the current page with a captured state
+
+    The page must already be on the origin the state was captured from;
+    the application picks the restored values up on its next navigation.
+
+    Args:
+        driver: Selenium WebDriver instance
+        state: StorageState from capture_storage_state
+
+    Returns:
+        True if the state was restored, False if the page is on another origin
+    """
+    try:
+        return bool(driver.execute_script(_RESTORE_JS, state.origin, state.local, state.session))
+    except WebDriverException:
+        return False
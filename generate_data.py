@@ -0,0 +1,50 @@
+"""
+Generate boundary-value and equivalence-partition data CSVs for the suites
+Usage: python generate_data.py register|withdraw --rows N [--seed S] [--output PATH]
+Example: python generate_data.py register --rows 100000 --seed 7
+         python register/level2/test_register_level2.py --data register/level2/data_register_generated.csv
+"""
+import os
+import sys
+import time
+import argparse
+
+# Add common directory to path (same module names the suites import)
+root_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(root_dir, 'common'))
+
+from data_generator import generate_register_data, generate_withdraw_data
+
+
+def parse_args(argv=None):
+    """Parse command line options for the data generator"""
+    parser = argparse.ArgumentParser(description="Generate BVA/ECP data CSVs for the suites")
+    parser.add_argument("suite", choices=["register", "withdraw"], help="Suite whose data schema to produce")
+    parser.add_argument("--rows", type=int, default=1000, help="Number of rows (default: 1000)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible data")
+    parser.add_argument("--balance", type=int, default=5096,
+                        help="Withdraw only: balance restored before every row (default: 5096)")
+    parser.add_argument("--output",
+                        help="Output CSV (default: <suite>/level2/data_<suite>_generated.csv)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    output = args.output or os.path.join(root_dir, args.suite, 'level2', f'data_{args.suite}_generated.csv')
+
+    start = time.perf_counter()
+    if args.suite == "register":
+        data = generate_register_data(args.rows, seed=args.seed)
+    else:
+        data = generate_withdraw_data(args.rows, balance=args.balance, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    data.to_csv(output, index=False)
+    print(f"Generated {len(data)} rows in {elapsed:.3f}s")
+    print(data['expected'].value_counts().to_string())
+    print(f"Data saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
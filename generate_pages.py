@@ -0,0 +1,59 @@
+"""
+Compile the suites' config CSVs into page-object modules and check the suites' element names
+Usage: python generate_pages.py [--suite register/level2] [--force]
+Example: python generate_pages.py   (writes register/level2/page_register.py, withdraw/level2/page_withdraw.py)
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+
+# Add common directory to path (same module names the suites import)
+root_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(root_dir, 'common'))
+
+from page_objects import build_page, load_page, check_page_usage
+
+
+def parse_args(argv=None):
+    """Parse command line options for the page-object generator"""
+    parser = argparse.ArgumentParser(description="Generate page-object modules from the config CSVs")
+    parser.add_argument("--suite", help="Only this suite, e.g. register/level2 (default: all with a config)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild even the modules whose CSV did not change")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pattern = os.path.join(root_dir, args.suite or os.path.join('*', 'level*'), 'config_*.csv')
+    config_paths = sorted(glob.glob(pattern))
+    if not config_paths:
+        print(f"No config CSVs match {pattern}")
+        return 1
+
+    failed = 0
+    for config_path in config_paths:
+        start = time.perf_counter()
+        try:
+            module_path, written = build_page(config_path, force=args.force)
+        except ValueError as e:
+            print(f"{os.path.relpath(config_path, root_dir)}: {e}")
+            failed += 1
+            continue
+        state = "generated" if written else "up to date"
+        print(f"{os.path.relpath(module_path, root_dir)}: {state} ({time.perf_counter() - start:.3f}s)")
+
+        page = load_page(config_path)
+        for script in sorted(glob.glob(os.path.join(os.path.dirname(config_path), 'test_*.py'))):
+            try:
+                check_page_usage(script, page)
+            except ValueError as e:
+                print(e)
+                failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,56 +4,62 @@ Test cases extracted from Register.krecorder file
 """
 import time
 import os
-import random
-import string
+import sys
+import argparse
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Add common directory to path (driver setup and row runner only, locators stay hard-coded)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+common_dir = os.path.join(os.path.dirname(os.path.dirname(script_dir)), 'common')
+sys.path.insert(0, common_dir)
+
+from driver_factory import create_driver, driver_pool_name
+from driver_pool import get_shared_pool
+from parallel_runner import run_rows
+from sharded_runner import shard_job, run_rows_sharded, bookkeeping
+from config_manager import rebase_url
+from result_writer import ResultWriter
+from identity_allocator import IdentityAllocator
+from result_cache import ResultCache, fingerprint_files, print_cache_report
+from scheduler import RowHistory, order_by_risk
+from results_store import ResultsStore
+from failure_artifacts import ArtifactWriter, new_run_dir
+
 # ==== Load data ====
 # Get the directory where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.join(script_dir, "data_register.csv")
-data = pd.read_csv(csv_path)
 
 # ==== Setup output file ====
 output_file = os.path.join(script_dir, "test_result_register.csv")
-test_results = []
+cache_file = os.path.join(script_dir, "result_cache_register.json")
+history_file = os.path.join(script_dir, "run_history_register.json")
+# One sub-directory of failure archives per run
+artifacts_dir = os.path.join(script_dir, "artifacts")
+# Shared by all suites, see results_report.py
+results_db = os.path.join(os.path.dirname(common_dir), "results_history.db")
+identities_file = os.path.join(script_dir, "registered_identities.jsonl")
 
-# ==== Setup driver ====
-driver = webdriver.Chrome()
-driver.maximize_window()
+# Column order of the result file
+RESULT_COLUMNS = [
+    'Test_ID', 'Firstname', 'Lastname', 'Email', 'Original_Email', 'Telephone', 'Expected',
+    'Actual', 'Message', 'Status', 'Verify_Message', 'Artifacts'
+]
 
 # Register page URL
-register_url = "https://ecommerce-playground.lambdatest.io/index.php?route=account/register"
-success_url = "https://ecommerce-playground.lambdatest.io/index.php?route=account/success"
+register_url = rebase_url("https://ecommerce-playground.lambdatest.io/index.php?route=account/register")
+success_url = rebase_url("https://ecommerce-playground.lambdatest.io/index.php?route=account/success")
 # Logout URL to ensure clean state before each test
-logout_url = "https://ecommerce-playground.lambdatest.io/index.php?route=account/logout"
+logout_url = rebase_url("https://ecommerce-playground.lambdatest.io/index.php?route=account/logout")
 
-print("Starting Register Test Suite...")
+# Unique e-mail suffixes per row and a ledger of the addresses that were registered
+identities = IdentityAllocator(identities_file, register_url)
 
-def generate_random_suffix(length=10):
-    """Generate random alphanumeric suffix"""
-    characters = string.ascii_letters + string.digits
-    return ''.join(random.choice(characters) for _ in range(length))
-
-def add_random_suffix_to_email(email):
-    """Add random suffix to email to ensure uniqueness"""
-    if not email or pd.isna(email) or email.strip() == '':
-        return email
-    
-    email = str(email).strip()
-    if '@' in email:
-        local_part, domain = email.rsplit('@', 1)
-        random_suffix = generate_random_suffix(10)
-        return f"{local_part}{random_suffix}@{domain}"
-    random_suffix = generate_random_suffix(10)
-    return f"{email}{random_suffix}"
 
-
-def safe_input(field_id, value, wait_time=10):
+def safe_input(driver, field_id, value, wait_time=10):
     """Fill input field only when value exists"""
     if not value:
         return
@@ -65,7 +71,7 @@ def safe_input(field_id, value, wait_time=10):
     time.sleep(0.3)
 
 
-def click_element(xpath, wait_time=10):
+def click_element(driver, xpath, wait_time=10):
     """Click element if available"""
     elem = WebDriverWait(driver, wait_time).until(
         EC.element_to_be_clickable((By.XPATH, xpath))
@@ -75,7 +81,7 @@ def click_element(xpath, wait_time=10):
     return elem
 
 
-def verify_registration_result(expected, verify_message):
+def verify_registration_result(driver, expected, verify_message):
     """Verify form submission outcome and return actual status + message"""
     time.sleep(1)
     actual = "unknown"
@@ -132,8 +138,9 @@ def verify_registration_result(expected, verify_message):
 
     return actual, message_text
 
-# ==== Main test loop ====
-for idx, row in data.iterrows():
+# ==== Test case ====
+def run_test_case(driver, idx, row):
+    """Run one register data row and return its result record"""
     test_id = row['test_id']
     firstname = row['firstname'] if pd.notna(row['firstname']) else ''
     lastname = row['lastname'] if pd.notna(row['lastname']) else ''
@@ -146,19 +153,18 @@ for idx, row in data.iterrows():
     expected = row['expected'] if pd.notna(row['expected']) else 'failure'
     verify_message = row['verify_message'] if pd.notna(row['verify_message']) else ''
 
-    # Add random suffix to email to ensure uniqueness
-    # BUT: Don't modify email for test cases that specifically test "email already registered"
+    # Give every row its own address
+    # BUT: test cases for "email already registered" reuse an address known to exist
     original_email = email
-    should_modify_email = True
     
     # Check if this test case is designed to test "email already registered" scenario
     if expected == 'failure' and verify_message and 'already registered' in str(verify_message).lower():
-        should_modify_email = False
+        email = identities.registered_email(default=email)
         print(f"\n--- Test Case {idx+1}: {test_id} ---")
-        print(f"Note: This test case checks for 'email already registered' - keeping original email")
+        print(f"Note: This test case checks for 'email already registered' - using registered email {email}")
     else:
-        # For success cases or other failure cases, add random suffix to ensure uniqueness
-        email = add_random_suffix_to_email(email)
+        # For success cases or other failure cases, add a unique suffix
+        email = identities.unique_email(email)
         print(f"\n--- Test Case {idx+1}: {test_id} ---")
         if original_email != email:
             print(f"Email modified: {original_email} -> {email}")
@@ -176,29 +182,29 @@ for idx, row in data.iterrows():
 
     # Step 2: Fill form fields
     try:
-        safe_input("input-firstname", firstname)
-        safe_input("input-lastname", lastname)
-        safe_input("input-email", email)
-        safe_input("input-telephone", telephone)
-        safe_input("input-password", password)
-        safe_input("input-confirm", confirm)
+        safe_input(driver, "input-firstname", firstname)
+        safe_input(driver, "input-lastname", lastname)
+        safe_input(driver, "input-email", email)
+        safe_input(driver, "input-telephone", telephone)
+        safe_input(driver, "input-password", password)
+        safe_input(driver, "input-confirm", confirm)
 
         # Newsletter subscription (Yes/No)
         if newsletter == 'Yes':
             try:
-                click_element("//div[@id='content']/form/fieldset[3]/div/div/div/label", wait_time=5)
+                click_element(driver, "//div[@id='content']/form/fieldset[3]/div/div/div/label", wait_time=5)
             except:
                 pass
 
         # Privacy Policy checkbox
         if privacy:
             try:
-                click_element("//div[@id='content']/form/div/div/div/label", wait_time=10)
+                click_element(driver, "//div[@id='content']/form/div/div/div/label", wait_time=10)
             except:
                 pass
 
         # Step 3: Click Continue button
-        click_element("//input[@value='Continue']", wait_time=10)
+        click_element(driver, "//input[@value='Continue']", wait_time=10)
         time.sleep(2)
 
     except Exception as e:
@@ -206,7 +212,7 @@ for idx, row in data.iterrows():
         actual = "error"
         message_text = f"Error: {str(e)}"
         status = "FAIL"
-        test_results.append({
+        return {
             'Test_ID': test_id,
             'Firstname': firstname,
             'Lastname': lastname,
@@ -215,22 +221,27 @@ for idx, row in data.iterrows():
             'Actual': actual,
             'Message': message_text,
             'Status': status
-        })
-        continue
+        }
 
     # Step 4: Verify result
-    actual, message_text = verify_registration_result(expected, verify_message)
+    actual, message_text = verify_registration_result(driver, expected, verify_message)
 
     # Compare actual vs expected
     status = "PASS" if actual == expected else "FAIL"
     print(f"Test {test_id}: Expected={expected}, Actual={actual}, Message='{message_text}', Status={status}")
+    if actual == "success":
+        identities.record(email, test_id)
 
-    # Save result to list (use modified email)
-    test_results.append({
+    # Reload page to clear state for next test case
+    driver.get(register_url)
+    time.sleep(1)
+
+    # Return result record (use modified email)
+    return {
         'Test_ID': test_id,
         'Firstname': firstname,
         'Lastname': lastname,
-        'Email': email,  # This is the modified email with random suffix
+        'Email': email,  # This is the modified email with unique suffix
         'Original_Email': original_email,  # Original email from CSV
         'Telephone': telephone,
         'Expected': expected,
@@ -238,25 +249,140 @@ for idx, row in data.iterrows():
         'Message': message_text,
         'Status': status,
         'Verify_Message': verify_message
-    })
-    
-    # Reload page to clear state for next test case
-    driver.get(register_url)
-    time.sleep(1)
+    }
+
+
+def parse_args(argv=None):
+    """Parse command line options for the suite"""
+    parser = argparse.ArgumentParser(description="Register Test Suite - Level 1")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of browser workers running rows in parallel (default: 1)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run Chrome headless (always on when --workers > 1)")
+    parser.add_argument("--data",
+                        help="Data CSV to run, e.g. from generate_data.py (default: data_register.csv)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep finished rows from the result file and run only the rest")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse cached results of unchanged rows that passed, run the rest")
+    parser.add_argument("--order", choices=["csv", "history"], default="csv",
+                        help="csv: data file order; history: likely failures first, "
+                             "ranked by past failures, edited rows and duration (default: csv)")
+    parser.add_argument("--fail-fast", type=int, default=0, metavar="K",
+                        help="Stop starting new rows after K failures (default: off)")
+    parser.add_argument("--no-artifacts", action="store_true",
+                        help="Do not save screenshot, page source and console log of failing rows")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes, each with its own browser, fed rows by a "
+                             "work-stealing coordinator (default: 1, rows run in this process)")
+    parser.add_argument("--listen", metavar="HOST:PORT",
+                        help="Also let shard_worker.py processes on other machines join on this address")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    headless = args.headless or args.workers > 1 or args.processes > 1
+
+    data = pd.read_csv(args.data or csv_path)
+    test_ids = list(data['test_id'])
+    row_id = lambda idx, row: row['test_id']
+
+    # Outcome and duration of every row, kept across runs to schedule risky rows first
+    history = RowHistory(history_file)
+    if args.order == "history" and not history.entries:
+        history.import_results(output_file)
+
+    # Finished rows are appended to the result file as they complete
+    writer = ResultWriter(output_file, RESULT_COLUMNS, resume=args.resume)
+    done = writer.completed_ids()
+    if done:
+        print(f"Resuming: skipping {len(done)} finished rows")
+        data = data[[str(test_id) not in done for test_id in test_ids]]
+
+    # Results are cached by a hash of the row and this script (locators are hard-coded here)
+    result_cache = ResultCache(cache_file, fingerprint_files(os.path.abspath(__file__), context={"app_url": register_url}))
+    cached_results = []
+    if args.incremental:
+        data, cached_results = result_cache.split(data, row_id)
+        for record in cached_results:
+            writer.write(record)
+
+    if args.order == "history":
+        data = order_by_risk(data, history, row_id)
+
+    # Every row run below is appended to the results history
+    recorder = ResultsStore(results_db).start_run("register/level1", sys.argv[1:] if argv is None else argv)
+
+    # Screenshot, page source and console log of failing rows, written off the row loop
+    artifacts = None
+    run_row = run_test_case
+    if not args.no_artifacts:
+        artifacts = ArtifactWriter(new_run_dir(artifacts_dir), base_dir=os.path.dirname(output_file))
+        run_row = artifacts.wrap(run_test_case, row_id)
+
+    print("Starting Register Test Suite...")
+    if args.processes > 1 or args.listen:
+        # ==== Main test loop: worker processes, one browser each ====
+        print(f"Running {len(data)} rows on {args.processes} worker processes")
+        fresh_results = run_rows_sharded(
+            data,
+            shard_job("register/level1", artifacts=artifacts, headless=headless),
+            row_id,
+            processes=args.processes,
+            listen=args.listen,
+            on_row=bookkeeping(row_id, result_cache, history, recorder),
+            on_result=writer.write,
+            max_failures=args.fail_fast,
+        )
+    else:
+        if args.workers > 1:
+            print(f"Running {len(data)} rows on {args.workers} headless workers")
+
+        # Warm sessions are shared with other suites run from the same process
+        driver_pool = get_shared_pool(
+            driver_pool_name(headless),
+            lambda: create_driver(headless=headless),
+            size=args.workers,
+        )
+
+        # ==== Main test loop ====
+        fresh_results = run_rows(
+            data,
+            recorder.wrap(history.wrap(result_cache.wrap(run_row), row_id), row_id),
+            driver_pool=driver_pool,
+            workers=args.workers,
+            on_result=writer.write,
+            max_failures=args.fail_fast,
+        )
+
+    # ==== Save results to file ====
+    # Rewrite the streamed file in data order, including resumed rows
+    test_results = writer.finalize(order=test_ids)
+    result_cache.save()
+    history.save()
+    recorder.finish()
+    if artifacts is not None:
+        artifacts.close()
+    print(f"\nTest results saved to: {output_file}")
+
+    # Print summary
+    total_tests = len(test_results)
+    passed_tests = len([r for r in test_results if r['Status'] == 'PASS'])
+    failed_tests = total_tests - passed_tests
+    print(f"\n=== Test Summary ===")
+    print(f"Total Tests: {total_tests}")
+    print(f"Passed: {passed_tests}")
+    print(f"Failed: {failed_tests}")
+    print(f"Pass Rate: {(passed_tests/total_tests*100):.2f}%")
+    if total_tests < len(test_ids):
+        print(f"Not run: {len(test_ids) - total_tests} (stopped by --fail-fast, finish with --resume)")
+    if artifacts is not None:
+        artifacts.print_summary()
+
+    if args.incremental:
+        print_cache_report(cached_results, fresh_results)
+
 
-# ==== Save results to file ====
-results_df = pd.DataFrame(test_results)
-results_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-print(f"\nTest results saved to: {output_file}")
-
-# Print summary
-total_tests = len(test_results)
-passed_tests = len([r for r in test_results if r['Status'] == 'PASS'])
-failed_tests = total_tests - passed_tests
-print(f"\n=== Test Summary ===")
-print(f"Total Tests: {total_tests}")
-print(f"Passed: {passed_tests}")
-print(f"Failed: {failed_tests}")
-print(f"Pass Rate: {(passed_tests/total_tests*100):.2f}%")
-
-driver.quit()
+if __name__ == "__main__":
+    main()
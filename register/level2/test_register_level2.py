@@ -2,139 +2,131 @@
 Level 2: Data-driven testing for Register functionality
 All URLs and element locators are read from config_register.csv
 """
-import time
 import os
 import sys
-import random
-import string
+import argparse
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
 
 # Add common directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
 common_dir = os.path.join(os.path.dirname(os.path.dirname(script_dir)), 'common')
 sys.path.insert(0, common_dir)
 
-from config_manager import ConfigManager
-from element_helper import find_element_by_config, click_element, input_text, get_text
-
-
-# ==== Load data and config ====
+from page_objects import load_page, check_page_usage
+from element_helper import (
+    probe_elements,
+    fill_form,
+    click_element,
+    click_and_wait_for_outcome,
+    input_text,
+    wait_for_page_settled,
+    navigate,
+)
+from driver_factory import create_driver, driver_pool_name
+from driver_pool import get_shared_pool
+from parallel_runner import run_rows
+from sharded_runner import shard_job, run_rows_sharded, bookkeeping
+from http_tier import HttpSession, probe_html
+from result_writer import ResultWriter
+from metrics import enable_metrics
+from adaptive_waits import enable_adaptive_waits
+from identity_allocator import IdentityAllocator
+from result_cache import ResultCache, fingerprint_files, print_cache_report
+from scheduler import RowHistory, order_by_risk
+from results_store import ResultsStore
+from failure_artifacts import ArtifactWriter, new_run_dir
+
+
+# ==== Load config ====
 script_dir = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.join(script_dir, "data_register.csv")
 config_path = os.path.join(script_dir, "config_register.csv")
 
-data = pd.read_csv(csv_path)
-config_manager = ConfigManager(config_path)
+# Page object compiled from the config (rebuilt only when the CSV changes); misspelt
+# element and URL names in this script fail here, before any browser starts
+config_manager = load_page(config_path)
+check_page_usage(__file__, config_manager)
+
+# Browser settings and blocked URL patterns from the config's profile section
+driver_profile = config_manager.get_profile()
+
+# Elements that decide a row's outcome, read together in one probe after submit
+outcome_locators = [config_manager.success_h1, config_manager.warning_alert, config_manager.field_error_div]
 
 # ==== Setup output file ====
 output_file = os.path.join(script_dir, "test_result_register.csv")
-test_results = []
+cache_file = os.path.join(script_dir, "result_cache_register.json")
+history_file = os.path.join(script_dir, "run_history_register.json")
+# One sub-directory of failure archives per run
+artifacts_dir = os.path.join(script_dir, "artifacts")
+# Shared by all suites, see results_report.py
+results_db = os.path.join(os.path.dirname(common_dir), "results_history.db")
+metrics_file = os.path.join(script_dir, "metrics_register.json")
+wait_profile_file = os.path.join(script_dir, "wait_profile_register.json")
+identities_file = os.path.join(script_dir, "registered_identities.jsonl")
 
-# ==== Setup driver ====
-driver = webdriver.Chrome()
-driver.maximize_window()
+# Column order of the result file
+RESULT_COLUMNS = [
+    "Test_ID", "Firstname", "Lastname", "Email", "Original_Email", "Telephone", "Expected",
+    "Actual", "Message", "Status", "Verify_Message", "Artifacts"
+]
 
 
-def generate_random_suffix(length: int = 10) -> str:
-    """Generate random alphanumeric suffix"""
-    characters = string.ascii_letters + string.digits
-    return ''.join(random.choice(characters) for _ in range(length))
+# Unique e-mail suffixes per row and a ledger of the addresses that were registered
+identities = IdentityAllocator(identities_file, config_manager.register_url)
 
 
-def add_random_suffix_to_email(email: str) -> str:
-    """Add random suffix to email to ensure uniqueness"""
-    if not email or pd.isna(email) or str(email).strip() == '':
-        return email
+def safe_input_by_config(driver, element_name: str, value: str, timeout: int = 10):
+    """Fill input field using config only when value exists"""
+    if not value:
+        return
+    input_text(driver, config_manager, element_name, value, timeout=timeout)
 
-    email = str(email).strip()
-    if '@' in email:
-        local_part, domain = email.rsplit('@', 1)
-        random_suffix = generate_random_suffix(10)
-        return f"{local_part}{random_suffix}@{domain}"
 
-    random_suffix = generate_random_suffix(10)
-    return f"{email}{random_suffix}"
+def wants_typing(row) -> bool:
+    """Rows with a truthy 'typing' column enter text key by key instead of in bulk"""
+    value = row.get("typing", "")
+    return pd.notna(value) and str(value).strip().lower() in ("yes", "true", "1")
 
 
-def safe_input_by_config(element_name: str, value: str, timeout: int = 10):
-    """Fill input field using config only when value exists"""
-    if not value:
-        return
-    elem = find_element_by_config(driver, config_manager, element_name, timeout=timeout)
-    elem.clear()
-    elem.send_keys(str(value))
-    time.sleep(0.3)
+def classify_registration(probe):
+    """Classify a probed result page into actual status + message (browser or HTTP tier)"""
+    current_url = probe.url
+    success_url = config_manager.success_url
 
+    # Check if redirected to success page
+    if success_url and success_url in current_url:
+        headings = probe.texts.get("success_h1", [])
+        if headings:
+            return "success", headings[0]
+        return "success", "Redirected to success page"
 
-def verify_registration_result(expected: str, verify_message: str):
-    """Verify form submission outcome and return actual status + message"""
-    time.sleep(1)
-    actual = "unknown"
-    message_text = ""
+    # Still on register page - check for warning alert first
+    alerts = probe.texts.get("warning_alert", [])
+    if alerts:
+        return "failure", alerts[0]
 
-    try:
-        current_url = driver.current_url
-        success_url = config_manager.get_url("success_url")
+    # Field-level error messages
+    error_texts = probe.texts.get("field_error_div", [])
+    if error_texts:
+        error_messages = [text for text in error_texts if text]
+        if error_messages:
+            return "failure", "; ".join(error_messages)
+        return "failure", "Form validation failed (no specific message)"
 
-        # Check if redirected to success page
-        if success_url and success_url in current_url:
-            try:
-                message_text = get_text(driver, config_manager, "success_h1", timeout=5)
-                actual = "success"
-            except Exception:
-                actual = "success"
-                message_text = "Redirected to success page"
-        else:
-            # Still on register page - check for warning alert first
-            try:
-                warning_text = get_text(driver, config_manager, "warning_alert", timeout=2)
-                message_text = warning_text
-                actual = "failure"
-            except Exception:
-                # Check for field-level error messages
-                try:
-                    field_error_cfg = config_manager.get_element_config("field_error_div")
-                    if field_error_cfg:
-                        locator_type = field_error_cfg["locator_type"]
-                        locator_value = field_error_cfg["locator_value"]
-
-                        by_map = {
-                            'xpath': By.XPATH,
-                            'id': By.ID,
-                            'css': By.CSS_SELECTOR,
-                            'name': By.NAME,
-                            'class_name': By.CLASS_NAME,
-                            'tag_name': By.TAG_NAME,
-                            'link_text': By.LINK_TEXT,
-                            'partial_link_text': By.PARTIAL_LINK_TEXT,
-                        }
-                        by = by_map.get(locator_type.lower(), By.CSS_SELECTOR)
-                        error_elements = driver.find_elements(by, locator_value)
-                    else:
-                        error_elements = []
-
-                    if error_elements:
-                        error_messages = [elem.text.strip() for elem in error_elements if elem.text.strip()]
-                        if error_messages:
-                            message_text = "; ".join(error_messages)
-                            actual = "failure"
-                        else:
-                            actual = "failure"
-                            message_text = "Form validation failed (no specific message)"
-                    else:
-                        # No error elements found - might be success but not redirected
-                        register_url = config_manager.get_url("register_url")
-                        if register_url and register_url in current_url:
-                            actual = "failure"
-                            message_text = "Still on register page - registration failed"
-                        else:
-                            actual = "unknown"
-                            message_text = "Unexpected page state"
-                except Exception as inner_e:
-                    actual = "failure"
-                    message_text = f"Error checking validation messages: {str(inner_e)}"
+    # No error elements found - might be success but not redirected
+    register_url = config_manager.register_url
+    if register_url and register_url in current_url:
+        return "failure", "Still on register page - registration failed"
+    return "unknown", "Unexpected page state"
+
+
+def verify_registration_result(driver, expected: str, verify_message: str):
+    """Verify form submission outcome and return actual status + message"""
+    try:
+        # One round trip: URL plus heading, alert and field-error texts
+        probe = probe_elements(driver, outcome_locators)
+        actual, message_text = classify_registration(probe)
     except Exception as e:
         actual = "error"
         message_text = f"Error verifying result: {str(e)}"
@@ -149,138 +141,386 @@ def verify_registration_result(expected: str, verify_message: str):
     return actual, message_text
 
 
-print("Starting Register Test Suite - Level 2...")
-
-# ==== Main test loop ====
-for idx, row in data.iterrows():
-    test_id = row["test_id"]
-    firstname = row["firstname"] if pd.notna(row["firstname"]) else ""
-    lastname = row["lastname"] if pd.notna(row["lastname"]) else ""
-    email = row["email"] if pd.notna(row["email"]) else ""
-    telephone = row["telephone"] if pd.notna(row["telephone"]) else ""
-    password = row["password"] if pd.notna(row["password"]) else ""
-    confirm = row["confirm"] if pd.notna(row["confirm"]) else ""
-    newsletter = row["newsletter"] if pd.notna(row["newsletter"]) else "No"
-    privacy = row["privacy"] if pd.notna(row["privacy"]) else False
+def read_case(idx, row):
+    """Normalize one register data row and make its email unique"""
     expected = row["expected"] if pd.notna(row["expected"]) else "failure"
     verify_message = row["verify_message"] if pd.notna(row["verify_message"]) else ""
-
-    # Add random suffix to email to ensure uniqueness
-    # BUT: Don't modify email for test cases that specifically test "email already registered"
-    original_email = email
-    if not (expected == "failure" and verify_message and "already registered" in str(verify_message).lower()):
-        email = add_random_suffix_to_email(email)
-
-    print(f"\n--- Test Case {idx + 1}: {test_id} ---")
-    if original_email != email:
-        print(f"Email modified: {original_email} -> {email}")
-    elif original_email:
-        print(f"Email kept: {original_email}")
+    case = {
+        "test_id": row["test_id"],
+        "firstname": row["firstname"] if pd.notna(row["firstname"]) else "",
+        "lastname": row["lastname"] if pd.notna(row["lastname"]) else "",
+        "email": row["email"] if pd.notna(row["email"]) else "",
+        "telephone": row["telephone"] if pd.notna(row["telephone"]) else "",
+        "password": row["password"] if pd.notna(row["password"]) else "",
+        "confirm": row["confirm"] if pd.notna(row["confirm"]) else "",
+        "newsletter": row["newsletter"] if pd.notna(row["newsletter"]) else "No",
+        "privacy": row["privacy"] if pd.notna(row["privacy"]) else False,
+        "expected": expected,
+        "verify_message": verify_message,
+    }
+
+    # Give every row its own address
+    # BUT: test cases for "email already registered" reuse an address known to exist
+    case["original_email"] = case["email"]
+    if expected == "failure" and verify_message and "already registered" in str(verify_message).lower():
+        case["email"] = identities.registered_email(default=case["email"])
+    else:
+        case["email"] = identities.unique_email(case["email"])
+
+    print(f"\n--- Test Case {idx + 1}: {case['test_id']} ---")
+    if case["original_email"] != case["email"]:
+        print(f"Email modified: {case['original_email']} -> {case['email']}")
+    elif case["original_email"]:
+        print(f"Email kept: {case['original_email']}")
+    return case
+
+
+def form_values(case):
+    """Map the text fields of a case to their config element names"""
+    return {
+        "firstname_input": case["firstname"],
+        "lastname_input": case["lastname"],
+        "email_input": case["email"],
+        "telephone_input": case["telephone"],
+        "password_input": case["password"],
+        "confirm_input": case["confirm"],
+    }
+
+
+def build_record(case, actual, message_text):
+    """Compare actual vs expected, log it and build the result record"""
+    status = "PASS" if actual == case["expected"] else "FAIL"
+    print(f"Test {case['test_id']}: Expected={case['expected']}, Actual={actual}, "
+          f"Message='{message_text}', Status={status}")
+    if actual == "success":
+        identities.record(case["email"], case["test_id"])
+    return {
+        "Test_ID": case["test_id"],
+        "Firstname": case["firstname"],
+        "Lastname": case["lastname"],
+        "Email": case["email"],  # Modified email (if changed)
+        "Original_Email": case["original_email"],
+        "Telephone": case["telephone"],
+        "Expected": case["expected"],
+        "Actual": actual,
+        "Message": message_text,
+        "Status": status,
+        "Verify_Message": case["verify_message"],
+    }
+
+
+def run_test_case(driver, idx, row):
+    """Run one register data row in the browser and return its result record"""
+    case = read_case(idx, row)
 
     # Step 0: Always try to logout to ensure clean state
     try:
-        logout_url = config_manager.get_url("logout_url")
+        logout_url = config_manager.logout_url
         if logout_url:
-            driver.get(logout_url)
-            time.sleep(1)
+            navigate(driver, logout_url)
     except Exception:
         pass
 
     # Step 1: Open register page
-    register_url = config_manager.get_url("register_url")
-    driver.get(register_url)
-    time.sleep(2)
+    register_url = config_manager.register_url
+    navigate(driver, register_url)
 
     # Step 2: Fill form fields
     try:
-        safe_input_by_config("firstname_input", firstname)
-        safe_input_by_config("lastname_input", lastname)
-        safe_input_by_config("email_input", email)
-        safe_input_by_config("telephone_input", telephone)
-        safe_input_by_config("password_input", password)
-        safe_input_by_config("confirm_input", confirm)
+        values = form_values(case)
+        if wants_typing(row):
+            for element_name, value in values.items():
+                safe_input_by_config(driver, element_name, value)
+        else:
+            # All fields in one script call
+            fill_form(driver, config_manager, values)
 
         # Newsletter subscription (Yes/No)
-        if newsletter == "Yes":
+        if case["newsletter"] == "Yes":
             try:
                 click_element(driver, config_manager, "newsletter_label", timeout=5)
             except Exception:
                 pass
 
         # Privacy Policy checkbox
-        if privacy:
+        if case["privacy"]:
             try:
                 click_element(driver, config_manager, "privacy_label", timeout=10)
             except Exception:
                 pass
 
-        # Step 3: Click Continue button
-        click_element(driver, config_manager, "continue_button", timeout=10)
-        time.sleep(2)
+        # Step 3: Click Continue button and wait for the result page or the errors
+        click_and_wait_for_outcome(driver, config_manager, "continue_button", outcome_locators, timeout=10)
+        wait_for_page_settled(driver)
 
     except Exception as e:
         print(f"Error filling form: {e}")
         actual = "error"
         message_text = f"Error: {str(e)}"
         status = "FAIL"
-        test_results.append(
-            {
-                "Test_ID": test_id,
-                "Firstname": firstname,
-                "Lastname": lastname,
-                "Email": email,
-                "Expected": expected,
-                "Actual": actual,
-                "Message": message_text,
-                "Status": status,
-            }
-        )
-        continue
-
-    # Step 4: Verify result (reuse Level 1 logic)
-    actual, message_text = verify_registration_result(expected, verify_message)
-
-    # Compare actual vs expected
-    status = "PASS" if actual == expected else "FAIL"
-    print(f"Test {test_id}: Expected={expected}, Actual={actual}, Message='{message_text}', Status={status}")
-
-    # Save result to list
-    test_results.append(
-        {
-            "Test_ID": test_id,
-            "Firstname": firstname,
-            "Lastname": lastname,
-            "Email": email,  # Modified email (if changed)
-            "Original_Email": original_email,
-            "Telephone": telephone,
-            "Expected": expected,
+        return {
+            "Test_ID": case["test_id"],
+            "Firstname": case["firstname"],
+            "Lastname": case["lastname"],
+            "Email": case["email"],
+            "Expected": case["expected"],
             "Actual": actual,
             "Message": message_text,
             "Status": status,
-            "Verify_Message": verify_message,
         }
-    )
+
+    # Step 4: Verify result (reuse Level 1 logic)
+    actual, message_text = verify_registration_result(driver, case["expected"], case["verify_message"])
+    record = build_record(case, actual, message_text)
 
     # Reload page to clear state for next test case
-    driver.get(register_url)
-    time.sleep(1)
+    navigate(driver, register_url)
 
+    return record
 
-# ==== Save results to file ====
-results_df = pd.DataFrame(test_results)
-results_df.to_csv(output_file, index=False, encoding="utf-8-sig")
-print(f"\nTest results saved to: {output_file}")
 
-# Print summary
-total_tests = len(test_results)
-passed_tests = len([r for r in test_results if r["Status"] == "PASS"])
-failed_tests = total_tests - passed_tests
-print("\n=== Test Summary ===")
-print(f"Total Tests: {total_tests}")
-print(f"Passed: {passed_tests}")
-print(f"Failed: {failed_tests}")
-print(f"Pass Rate: {(passed_tests / total_tests * 100):.2f}%")
+def run_http_test_case(session, idx, row):
+    """Run one register data row as a direct form POST and return its result record"""
+    case = read_case(idx, row)
 
-driver.quit()
+    try:
+        # Step 0: Log out, as the browser tier does
+        logout_url = config_manager.logout_url
+        if logout_url:
+            session.get(logout_url)
+
+        # Step 1: Load the register form and fill it like the browser would
+        page_url, html = session.get(config_manager.register_url)
+        form = session.read_form(page_url, html, config_manager.continue_button)
+        for element_name, value in form_values(case).items():
+            if value:
+                form.set(config_manager.get_locator(element_name), value)
+        if case["newsletter"] == "Yes":
+            form.check(config_manager.newsletter_label)
+        if case["privacy"]:
+            form.check(config_manager.privacy_label)
+
+        # Step 2: Submit and classify the response with the same locators
+        result_url, result_html = session.submit(form)
+        actual, message_text = classify_registration(probe_html(result_html, result_url, outcome_locators))
+    except Exception as e:
+        print(f"Error submitting form over HTTP: {e}")
+        actual = "error"
+        message_text = f"Error: {str(e)}"
 
+    return build_record(case, actual, message_text)
+
+
+def needs_ui(row) -> bool:
+    """Rows marked with a truthy 'needs_ui' column, or typing rows, must run in the browser"""
+    value = row.get("needs_ui", "")
+    marked = pd.notna(value) and str(value).strip().lower() in ("yes", "true", "1")
+    return marked or wants_typing(row)
+
+
+def parse_args(argv=None):
+    """Parse command line options for the suite"""
+    parser = argparse.ArgumentParser(description="Register Test Suite - Level 2")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of browser workers running rows in parallel (default: 1)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run Chrome headless (always on when --workers > 1; the config's headless profile setting wins)")
+    parser.add_argument("--data",
+                        help="Data CSV to run, e.g. from generate_data.py (default: data_register.csv)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep finished rows from the result file and run only the rest")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse cached results of unchanged rows that passed, run the rest")
+    parser.add_argument("--order", choices=["csv", "history"], default="csv",
+                        help="csv: data file order; history: likely failures first, "
+                             "ranked by past failures, edited rows and duration (default: csv)")
+    parser.add_argument("--fail-fast", type=int, default=0, metavar="K",
+                        help="Stop starting new rows after K failures (default: off)")
+    parser.add_argument("--no-artifacts", action="store_true",
+                        help="Do not save screenshot, page source and console log of failing rows")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes, each with its own browser, fed rows by a "
+                             "work-stealing coordinator (default: 1, rows run in this process)")
+    parser.add_argument("--listen", metavar="HOST:PORT",
+                        help="Also let shard_worker.py processes on other machines join on this address")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record per-element timings and export p50/p95/max to metrics_*.json")
+    parser.add_argument("--adaptive-waits", action="store_true",
+                        help="Learn per-element timeouts and poll intervals from past waits "
+                             "(kept in wait_profile_*.json)")
+    parser.add_argument("--tier", choices=["ui", "http", "auto"], default="ui",
+                        help="ui: every row in the browser; http: every row as a form POST; "
+                             "auto: only needs_ui/typing rows in the browser (default: ui)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    headless = args.headless or args.workers > 1 or args.processes > 1
+    if driver_profile.headless is not None:
+        headless = driver_profile.headless
+    metrics = enable_metrics() if args.metrics else None
+    waits = enable_adaptive_waits(wait_profile_file) if args.adaptive_waits else None
+
+    data = pd.read_csv(args.data or csv_path)
+    test_ids = list(data["test_id"])
+    row_id = lambda idx, row: row["test_id"]
+
+    # Outcome and duration of every row, kept across runs to schedule risky rows first
+    history = RowHistory(history_file)
+    if args.order == "history" and not history.entries:
+        history.import_results(output_file)
+
+    # Finished rows are appended to the result file as they complete
+    writer = ResultWriter(output_file, RESULT_COLUMNS, resume=args.resume)
+    done = writer.completed_ids()
+    if done:
+        print(f"Resuming: skipping {len(done)} finished rows")
+        data = data[[str(test_id) not in done for test_id in test_ids]]
+
+    # Results are cached by a hash of the row, its config and this script
+    result_cache = ResultCache(cache_file, fingerprint_files(
+        config_path, os.path.abspath(__file__),
+        context={"app_url": config_manager.register_url, "tier": args.tier}
+    ))
+    cached_results = []
+    if args.incremental:
+        data, cached_results = result_cache.split(data, row_id)
+        for record in cached_results:
+            writer.write(record)
+
+    if args.order == "history":
+        data = order_by_risk(data, history, row_id)
+
+    # Every row run below is appended to the results history
+    recorder = ResultsStore(results_db).start_run("register/level2", sys.argv[1:] if argv is None else argv)
+
+    # Screenshot, page source and console log of failing rows, written off the row loop
+    artifacts = None
+    run_row = run_test_case
+    if not args.no_artifacts:
+        artifacts = ArtifactWriter(new_run_dir(artifacts_dir), base_dir=os.path.dirname(output_file))
+        run_row = artifacts.wrap(run_test_case, row_id)
+
+    print("Starting Register Test Suite - Level 2...")
+
+    # Rows that only exercise server-side validation can skip the browser
+    if args.tier == "ui":
+        http_data = data.iloc[0:0]
+    elif args.tier == "http":
+        http_data = data
+    else:
+        http_data = data[[not needs_ui(row) for _, row in data.iterrows()]]
+    data = data.drop(http_data.index)
+
+    # With --processes/--listen both tiers run in worker processes fed by a coordinator
+    sharded = args.processes > 1 or bool(args.listen)
+    record_row = bookkeeping(row_id, result_cache, history, recorder)
+
+    fresh_results = []
+    if len(http_data):
+        print(f"Running {len(http_data)} rows over HTTP")
+        if sharded:
+            fresh_results += run_rows_sharded(
+                http_data,
+                shard_job("register/level2", "run_http_test_case", driver="http",
+                          metrics=args.metrics, waits=waits),
+                row_id,
+                processes=args.processes,
+                listen=args.listen,
+                on_row=record_row,
+                on_result=writer.write,
+                max_failures=args.fail_fast,
+            )
+        else:
+            # ==== HTTP tier: one pooled HTTP session per worker ====
+            fresh_results += run_rows(
+                http_data,
+                recorder.wrap(history.wrap(result_cache.wrap(run_http_test_case), row_id), row_id),
+                driver_factory=HttpSession,
+                workers=args.workers,
+                on_result=writer.write,
+                max_failures=args.fail_fast,
+            )
+
+    # Failures of the HTTP tier count towards the --fail-fast budget
+    remaining_failures = args.fail_fast - len([r for r in fresh_results if r["Status"] != "PASS"])
+    if args.fail_fast and remaining_failures <= 0:
+        data = data.iloc[0:0]
+
+    if len(data) and sharded:
+        # ==== Main test loop: worker processes, one browser each ====
+        print(f"Running {len(data)} rows on {args.processes} worker processes")
+        fresh_results += run_rows_sharded(
+            data,
+            shard_job("register/level2", artifacts=artifacts, headless=headless,
+                      metrics=args.metrics, waits=waits),
+            row_id,
+            processes=args.processes,
+            listen=args.listen,
+            on_row=record_row,
+            on_result=writer.write,
+            max_failures=max(remaining_failures, 0),
+        )
+    elif len(data):
+        if args.workers > 1:
+            print(f"Running {len(data)} rows on {args.workers} {'headless ' if headless else ''}workers")
+
+        # Warm sessions are shared with other suites run from the same process
+        driver_pool = get_shared_pool(
+            driver_pool_name(headless, driver_profile),
+            lambda: create_driver(headless=headless, profile=driver_profile),
+            size=args.workers,
+        )
+
+        # ==== Main test loop ====
+        fresh_results += run_rows(
+            data,
+            recorder.wrap(history.wrap(result_cache.wrap(run_row), row_id), row_id),
+            driver_pool=driver_pool,
+            workers=args.workers,
+            on_result=writer.write,
+            max_failures=max(remaining_failures, 0),
+        )
 
+    # ==== Save results to file ====
+    # Rewrite the streamed file in data order, including resumed rows
+    test_results = writer.finalize(order=test_ids)
+    result_cache.save()
+    history.save()
+    recorder.finish()
+    if artifacts is not None:
+        artifacts.close()
+    if waits is not None:
+        waits.save()
+    print(f"\nTest results saved to: {output_file}")
+
+    # Print summary
+    total_tests = len(test_results)
+    passed_tests = len([r for r in test_results if r["Status"] == "PASS"])
+    failed_tests = total_tests - passed_tests
+    print("\n=== Test Summary ===")
+    print(f"Total Tests: {total_tests}")
+    print(f"Passed: {passed_tests}")
+    print(f"Failed: {failed_tests}")
+    print(f"Pass Rate: {(passed_tests / total_tests * 100):.2f}%")
+    if total_tests < len(test_ids):
+        print(f"Not run: {len(test_ids) - total_tests} (stopped by --fail-fast, finish with --resume)")
+    if artifacts is not None:
+        artifacts.print_summary()
+
+    if args.incremental:
+        print_cache_report(cached_results, fresh_results)
+
+    if metrics is not None:
+        metrics.print_summary()
+        metrics.export(metrics_file, suite="register/level2")
+        print(f"\nMetrics saved to: {metrics_file}")
+
+    if waits is not None:
+        waits.print_summary()
+        print(f"\nWait profile saved to: {wait_profile_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Report flaky tests, slowdowns and current failures from the results history
+Usage: python results_report.py [--suite register/level2] [--days N] [--top N] [--db PATH]
+"""
+import os
+import sys
+import time
+import argparse
+
+# Add common directory to path (same module names the suites import)
+root_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(root_dir, 'common'))
+
+from results_store import ResultsStore, flake_stats, duration_trends, first_failing_runs
+
+RESULTS_DB = os.path.join(root_dir, "results_history.db")
+
+
+def format_time(epoch):
+    """Local time of an epoch timestamp"""
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(epoch))
+
+
+def print_table(title, frame):
+    """Print a DataFrame under a section title, or a note when it is empty"""
+    print(f"\n=== {title} ===")
+    if frame.empty:
+        print("(none)")
+    else:
+        print(frame.to_string(index=False))
+
+
+def parse_args(argv=None):
+    """Parse command line options for the report"""
+    parser = argparse.ArgumentParser(description="Report on the results history of the suites")
+    parser.add_argument("--suite", help="Only this suite, e.g. register/level2 (default: all)")
+    parser.add_argument("--days", type=float, default=None,
+                        help="Only results from the last N days (default: all history)")
+    parser.add_argument("--top", type=int, default=10, help="Rows per section (default: 10)")
+    parser.add_argument("--min-runs", type=int, default=3,
+                        help="Runs a test needs before it is ranked for flakiness or trends (default: 3)")
+    parser.add_argument("--db", default=RESULTS_DB, help="Results database (default: results_history.db)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"No results history at {args.db}; run a suite first")
+        return
+
+    store = ResultsStore(args.db)
+    start = time.perf_counter()
+    since = time.time() - args.days * 86400 if args.days else None
+    results = store.load(suite=args.suite, since=since)
+
+    runs = store.runs(suite=args.suite, limit=args.top)
+    runs['started'] = runs['started'].map(format_time)
+    print_table("Latest runs", runs)
+
+    flakes = flake_stats(results)
+    flakes = flakes[(flakes['runs'] >= args.min_runs) & (flakes['flips'] > 0)]
+    print_table("Flaky tests", flakes.sort_values(['flake_rate', 'runs'], ascending=False).head(args.top))
+
+    trends = duration_trends(results)
+    trends = trends[(trends['runs'] >= args.min_runs) & (trends['slope_s'] > 0)]
+    print_table("Slowing down", trends.sort_values('trend', ascending=False).head(args.top).round(3))
+
+    failing = first_failing_runs(results)
+    failing['failing_since'] = failing['failing_since'].map(format_time)
+    print_table("Currently failing", failing.sort_values('streak', ascending=False).head(args.top))
+
+    print(f"\nAnalyzed {len(results)} results in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
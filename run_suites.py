@@ -0,0 +1,79 @@
+"""
+Run several test suites in one process so they share warm browser sessions
+Usage: python run_suites.py [--suites register/level2 withdraw/level2] [--workers N] [--headless]
+"""
+import os
+import sys
+import argparse
+import importlib.util
+
+# Add common directory to path (same module names the suites import)
+root_dir = os.path.dirname(os.path.abspath(__file__))
+common_dir = os.path.join(root_dir, 'common')
+sys.path.insert(0, common_dir)
+
+from driver_factory import create_driver, driver_pool_name
+from driver_pool import get_shared_pool
+
+SUITES = {
+    'register/level1': 'register/level1/test_register_level1.py',
+    'register/level2': 'register/level2/test_register_level2.py',
+    'withdraw/level1': 'withdraw/level1/test_withdraw_level1.py',
+    'withdraw/level2': 'withdraw/level2/test_withdraw_level2.py',
+}
+
+
+def load_suite(name):
+    """Import a suite script as a module without running its main()"""
+    path = os.path.join(root_dir, SUITES[name])
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_args(argv=None):
+    """Parse command line options for the suite runner"""
+    parser = argparse.ArgumentParser(description="Run test suites on a shared warm driver pool")
+    parser.add_argument("--suites", nargs="+", choices=list(SUITES), default=list(SUITES),
+                        help="Suites to run, in order (default: all)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of browser workers per suite (default: 1)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run Chrome headless (always on when --workers > 1)")
+    parser.add_argument("--max-uses", type=int, default=50,
+                        help="Leases after which a browser session is replaced (default: 50)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    headless = args.headless or args.workers > 1
+
+    suites = [(name, load_suite(name)) for name in args.suites]
+
+    # Launch the sessions up front, one pool per browser profile; each suite's
+    # get_shared_pool call reuses the pool of its profile
+    for _, module in suites:
+        profile = getattr(module, 'driver_profile', None)
+        suite_headless = headless if profile is None or profile.headless is None else profile.headless
+        get_shared_pool(
+            driver_pool_name(suite_headless, profile),
+            lambda profile=profile, suite_headless=suite_headless: create_driver(
+                headless=suite_headless, profile=profile),
+            size=args.workers,
+            max_uses=args.max_uses,
+        )
+
+    suite_argv = ["--workers", str(args.workers)]
+    if headless:
+        suite_argv.append("--headless")
+
+    for name, module in suites:
+        print(f"\n===== {name} =====")
+        module.main(suite_argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Worker process of a sharded suite run: joins the coordinator and runs rows in its own browser
+Usage: SHARD_AUTHKEY=<key> python shard_worker.py --connect HOST:PORT [--name NAME]
+Started automatically by the suites' --processes; start it by hand on other machines for --listen
+"""
+import os
+import sys
+import socket
+import argparse
+
+# Add common directory to path (same module names the suites import)
+root_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(root_dir, 'common'))
+
+from sharded_runner import AUTHKEY_ENV, run_worker
+from run_suites import load_suite
+
+
+def parse_args(argv=None):
+    """Parse command line options for the worker"""
+    parser = argparse.ArgumentParser(description="Run rows of a sharded suite run")
+    parser.add_argument("--connect", required=True, metavar="HOST:PORT",
+                        help="Address the coordinator printed or was started with (--listen)")
+    parser.add_argument("--name", default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Worker name, unique per run (default: host-pid)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    authkey = os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        sys.exit(f"Set {AUTHKEY_ENV} to the coordinator's key")
+    host, _, port = args.connect.rpartition(':')
+    count = run_worker((host, int(port)), authkey.encode('utf-8'), args.name, load_suite)
+    print(f"Worker {args.name}: {count} rows run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Stand-in Server - Local copies of the register form and the banking demo
+Serves pages with the same IDs and XPaths as config_register.csv and config_withdraw.csv,
+so the suites can run offline and deterministically against http://127.0.0.1:<port>
+
+Usage: python standin/server.py [--port 8000]
+Then run a suite with TEST_BASE_URL=http://127.0.0.1:8000
+"""
+import os
+import re
+import html
+import secrets
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit, parse_qs
+
+standin_dir = os.path.dirname(os.path.abspath(__file__))
+
+BANK_PATH = '/angularJs-protractor/BankingProject/'
+
+# Addresses that already exist, used by the "already registered" rows
+PREREGISTERED_EMAILS = {'group7F3@gmail.com'}
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Field name, input id, label and validation message of the register form
+REGISTER_FIELDS = [
+    ('firstname', 'input-firstname', 'First Name', 'First Name must be between 1 and 32 characters!'),
+    ('lastname', 'input-lastname', 'Last Name', 'Last Name must be between 1 and 32 characters!'),
+    ('email', 'input-email', 'E-Mail', 'E-Mail Address does not appear to be valid!'),
+    ('telephone', 'input-telephone', 'Telephone', 'Telephone must be between 3 and 32 characters!'),
+]
+PASSWORD_FIELDS = [
+    ('password', 'input-password', 'Password', 'Password must be between 4 and 20 characters!'),
+    ('confirm', 'input-confirm', 'Password Confirm', 'Password confirmation does not match password!'),
+]
+
+
+class StandinState:
+    """Server-side state of the register app (registered e-mails and logged-in sessions)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.emails = {email.lower() for email in PREREGISTERED_EMAILS}
+        self.sessions = set()
+
+
+def validate_registration(form, state):
+    """
+    Validate a register form the way the live site does
+
+    Limits follow the behaviour observed on the live site, which accepts
+    passwords longer than the 20 characters its message mentions.
+
+    Args:
+        form: Dict of submitted field values
+        state: StandinState with the registered e-mails
+
+    Returns:
+        (warning, field_errors) where warning is the top alert text or ''
+        and field_errors maps field names to messages
+    """
+    errors = {}
+    messages = dict((name, message) for name, _, _, message in REGISTER_FIELDS + PASSWORD_FIELDS)
+
+    if not 1 <= len(form.get('firstname', '')) <= 32:
+        errors['firstname'] = messages['firstname']
+    if not 1 <= len(form.get('lastname', '')) <= 32:
+        errors['lastname'] = messages['lastname']
+    email = form.get('email', '')
+    if len(email) > 96 or not EMAIL_PATTERN.match(email):
+        errors['email'] = messages['email']
+    if not 3 <= len(form.get('telephone', '')) <= 32:
+        errors['telephone'] = messages['telephone']
+    password = form.get('password', '')
+    if len(password) < 4:
+        errors['password'] = messages['password']
+    if form.get('confirm', '') != password:
+        errors['confirm'] = messages['confirm']
+
+    warning = ''
+    with state.lock:
+        if email.lower() in state.emails:
+            warning = 'Warning: E-Mail Address is already registered!'
+    if not warning and form.get('agree') != '1':
+        warning = 'Warning: You must agree to the Privacy Policy!'
+    return warning, errors
+
+
+def render_register_page(form=None, warning='', errors=None):
+    """Render the register page, optionally with submitted values and errors"""
+    form = form or {}
+    errors = errors or {}
+
+    def group(name, input_id, label, input_type='text'):
+        value = html.escape(form.get(name, ''), quote=True)
+        error = f'<div class="text-danger">{html.escape(errors[name])}</div>' if name in errors else ''
+        return (
+            f'<div class="form-group row"><label class="col-sm-2" for="{input_id}">{label}</label>'
+            f'<div class="col-sm-10"><input type="{input_type}" name="{name}" value="{value}" '
+            f'placeholder="{label}" id="{input_id}" class="form-control">{error}</div></div>'
+        )
+
+    alert = f'<div class="alert alert-danger">{html.escape(warning)}</div>' if warning else ''
+    newsletter_yes = ' checked' if form.get('newsletter') == '1' else ''
+    newsletter_no = '' if newsletter_yes else ' checked'
+    agree = ' checked' if form.get('agree') == '1' else ''
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Register Account</title></head>
+<body>
+{alert}
+<div id="content">
+<h1>Register Account</h1>
+<form action="index.php?route=account/register" method="post">
+<fieldset id="account"><legend>Your Personal Details</legend>
+{''.join(group(name, input_id, label) for name, input_id, label, _ in REGISTER_FIELDS)}
+</fieldset>
+<fieldset><legend>Your Password</legend>
+{''.join(group(name, input_id, label, 'password') for name, input_id, label, _ in PASSWORD_FIELDS)}
+</fieldset>
+<fieldset><legend>Newsletter</legend>
+<div class="form-group row"><div class="col-sm-10">
+<div class="custom-radio"><input type="radio" name="newsletter" value="1" id="input-newsletter-yes"{newsletter_yes}><label for="input-newsletter-yes">Yes</label></div>
+<div class="custom-radio"><input type="radio" name="newsletter" value="0" id="input-newsletter-no"{newsletter_no}><label for="input-newsletter-no">No</label></div>
+</div></div>
+</fieldset>
+<div class="buttons clearfix"><div class="float-right">
+<div class="custom-checkbox"><input type="checkbox" name="agree" value="1" id="input-agree"{agree}><label for="input-agree">I have read and agree to the Privacy Policy</label></div>
+<input type="submit" value="Continue" class="btn btn-primary">
+</div></div>
+</form>
+</div>
+</body></html>"""
+
+
+def render_message_page(title, text):
+    """Render a simple page with a heading in div#content"""
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><div id="content"><h1>{html.escape(title)}</h1><p>{html.escape(text)}</p></div></body></html>"""
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Routes requests to the register app (index.php) or the banking app"""
+
+    state = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=None):
+        headers = dict(headers or {})
+        headers['Location'] = location
+        self._send(302, '', headers=headers)
+
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return cookie['OCSESSID'].value if 'OCSESSID' in cookie else None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.startswith(BANK_PATH.rstrip('/')):
+            with open(os.path.join(standin_dir, 'bank.html'), encoding='utf-8') as f:
+                self._send(200, f.read())
+            return
+        if url.path in ('/', '/index.php'):
+            route = parse_qs(url.query).get('route', ['common/home'])[0]
+            if route == 'account/register':
+                self._send(200, render_register_page())
+            elif route == 'account/success':
+                self._send(200, render_message_page(
+                    'Your Account Has Been Created!',
+                    'Congratulations! Your new account has been successfully created!'))
+            elif route == 'account/logout':
+                session = self._session()
+                with self.state.lock:
+                    self.state.sessions.discard(session)
+                self._send(200, render_message_page('Account Logout', 'You have been logged off your account.'),
+                           headers={'Set-Cookie': 'OCSESSID=; Path=/; Max-Age=0'})
+            else:
+                self._send(200, render_message_page('Your Store', 'Local stand-in store'))
+            return
+        self._send(404, render_message_page('Page Not Found', self.path))
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        route = parse_qs(url.query).get('route', [''])[0]
+        if url.path not in ('/', '/index.php') or route != 'account/register':
+            self._send(404, render_message_page('Page Not Found', self.path))
+            return
+
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        body = self.rfile.read(length).decode('utf-8')
+        form = {key: values[-1] for key, values in parse_qs(body, keep_blank_values=True).items()}
+
+        warning, errors = validate_registration(form, self.state)
+        if warning or errors:
+            self._send(200, render_register_page(form, warning, errors))
+            return
+
+        session = secrets.token_hex(16)
+        with self.state.lock:
+            self.state.emails.add(form['email'].lower())
+            self.state.sessions.add(session)
+        self._redirect('/index.php?route=account/success',
+                       headers={'Set-Cookie': f'OCSESSID={session}; Path=/'})
+
+
+def start_server(host='127.0.0.1', port=0):
+    """
+    Start the stand-in server in a background thread
+
+    Args:
+        host: Interface to bind (default: 127.0.0.1)
+        port: Port to bind; 0 picks a free port
+
+    Returns:
+        (server, base_url); call server.shutdown() to stop it
+    """
+    handler = type('Handler', (StandinHandler,), {'state': StandinState()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='standin-server', daemon=True)
+    thread.start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the register and banking apps")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    args = parser.parse_args(argv)
+
+    handler = type('Handler', (StandinHandler,), {'state': StandinState()})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    print(f"Stand-in server on http://{args.host}:{args.port}")
+    print(f"Run the suites with TEST_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
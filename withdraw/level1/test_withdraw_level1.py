@@ -1,63 +1,90 @@
 import time
 import os
+import sys
+import argparse
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 
+# Add common directory to path (driver setup and row runner only, locators stay hard-coded)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+common_dir = os.path.join(os.path.dirname(os.path.dirname(script_dir)), 'common')
+sys.path.insert(0, common_dir)
+
+from driver_factory import create_driver, driver_pool_name
+from driver_pool import get_shared_pool
+from parallel_runner import run_rows
+from sharded_runner import shard_job, run_rows_sharded, bookkeeping
+from config_manager import rebase_url
+from result_writer import ResultWriter
+from result_cache import ResultCache, fingerprint_files, print_cache_report
+from scheduler import RowHistory, order_by_risk
+from results_store import ResultsStore
+from failure_artifacts import ArtifactWriter, new_run_dir
+
 # ==== Load data ====
 # Get the directory where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.join(script_dir, "data_withdraw.csv")
-data = pd.read_csv(csv_path)
 
 # ==== Setup output file ====
 # Create output file with fixed name
 output_file = os.path.join(script_dir, "test_result_withdraw.csv")
+cache_file = os.path.join(script_dir, "result_cache_withdraw.json")
+history_file = os.path.join(script_dir, "run_history_withdraw.json")
+# One sub-directory of failure archives per run
+artifacts_dir = os.path.join(script_dir, "artifacts")
+# Shared by all suites, see results_report.py
+results_db = os.path.join(os.path.dirname(common_dir), "results_history.db")
 
-# Initialize results list
-test_results = []
+# Banking app URLs
+homepage_url = rebase_url("https://www.globalsqa.com/angularJs-protractor/BankingProject/")
+account_url = rebase_url("https://www.globalsqa.com/angularJs-protractor/BankingProject/#/account")
 
-# ==== Setup driver ====
-driver = webdriver.Chrome()
-driver.maximize_window()
+# Column order of the result file
+RESULT_COLUMNS = [
+    'Test_ID', 'Amount', 'Expected', 'Actual', 'Message', 'Status', 'Verify_Message', 'Artifacts'
+]
 
 # ==== Setup: Login as customer before testing ====
-# Step 1: Open homepage
-driver.get("https://www.globalsqa.com/angularJs-protractor/BankingProject/")
-time.sleep(2)
-
-# Step 2: Click Customer Login button
-customer_login_btn = WebDriverWait(driver, 10).until(
-    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Customer Login')]"))
-)
-customer_login_btn.click()
-time.sleep(1)
-
-# Step 3: Select customer from dropdown (select first customer by default)
-customer_dropdown = WebDriverWait(driver, 10).until(
-    EC.presence_of_element_located((By.ID, "userSelect"))
-)
-select = Select(customer_dropdown)
-select.select_by_index(1)  # Select first customer (index 1, skip "---Your Name---")
-time.sleep(1)
-
-# Step 4: Click Login button
-login_btn = WebDriverWait(driver, 10).until(
-    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Login')]"))
-)
-login_btn.click()
-time.sleep(2)
-
-# Now we are logged in and can access account page
-print("Setup completed: Customer logged in successfully")
+def login_customer(driver):
+    """Log in as the first customer so the account page is available"""
+    # Step 1: Open homepage
+    driver.get(homepage_url)
+    time.sleep(2)
+
+    # Step 2: Click Customer Login button
+    customer_login_btn = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Customer Login')]"))
+    )
+    customer_login_btn.click()
+    time.sleep(1)
+
+    # Step 3: Select customer from dropdown (select first customer by default)
+    customer_dropdown = WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.ID, "userSelect"))
+    )
+    select = Select(customer_dropdown)
+    select.select_by_index(1)  # Select first customer (index 1, skip "---Your Name---")
+    time.sleep(1)
+
+    # Step 4: Click Login button
+    login_btn = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Login')]"))
+    )
+    login_btn.click()
+    time.sleep(2)
+
+    # Now we are logged in and can access account page
+    print("Setup completed: Customer logged in successfully")
+
 
 # ==== Function to ensure balance is 5096 before each test ====
-def ensure_balance_is_5096():
+def ensure_balance_is_5096(driver):
     """Ensure account balance is exactly 5096 before each test case"""
     # Reload page to clear previous state
-    driver.get("https://www.globalsqa.com/angularJs-protractor/BankingProject/#/account")
+    driver.get(account_url)
     time.sleep(1)
     
     # Get current balance from the page
@@ -138,7 +165,7 @@ def ensure_balance_is_5096():
         time.sleep(1)
     
     # Reload page to clear transaction message and verify balance
-    driver.get("https://www.globalsqa.com/angularJs-protractor/BankingProject/#/account")
+    driver.get(account_url)
     time.sleep(1)
     
     # Verify balance is now 5096
@@ -154,17 +181,19 @@ def ensure_balance_is_5096():
     except:
         print("Warning: Could not verify final balance")
 
-for idx, row in data.iterrows():
+# ==== Test case ====
+def run_test_case(driver, idx, row):
+    """Run one withdraw data row and return its result record"""
     amount = row['amount']
     expected = row['expected']
     verify_message = row.get('verify_message', '')
 
     # Step 0: Ensure balance is 5096 and reload to clear previous state
     print(f"\n--- Test Case {idx+1} ---")
-    ensure_balance_is_5096()
+    ensure_balance_is_5096(driver)
     
     # Additional reload to ensure all previous messages are cleared
-    driver.get("https://www.globalsqa.com/angularJs-protractor/BankingProject/#/account")
+    driver.get(account_url)
     time.sleep(1)
     
     # Click on Deposit tab first, then switch to Withdrawl to clear any stale messages
@@ -258,9 +287,12 @@ for idx, row in data.iterrows():
     # Compare actual vs expected
     status = "PASS" if actual == expected else "FAIL"
     print(f"Test {idx+1}: Amount='{amount}', Expected={expected}, Actual={actual}, Message='{message_text}', Status={status}")
-    
-    # Save result to list
-    test_results.append({
+
+    # Reload page to reset status for next test case (clear previous transaction messages)
+    driver.get(account_url)
+    time.sleep(1)
+
+    return {
         'Test_ID': idx + 1,
         'Amount': amount,
         'Expected': expected,
@@ -268,25 +300,141 @@ for idx, row in data.iterrows():
         'Message': message_text,
         'Status': status,
         'Verify_Message': verify_message if pd.notna(verify_message) else ''
-    })
-    
-    # Reload page to reset status for next test case (clear previous transaction messages)
-    driver.get("https://www.globalsqa.com/angularJs-protractor/BankingProject/#/account")
-    time.sleep(1)
+    }
+
+
+def parse_args(argv=None):
+    """Parse command line options for the suite"""
+    parser = argparse.ArgumentParser(description="Withdraw Test Suite - Level 1")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of browser workers running rows in parallel (default: 1)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run Chrome headless (always on when --workers > 1)")
+    parser.add_argument("--data",
+                        help="Data CSV to run, e.g. from generate_data.py (default: data_withdraw.csv)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep finished rows from the result file and run only the rest")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse cached results of unchanged rows that passed, run the rest")
+    parser.add_argument("--order", choices=["csv", "history"], default="csv",
+                        help="csv: data file order; history: likely failures first, "
+                             "ranked by past failures, edited rows and duration (default: csv)")
+    parser.add_argument("--fail-fast", type=int, default=0, metavar="K",
+                        help="Stop starting new rows after K failures (default: off)")
+    parser.add_argument("--no-artifacts", action="store_true",
+                        help="Do not save screenshot, page source and console log of failing rows")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes, each with its own browser, fed rows by a "
+                             "work-stealing coordinator (default: 1, rows run in this process)")
+    parser.add_argument("--listen", metavar="HOST:PORT",
+                        help="Also let shard_worker.py processes on other machines join on this address")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    headless = args.headless or args.workers > 1 or args.processes > 1
+
+    data = pd.read_csv(args.data or csv_path)
+    test_ids = list(data.index + 1)
+    row_id = lambda idx, row: idx + 1
+
+    # Outcome and duration of every row, kept across runs to schedule risky rows first
+    history = RowHistory(history_file)
+    if args.order == "history" and not history.entries:
+        history.import_results(output_file)
+
+    # Finished rows are appended to the result file as they complete
+    writer = ResultWriter(output_file, RESULT_COLUMNS, resume=args.resume)
+    done = writer.completed_ids()
+    if done:
+        print(f"Resuming: skipping {len(done)} finished rows")
+        data = data[[str(test_id) not in done for test_id in test_ids]]
+
+    # Results are cached by a hash of the row and this script (locators are hard-coded here)
+    result_cache = ResultCache(cache_file, fingerprint_files(os.path.abspath(__file__), context={"app_url": homepage_url}))
+    cached_results = []
+    if args.incremental:
+        data, cached_results = result_cache.split(data, row_id)
+        for record in cached_results:
+            writer.write(record)
+
+    if args.order == "history":
+        data = order_by_risk(data, history, row_id)
+
+    # Every row run below is appended to the results history
+    recorder = ResultsStore(results_db).start_run("withdraw/level1", sys.argv[1:] if argv is None else argv)
+
+    # Screenshot, page source and console log of failing rows, written off the row loop
+    artifacts = None
+    run_row = run_test_case
+    if not args.no_artifacts:
+        artifacts = ArtifactWriter(new_run_dir(artifacts_dir), base_dir=os.path.dirname(output_file))
+        run_row = artifacts.wrap(run_test_case, row_id)
+    if args.processes > 1 or args.listen:
+        # ==== Main test loop: worker processes, one browser each ====
+        print(f"Running {len(data)} rows on {args.processes} worker processes")
+        fresh_results = run_rows_sharded(
+            data,
+            shard_job("withdraw/level1", setup="login_customer", artifacts=artifacts, headless=headless),
+            row_id,
+            processes=args.processes,
+            listen=args.listen,
+            on_row=bookkeeping(row_id, result_cache, history, recorder),
+            on_result=writer.write,
+            max_failures=args.fail_fast,
+        )
+    else:
+        if args.workers > 1:
+            print(f"Running {len(data)} rows on {args.workers} headless workers")
+
+        # Warm sessions are shared with other suites run from the same process
+        driver_pool = get_shared_pool(
+            driver_pool_name(headless),
+            lambda: create_driver(headless=headless),
+            size=args.workers,
+        )
+
+        # ==== Main test loop ====
+        # Each worker logs in once on its own session; the banking demo keeps
+        # its accounts per browser, so workers never share a balance
+        fresh_results = run_rows(
+            data,
+            recorder.wrap(history.wrap(result_cache.wrap(run_row), row_id), row_id),
+            driver_pool=driver_pool,
+            workers=args.workers,
+            setup_session=login_customer,
+            on_result=writer.write,
+            max_failures=args.fail_fast,
+        )
+
+    # ==== Save results to file ====
+    # Rewrite the streamed file in data order, including resumed rows
+    test_results = writer.finalize(order=test_ids)
+    result_cache.save()
+    history.save()
+    recorder.finish()
+    if artifacts is not None:
+        artifacts.close()
+    print(f"\nTest results saved to: {output_file}")
+
+    # Print summary
+    total_tests = len(test_results)
+    passed_tests = len([r for r in test_results if r['Status'] == 'PASS'])
+    failed_tests = total_tests - passed_tests
+    print(f"\n=== Test Summary ===")
+    print(f"Total Tests: {total_tests}")
+    print(f"Passed: {passed_tests}")
+    print(f"Failed: {failed_tests}")
+    print(f"Pass Rate: {(passed_tests/total_tests*100):.2f}%")
+    if total_tests < len(test_ids):
+        print(f"Not run: {len(test_ids) - total_tests} (stopped by --fail-fast, finish with --resume)")
+    if artifacts is not None:
+        artifacts.print_summary()
+
+    if args.incremental:
+        print_cache_report(cached_results, fresh_results)
+
 
-# ==== Save results to file ====
-results_df = pd.DataFrame(test_results)
-results_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-print(f"\nTest results saved to: {output_file}")
-
-# Print summary
-total_tests = len(test_results)
-passed_tests = len([r for r in test_results if r['Status'] == 'PASS'])
-failed_tests = total_tests - passed_tests
-print(f"\n=== Test Summary ===")
-print(f"Total Tests: {total_tests}")
-print(f"Passed: {passed_tests}")
-print(f"Failed: {failed_tests}")
-print(f"Pass Rate: {(passed_tests/total_tests*100):.2f}%")
-
-driver.quit()
+if __name__ == "__main__":
+    main()
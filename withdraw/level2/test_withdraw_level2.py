@@ -2,11 +2,11 @@
 Level 2: Data-driven testing with element locators from config file
 All element locators and URLs are read from config_withdraw.csv
 """
-import time
 import os
 import sys
+import argparse
+from urllib.parse import urldefrag
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait, Select
 
 # Add common directory to path
@@ -14,58 +14,104 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 common_dir = os.path.join(os.path.dirname(os.path.dirname(script_dir)), 'common')
 sys.path.insert(0, common_dir)
 
-from config_manager import ConfigManager
-from element_helper import find_element_by_config, click_element, input_text, get_text
+from page_objects import load_page, check_page_usage
+from element_helper import (
+    ElementHandleCache,
+    find_element_by_config,
+    click_element,
+    click_and_capture_messages,
+    input_text,
+    get_text,
+    wait_for_page_settled,
+    navigate,
+)
+from storage_state import capture_storage_state, restore_storage_state
+from balance_model import BalanceModel
+from driver_factory import create_driver, driver_pool_name
+from driver_pool import get_shared_pool
+from parallel_runner import run_rows
+from sharded_runner import shard_job, run_rows_sharded, bookkeeping
+from result_writer import ResultWriter
+from metrics import enable_metrics
+from adaptive_waits import enable_adaptive_waits
+from result_cache import ResultCache, fingerprint_files, print_cache_report
+from scheduler import RowHistory, order_by_risk
+from results_store import ResultsStore
+from failure_artifacts import ArtifactWriter, new_run_dir
 
-# ==== Load data and config ====
+# ==== Load config ====
 script_dir = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.join(script_dir, "data_withdraw.csv")
 config_path = os.path.join(script_dir, "config_withdraw.csv")
 
-data = pd.read_csv(csv_path)
-config_manager = ConfigManager(config_path)
+# Page object compiled from the config (rebuilt only when the CSV changes); misspelt
+# element and URL names in this script fail here, before any browser starts
+config_manager = load_page(config_path)
+check_page_usage(__file__, config_manager)
+
+# Browser settings and blocked URL patterns from the config's profile section
+driver_profile = config_manager.get_profile()
+
+# Reuses amount_input/submit_button/tab handles while the account page is unchanged
+element_cache = ElementHandleCache()
+
+# Storage snapshot of the logged-in account at balance 5096, per driver session
+balance_snapshots = {}
+
+# Expected balance per driver session, so rows only reset the account when it drifted
+balance_model = BalanceModel(5096, check_every=10)
 
 # ==== Setup output file ====
 output_file = os.path.join(script_dir, "test_result_withdraw.csv")
-test_results = []
+cache_file = os.path.join(script_dir, "result_cache_withdraw.json")
+history_file = os.path.join(script_dir, "run_history_withdraw.json")
+# One sub-directory of failure archives per run
+artifacts_dir = os.path.join(script_dir, "artifacts")
+# Shared by all suites, see results_report.py
+results_db = os.path.join(os.path.dirname(common_dir), "results_history.db")
+metrics_file = os.path.join(script_dir, "metrics_withdraw.json")
+wait_profile_file = os.path.join(script_dir, "wait_profile_withdraw.json")
+
+# Column order of the result file
+RESULT_COLUMNS = [
+    'Test_ID', 'Amount', 'Expected', 'Actual', 'Message', 'Status', 'Verify_Message', 'Artifacts'
+]
 
-# ==== Setup driver ====
-driver = webdriver.Chrome()
-driver.maximize_window()
 
 # ==== Setup: Login as customer before testing ====
-# Step 1: Open homepage (using config)
-homepage_url = config_manager.get_url("homepage_url")
-driver.get(homepage_url)
-time.sleep(2)
+def login_customer(driver):
+    """Log in as the first customer so the account page is available"""
+    # Step 1: Open homepage (using config)
+    homepage_url = config_manager.homepage_url
+    navigate(driver, homepage_url)
+
+    # Step 2: Click Customer Login button (using config)
+    click_element(driver, config_manager, "customer_login_button")
+    wait_for_page_settled(driver)
 
-# Step 2: Click Customer Login button (using config)
-click_element(driver, config_manager, "customer_login_button")
-time.sleep(1)
+    # Step 3: Select customer from dropdown (using config)
+    customer_dropdown = find_element_by_config(driver, config_manager, "user_select_dropdown")
+    select = Select(customer_dropdown)
+    select.select_by_index(1)  # Select first customer (index 1, skip "---Your Name---")
+    wait_for_page_settled(driver)
 
-# Step 3: Select customer from dropdown (using config)
-customer_dropdown = find_element_by_config(driver, config_manager, "user_select_dropdown")
-select = Select(customer_dropdown)
-select.select_by_index(1)  # Select first customer (index 1, skip "---Your Name---")
-time.sleep(1)
+    # Step 4: Click Login button (using config)
+    click_element(driver, config_manager, "login_button")
+    wait_for_page_settled(driver)
 
-# Step 4: Click Login button (using config)
-click_element(driver, config_manager, "login_button")
-time.sleep(2)
+    print("Setup completed: Customer logged in successfully")
 
-print("Setup completed: Customer logged in successfully")
 
 # ==== Function to ensure balance is 5096 before each test ====
-def ensure_balance_is_5096():
+def ensure_balance_is_5096(driver):
     """Ensure account balance is exactly 5096 before each test case"""
     # Reload page to clear previous state (using config)
-    account_url = config_manager.get_url("account_page_url")
-    driver.get(account_url)
-    time.sleep(1)
+    account_url = config_manager.account_page_url
+    navigate(driver, account_url)
     
     # Get current balance from the page (using config)
     try:
-        balance_element = find_element_by_config(driver, config_manager, "balance_strong")
+        balance_element = find_element_by_config(driver, config_manager, "balance_strong", cache=element_cache)
         current_balance = int(balance_element.text.strip())
     except:
         # Try alternative xpath for balance
@@ -91,41 +137,38 @@ def ensure_balance_is_5096():
         print(f"Current balance: {current_balance}, need to deposit {difference} to reach {target_balance}")
         
         # Click Deposit tab (using config)
-        click_element(driver, config_manager, "deposit_tab")
-        time.sleep(0.5)
+        click_element(driver, config_manager, "deposit_tab", cache=element_cache)
+        wait_for_page_settled(driver)
         
         # Input deposit amount (using config)
-        input_text(driver, config_manager, "amount_input", str(difference))
-        time.sleep(0.3)
+        input_text(driver, config_manager, "amount_input", str(difference), cache=element_cache)
         
         # Click Deposit button (using config)
-        click_element(driver, config_manager, "submit_button")
-        time.sleep(1)
+        click_element(driver, config_manager, "submit_button", cache=element_cache)
+        wait_for_page_settled(driver)
         
     elif difference < 0:
         # Need to withdraw (if balance is too high)
         print(f"Current balance: {current_balance}, need to withdraw {abs(difference)} to reach {target_balance}")
         
         # Click Withdrawl tab (using config)
-        click_element(driver, config_manager, "withdraw_tab")
-        time.sleep(0.5)
+        click_element(driver, config_manager, "withdraw_tab", cache=element_cache)
+        wait_for_page_settled(driver)
         
         # Input withdraw amount (using config)
-        input_text(driver, config_manager, "amount_input", str(abs(difference)))
-        time.sleep(0.3)
+        input_text(driver, config_manager, "amount_input", str(abs(difference)), cache=element_cache)
         
         # Click Withdraw button (using config)
-        click_element(driver, config_manager, "submit_button")
-        time.sleep(1)
+        click_element(driver, config_manager, "submit_button", cache=element_cache)
+        wait_for_page_settled(driver)
     
     # Reload page to clear transaction message and verify balance (using config)
-    account_url = config_manager.get_url("account_page_url")
-    driver.get(account_url)
-    time.sleep(1)
+    account_url = config_manager.account_page_url
+    navigate(driver, account_url)
     
     # Verify balance is now 5096
     try:
-        balance_element = find_element_by_config(driver, config_manager, "balance_strong")
+        balance_element = find_element_by_config(driver, config_manager, "balance_strong", cache=element_cache)
         final_balance = int(balance_element.text.strip())
         if final_balance == target_balance:
             print(f"Balance successfully set to {target_balance}")
@@ -134,53 +177,91 @@ def ensure_balance_is_5096():
     except:
         print("Warning: Could not verify final balance")
 
-# ==== Main test loop ====
-for idx, row in data.iterrows():
+
+# ==== Fixture: snapshot the account at 5096 once, restore it before each row ====
+def setup_account(driver):
+    """Log in, bring the balance to 5096 and snapshot the app state for this session"""
+    login_customer(driver)
+    ensure_balance_is_5096(driver)
+    balance_snapshots[driver.session_id] = capture_storage_state(driver)
+    balance_model.reset(driver.session_id, counted=False)
+    print("Setup completed: Balance snapshot captured")
+
+
+def read_balance(driver):
+    """Balance shown on the account page, or None if it cannot be read"""
+    try:
+        balance_element = find_element_by_config(driver, config_manager, "balance_strong", timeout=5, cache=element_cache)
+        return float(balance_element.text.strip())
+    except Exception:
+        return None
+
+
+def restore_balance_5096(driver):
+    """Restore the 5096 snapshot and open the account page, falling back to the UI reset"""
+    account_url = config_manager.account_page_url
+    snapshot = balance_snapshots.get(driver.session_id)
+    if snapshot is not None and restore_storage_state(driver, snapshot):
+        if urldefrag(driver.current_url).url == urldefrag(account_url).url:
+            # Same document: driver.get would only move the hash route and the
+            # app would not reread storage, so reload it explicitly
+            driver.get(account_url)
+            driver.refresh()
+            wait_for_page_settled(driver)
+        else:
+            navigate(driver, account_url)
+        try:
+            balance_element = find_element_by_config(driver, config_manager, "balance_strong", cache=element_cache)
+            if int(balance_element.text.strip()) == 5096:
+                return
+        except:
+            pass
+        print("Warning: Balance snapshot did not restore 5096, resetting through the UI")
+        balance_model.fallback()
+
+    ensure_balance_is_5096(driver)
+    balance_snapshots[driver.session_id] = capture_storage_state(driver)
+
+
+# ==== Test case ====
+def run_test_case(driver, idx, row):
+    """Run one withdraw data row and return its result record"""
     amount = row['amount']
     expected = row['expected']
     verify_message = row.get('verify_message', '')
 
-    # Step 0: Ensure balance is 5096 and reload to clear previous state
+    # Step 0: Restore the balance 5096 snapshot (which reloads the account page), but only
+    # when the balance model or its periodic check against the page says it is not 5096
     print(f"\n--- Test Case {idx+1} ---")
-    ensure_balance_is_5096()
-    
-    # Additional reload to ensure all previous messages are cleared (using config)
-    account_url = config_manager.get_url("account_page_url")
-    driver.get(account_url)
-    time.sleep(1)
-    
-    # Click on Deposit tab first, then switch to Withdrawl to clear any stale messages
-    try:
-        click_element(driver, config_manager, "deposit_tab", timeout=5)
-        time.sleep(0.5)
-    except:
-        pass  # If Deposit tab not found, continue
-    
-    # Step 2: Click Withdrawl tab (using config)
-    click_element(driver, config_manager, "withdraw_tab")
-    time.sleep(0.5)
+    session = driver.session_id
+    if balance_model.check_due(session) and not balance_model.verify(session, read_balance(driver)):
+        print("Warning: Balance on the page differs from the model, resetting")
+    if balance_model.needs_reset(session):
+        restore_balance_5096(driver)
+        balance_model.reset(session)
 
-    # Step 3: Click input field to focus (using config)
-    amount_input = find_element_by_config(driver, config_manager, "amount_input")
+    # Step 1: Click Withdrawl tab (using config); messages left on the page are
+    # ignored by the capture in Step 4, so no tab switch is needed to clear them
+    click_element(driver, config_manager, "withdraw_tab", cache=element_cache)
+    wait_for_page_settled(driver)
+
+    # Step 2: Click input field to focus (using config)
+    amount_input = find_element_by_config(driver, config_manager, "amount_input", cache=element_cache)
     amount_input.click()
-    time.sleep(0.3)
 
-    # Step 4: Clear and input amount (handle empty and invalid values) (using config)
+    # Step 3: Clear and input amount (handle empty and invalid values) (using config)
     amount_input.clear()
     if pd.notna(amount) and str(amount).strip() != '':
         amount_input.send_keys(str(amount))
-    time.sleep(0.3)
 
-    # Step 5: Click Submit button (using config)
-    click_element(driver, config_manager, "submit_button")
-    time.sleep(1)
+    # Step 4: Click Submit button (using config) and capture only the messages this click produced
+    messages = click_and_capture_messages(driver, config_manager, "submit_button", "message_span",
+                                          cache=element_cache)
+    message_text = messages[-1] if messages else ""
 
-    # Step 6: Verify result message
-    time.sleep(0.5)
-    
+    # Step 5: Verify result message
     actual = "unknown"
-    message_text = ""
-    
+
     # Check if this is an invalid input
     is_invalid_input = False
     if pd.isna(amount) or str(amount).strip() == '':
@@ -191,19 +272,6 @@ for idx, row in data.iterrows():
         except (ValueError, TypeError):
             is_invalid_input = True
     
-    # Check if message element exists and has text (using config)
-    try:
-        message_element = find_element_by_config(driver, config_manager, "message_span", timeout=5)
-        message_text = message_element.text.strip()
-        
-        # For invalid inputs, if message contains "Transaction", it's likely from previous test case
-        if is_invalid_input and "Transaction" in message_text:
-            # This is a stale message from previous test case, ignore it
-            message_text = ""
-    except:
-        # No message found
-        message_text = ""
-    
     # Determine actual result based on message and input type
     if pd.notna(verify_message) and str(verify_message).strip() != '':
         # Verify exact message match
@@ -224,12 +292,20 @@ for idx, row in data.iterrows():
             # Valid number input but no message or unexpected message
             actual = "failure"
 
+    # Update the balance model from what this row did to the account
+    if "Transaction successful" in message_text:
+        balance_model.withdraw(session, float(amount))
+    elif is_invalid_input or "Transaction Failed" in message_text or float(amount) <= 0:
+        balance_model.unchanged(session)
+    else:
+        # No recognizable outcome: the balance may or may not have changed
+        balance_model.invalidate(session)
+
     # Compare actual vs expected
     status = "PASS" if actual == expected else "FAIL"
     print(f"Test {idx+1}: Amount='{amount}', Expected={expected}, Actual={actual}, Message='{message_text}', Status={status}")
-    
-    # Save result to list
-    test_results.append({
+
+    return {
         'Test_ID': idx + 1,
         'Amount': amount,
         'Expected': expected,
@@ -237,27 +313,167 @@ for idx, row in data.iterrows():
         'Message': message_text,
         'Status': status,
         'Verify_Message': verify_message if pd.notna(verify_message) else ''
-    })
-    
-    # Reload page to reset status for next test case (using config)
-    account_url = config_manager.get_url("account_page_url")
-    driver.get(account_url)
-    time.sleep(1)
-
-# ==== Save results to file ====
-results_df = pd.DataFrame(test_results)
-results_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-print(f"\nTest results saved to: {output_file}")
-
-# Print summary
-total_tests = len(test_results)
-passed_tests = len([r for r in test_results if r['Status'] == 'PASS'])
-failed_tests = total_tests - passed_tests
-print(f"\n=== Test Summary ===")
-print(f"Total Tests: {total_tests}")
-print(f"Passed: {passed_tests}")
-print(f"Failed: {failed_tests}")
-print(f"Pass Rate: {(passed_tests/total_tests*100):.2f}%")
-
-driver.quit()
+    }
+
+
+def parse_args(argv=None):
+    """Parse command line options for the suite"""
+    parser = argparse.ArgumentParser(description="Withdraw Test Suite - Level 2")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of browser workers running rows in parallel (default: 1)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run Chrome headless (always on when --workers > 1; the config's headless profile setting wins)")
+    parser.add_argument("--data",
+                        help="Data CSV to run, e.g. from generate_data.py (default: data_withdraw.csv)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep finished rows from the result file and run only the rest")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse cached results of unchanged rows that passed, run the rest")
+    parser.add_argument("--order", choices=["csv", "history"], default="csv",
+                        help="csv: data file order; history: likely failures first, "
+                             "ranked by past failures, edited rows and duration (default: csv)")
+    parser.add_argument("--fail-fast", type=int, default=0, metavar="K",
+                        help="Stop starting new rows after K failures (default: off)")
+    parser.add_argument("--no-artifacts", action="store_true",
+                        help="Do not save screenshot, page source and console log of failing rows")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes, each with its own browser, fed rows by a "
+                             "work-stealing coordinator (default: 1, rows run in this process)")
+    parser.add_argument("--listen", metavar="HOST:PORT",
+                        help="Also let shard_worker.py processes on other machines join on this address")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record per-element timings and export p50/p95/max to metrics_*.json")
+    parser.add_argument("--adaptive-waits", action="store_true",
+                        help="Learn per-element timeouts and poll intervals from past waits "
+                             "(kept in wait_profile_*.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    headless = args.headless or args.workers > 1 or args.processes > 1
+    if driver_profile.headless is not None:
+        headless = driver_profile.headless
+    metrics = enable_metrics() if args.metrics else None
+    waits = enable_adaptive_waits(wait_profile_file) if args.adaptive_waits else None
+
+    data = pd.read_csv(args.data or csv_path)
+    test_ids = list(data.index + 1)
+    row_id = lambda idx, row: idx + 1
+
+    # Outcome and duration of every row, kept across runs to schedule risky rows first
+    history = RowHistory(history_file)
+    if args.order == "history" and not history.entries:
+        history.import_results(output_file)
+
+    # Finished rows are appended to the result file as they complete
+    writer = ResultWriter(output_file, RESULT_COLUMNS, resume=args.resume)
+    done = writer.completed_ids()
+    if done:
+        print(f"Resuming: skipping {len(done)} finished rows")
+        data = data[[str(test_id) not in done for test_id in test_ids]]
+
+    # Results are cached by a hash of the row, its config and this script
+    result_cache = ResultCache(cache_file, fingerprint_files(
+        config_path, os.path.abspath(__file__), context={"app_url": config_manager.homepage_url}
+    ))
+    cached_results = []
+    if args.incremental:
+        data, cached_results = result_cache.split(data, row_id)
+        for record in cached_results:
+            writer.write(record)
+
+    if args.order == "history":
+        data = order_by_risk(data, history, row_id)
+
+    # Every row run below is appended to the results history
+    recorder = ResultsStore(results_db).start_run("withdraw/level2", sys.argv[1:] if argv is None else argv)
+
+    # Screenshot, page source and console log of failing rows, written off the row loop
+    artifacts = None
+    run_row = run_test_case
+    if not args.no_artifacts:
+        artifacts = ArtifactWriter(new_run_dir(artifacts_dir), base_dir=os.path.dirname(output_file))
+        run_row = artifacts.wrap(run_test_case, row_id)
+    if args.processes > 1 or args.listen:
+        # ==== Main test loop: worker processes, one browser each ====
+        print(f"Running {len(data)} rows on {args.processes} worker processes")
+        fresh_results = run_rows_sharded(
+            data,
+            shard_job("withdraw/level2", setup="setup_account", artifacts=artifacts, headless=headless,
+                      metrics=args.metrics, waits=waits),
+            row_id,
+            processes=args.processes,
+            listen=args.listen,
+            on_row=bookkeeping(row_id, result_cache, history, recorder),
+            on_result=writer.write,
+            max_failures=args.fail_fast,
+        )
+    else:
+        if args.workers > 1:
+            print(f"Running {len(data)} rows on {args.workers} {'headless ' if headless else ''}workers")
+
+        # Warm sessions are shared with other suites run from the same process
+        driver_pool = get_shared_pool(
+            driver_pool_name(headless, driver_profile),
+            lambda: create_driver(headless=headless, profile=driver_profile),
+            size=args.workers,
+        )
+
+        # ==== Main test loop ====
+        # Each worker logs in once on its own session; the banking demo keeps
+        # its accounts per browser, so workers never share a balance and each
+        # session restores its own snapshot before every row
+        fresh_results = run_rows(
+            data,
+            recorder.wrap(history.wrap(result_cache.wrap(run_row), row_id), row_id),
+            driver_pool=driver_pool,
+            workers=args.workers,
+            setup_session=setup_account,
+            on_result=writer.write,
+            max_failures=args.fail_fast,
+        )
+
+    # ==== Save results to file ====
+    # Rewrite the streamed file in data order, including resumed rows
+    test_results = writer.finalize(order=test_ids)
+    result_cache.save()
+    history.save()
+    recorder.finish()
+    if artifacts is not None:
+        artifacts.close()
+    if waits is not None:
+        waits.save()
+    print(f"\nTest results saved to: {output_file}")
+
+    # Print summary
+    total_tests = len(test_results)
+    passed_tests = len([r for r in test_results if r['Status'] == 'PASS'])
+    failed_tests = total_tests - passed_tests
+    print(f"\n=== Test Summary ===")
+    print(f"Total Tests: {total_tests}")
+    print(f"Passed: {passed_tests}")
+    print(f"Failed: {failed_tests}")
+    print(f"Pass Rate: {(passed_tests/total_tests*100):.2f}%")
+    if total_tests < len(test_ids):
+        print(f"Not run: {len(test_ids) - total_tests} (stopped by --fail-fast, finish with --resume)")
+    if artifacts is not None:
+        artifacts.print_summary()
+    if balance_model.resets or balance_model.skipped:
+        print(balance_model.summary())
+
+    if args.incremental:
+        print_cache_report(cached_results, fresh_results)
+
+    if metrics is not None:
+        metrics.print_summary()
+        metrics.export(metrics_file, suite="withdraw/level2")
+        print(f"\nMetrics saved to: {metrics_file}")
+
+    if waits is not None:
+        waits.print_summary()
+        print(f"\nWait profile saved to: {wait_profile_file}")
+
 
+if __name__ == "__main__":
+    main()